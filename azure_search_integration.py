@@ -6,7 +6,9 @@ Simplified version that bypasses OpenAI client initialization issues.
 import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import os
+from collections import deque
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Any
 from datetime import datetime
 from dataclasses import dataclass, asdict
 import hashlib
@@ -23,6 +25,7 @@ from azure.search.documents.indexes.models import (
 from azure.search.documents.models import VectorizedQuery
 from azure.identity import DefaultAzureCredential
 from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import HttpResponseError
 
 
 @dataclass
@@ -42,13 +45,13 @@ class SearchDocument:
     metadata: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
-    """Structure for search results"""
-    document_id: str
+    """Structure for search results; field names match the API response so it serializes as is"""
+    id: str
     url: str
     title: str
-    content_snippet: str
+    snippet: str
     score: float
     highlights: List[str]
     metadata: Dict[str, Any]
@@ -66,12 +69,78 @@ class IndexingResult:
     execution_time: float
 
 
+class SuggestionTrie:
+    """Character trie of suggestion terms for local, case-insensitive autocomplete"""
+    
+    # Key under which a node stores the original term; never a single character
+    _TERM = ''
+    
+    def __init__(self, terms: Iterable[str] = ()):
+        self.root: Dict = {}
+        self.size = 0
+        for term in terms:
+            self.insert(term)
+    
+    def insert(self, term: str) -> None:
+        """Add a term, keeping its original casing for display"""
+        term = term.strip()
+        if not term:
+            return
+        
+        node = self.root
+        for char in term.lower():
+            node = node.setdefault(char, {})
+        
+        if self._TERM not in node:
+            self.size += 1
+        node[self._TERM] = term
+    
+    def complete(self, prefix: str, limit: int) -> List[str]:
+        """Return up to limit terms starting with prefix, shortest first"""
+        node = self.root
+        for char in prefix.lower():
+            node = node.get(char)
+            if node is None:
+                return []
+        
+        matches = []
+        queue = deque([node])
+        while queue and len(matches) < limit:
+            node = queue.popleft()
+            for key, child in node.items():
+                if key == self._TERM:
+                    matches.append(child)
+                else:
+                    queue.append(child)
+        
+        return matches[:limit]
+
+
+# Statuses Azure Search returns when the service is throttling indexing requests
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+
+# Most documents Azure AI Search accepts in one indexing request
+MAX_BATCH_DOCUMENTS = 1000
+
+# Default suggestion terms file, anchored to the repo root rather than the working
+# directory (gunicorn chdirs into the API package); the env var overrides it
+DEFAULT_SUGGESTION_TERMS_PATH = os.environ.get(
+    'SUGGESTION_TERMS_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'suggestion_terms.json')
+)
+
+
 class AzureSearchIntegration:
     """
     MINIMAL Azure AI Search integration for the ExponentHR RAG system.
     Simplified version to bypass OpenAI client issues.
     """
     
+    # Index fields declared as Collection(Edm.String); these need an any() lambda when filtering
+    COLLECTION_FIELDS = frozenset({'section_hierarchy', 'metadata/links', 'metadata/images'})
+    # Candidate search.in delimiters, tried in order until one appears in none of the values
+    FILTER_DELIMITERS = (',', '|', ';', '~', '^', '`')
+    
     def __init__(self, config: Dict):
         """Initialize the Azure Search integration."""
         self.config = config
@@ -98,6 +167,19 @@ class AzureSearchIntegration:
             'hybrid_search_enabled': False   # Disable for now
         }
         
+        # Throttling seen while indexing, read by the sync service to size its batches
+        self.throttled_requests = 0
+        self.last_retry_after: Optional[float] = None
+        
+        # Throttled documents are re-sent after a backoff this many times before counting as failed
+        self.throttle_retries = config.get('index_throttle_retries', 3)
+        self.throttle_retry_delay = config.get('index_throttle_retry_delay', 5)
+        
+        # Local autocomplete over index titles; suggest_queries only calls Azure on a trie miss
+        self.suggestion_trie: Optional[SuggestionTrie] = None
+        self.suggestion_terms_path = config.get('suggestion_terms_path', DEFAULT_SUGGESTION_TERMS_PATH)
+        self.suggestion_max_terms = config.get('suggestion_max_terms', 10000)
+        
         self.logger.info("AzureSearchIntegration initialized in minimal mode")
     
     def _setup_logging(self) -> logging.Logger:
@@ -142,6 +224,8 @@ class AzureSearchIntegration:
             
             self.logger.info("Azure Search clients initialized (OpenAI client deferred)")
             
+            self._load_suggestion_trie()
+            
         except Exception as e:
             self.logger.error(f"Failed to initialize clients: {str(e)}")
             raise
@@ -178,12 +262,29 @@ class AzureSearchIntegration:
         except Exception as e:
             self.logger.error(f"Failed to initialize Azure OpenAI: {str(e)}")
             raise
+    
+    def enable_query_embeddings(self) -> bool:
+        """Connect the deferred OpenAI client so queries can be embedded; False if it is unavailable"""
+        try:
+            self._initialize_openai_client()
+            return True
+        except Exception as e:
+            self.logger.warning(f"Query embeddings unavailable: {str(e)}")
+            return False
+    
+    def _clean_text_for_embedding(self, text: str, max_chars: int = 8000) -> str:
+        """Collapse whitespace and trim text to stay within the embedding model's input limit"""
+        return re.sub(r'\s+', ' ', text).strip()[:max_chars]
         
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding using YOUR Azure OpenAI service"""
+        return (await self.generate_embeddings([text]))[0]
+    
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts with one Azure OpenAI request, in input order"""
         try:
             if self.openai_client != "azure_direct":
-                return [0.0] * self.embedding_dimension
+                return [[0.0] * self.embedding_dimension for _ in texts]
             
             import requests
             
@@ -195,26 +296,24 @@ class AzureSearchIntegration:
                 'Content-Type': 'application/json'
             }
             
-            cleaned_text = self._clean_text_for_embedding(text)
-            
             data = {
-                'input': cleaned_text,
+                'input': [self._clean_text_for_embedding(text) for text in texts],
                 'model': self.azure_openai_deployment
             }
             
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            # requests is blocking; keep it off the event loop serving API calls
+            response = await asyncio.to_thread(requests.post, url, headers=headers, json=data, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
-                embedding = result['data'][0]['embedding']
-                return embedding
+                return [item['embedding'] for item in sorted(result['data'], key=lambda item: item['index'])]
             else:
                 self.logger.error(f"Azure OpenAI error: {response.status_code}")
-                return [0.0] * self.embedding_dimension
+                return [[0.0] * self.embedding_dimension for _ in texts]
                 
         except Exception as e:
             self.logger.error(f"Embedding error: {str(e)}")
-            return [0.0] * self.embedding_dimension
+            return [[0.0] * self.embedding_dimension for _ in texts]
     
     def create_search_index(self) -> None:
         """Create the search index with minimal configuration"""
@@ -271,102 +370,115 @@ class AzureSearchIntegration:
             self.logger.error(f"Failed to create search index: {str(e)}")
             raise
     
+    def _to_index_document(self, document_data: Dict) -> Dict:
+        """Build the search index document (without embeddings for now) for scraped document data"""
+        url = document_data.get('url', '')
+        metadata = document_data.get('metadata', {})
+        
+        return {
+            'id': hashlib.sha256(url.encode('utf-8')).hexdigest(),
+            'url': url,
+            'title': document_data.get('title', ''),
+            'content': document_data.get('content', ''),
+            'content_type': metadata.get('content_type', 'documentation'),
+            'section_hierarchy': metadata.get('section_hierarchy', []),
+            'view_type': metadata.get('source_view', 'unknown'),
+            'word_count': metadata.get('word_count', 0),
+            'last_modified': metadata.get('last_modified', datetime.now().isoformat()),
+            'content_hash': metadata.get('content_hash', ''),
+            'metadata': {
+                'extraction_timestamp': metadata.get('extraction_timestamp', ''),
+                'links': metadata.get('links', []),
+                'images': metadata.get('images', [])
+            }
+        }
+    
     async def index_document(self, document_data: Dict) -> bool:
         """Index a single document (without embeddings for now)"""
-        try:
-            url = document_data.get('url', '')
-            title = document_data.get('title', '')
-            content = document_data.get('content', '')
-            metadata = document_data.get('metadata', {})
-            
-            doc_id = hashlib.sha256(url.encode('utf-8')).hexdigest()
-            
-            # Create search document without embedding for now
-            search_doc = {
-                'id': doc_id,
-                'url': url,
-                'title': title,
-                'content': content,
-                'content_type': metadata.get('content_type', 'documentation'),
-                'section_hierarchy': metadata.get('section_hierarchy', []),
-                'view_type': metadata.get('source_view', 'unknown'),
-                'word_count': metadata.get('word_count', 0),
-                'last_modified': metadata.get('last_modified', datetime.now().isoformat()),
-                'content_hash': metadata.get('content_hash', ''),
-                'metadata': {
-                    'extraction_timestamp': metadata.get('extraction_timestamp', ''),
-                    'links': metadata.get('links', []),
-                    'images': metadata.get('images', [])
-                }
-            }
-            
-            # Upload document to index
-            result = self.search_client.upload_documents([search_doc])
-            
-            if result and len(result) > 0 and result[0].succeeded:
-                self.logger.debug(f"Successfully indexed document: {title}")
-                return True
+        return (await self.index_documents_batch([document_data]))[0]
+    
+    async def index_documents_batch(self, documents: List[Dict]) -> List[bool]:
+        """
+        Index documents with one upload request per MAX_BATCH_DOCUMENTS documents.
+        
+        Returns:
+            Whether each document was indexed, in input order
+        """
+        search_docs = [self._to_index_document(document_data) for document_data in documents]
+        succeeded: Dict[str, bool] = {}
+        # Only Retry-After values from this batch's responses may drive its backoff
+        self.last_retry_after = None
+        
+        pending = search_docs
+        for attempt in range(self.throttle_retries + 1):
+            throttled = []
+            for i in range(0, len(pending), MAX_BATCH_DOCUMENTS):
+                throttled.extend(await self._upload_chunk(pending[i:i + MAX_BATCH_DOCUMENTS], succeeded))
+            
+            if not throttled or attempt == self.throttle_retries:
+                break
+            
+            retry_after = self.last_retry_after or self.throttle_retry_delay
+            self.logger.warning(f"Azure Search throttled {len(throttled)} documents; retrying in {retry_after}s")
+            await asyncio.sleep(retry_after)
+            pending = throttled
+        
+        results = [succeeded.get(search_doc['id'], False) for search_doc in search_docs]
+        for search_doc, indexed in zip(search_docs, results):
+            if indexed:
+                self.logger.debug(f"Successfully indexed document: {search_doc['title']}")
             else:
-                self.logger.error(f"Failed to index document: {title}")
-                return False
-            
+                self.logger.error(f"Failed to index document: {search_doc['title']}")
+        
+        return results
+    
+    async def _upload_chunk(self, chunk: List[Dict], succeeded: Dict[str, bool]) -> List[Dict]:
+        """
+        Upload one indexing request, recording each document's outcome in succeeded.
+        
+        Returns:
+            The documents Azure Search throttled, to be retried after a backoff
+        """
+        throttled_keys = set()
+        try:
+            results = await asyncio.to_thread(
+                self.search_client.upload_documents, chunk,
+                raw_response_hook=lambda response: self._record_retry_after(response.http_response.headers)
+            )
+            for result in results:
+                succeeded[result.key] = result.succeeded
+                if not result.succeeded and result.status_code in THROTTLE_STATUS_CODES:
+                    self.throttled_requests += 1
+                    throttled_keys.add(result.key)
+            
+        except HttpResponseError as e:
+            if e.status_code in THROTTLE_STATUS_CODES:
+                self.throttled_requests += 1
+                if e.response is not None:
+                    self._record_retry_after(e.response.headers)
+                self.logger.warning(f"Azure Search throttled a request of {len(chunk)} documents: {str(e)}")
+                return chunk
+            self.logger.error(f"Error indexing {len(chunk)} documents: {str(e)}")
         except Exception as e:
-            self.logger.error(f"Error indexing document: {str(e)}")
-            return False
+            self.logger.error(f"Error indexing {len(chunk)} documents: {str(e)}")
+        
+        return [search_doc for search_doc in chunk if search_doc['id'] in throttled_keys]
+    
+    def _record_retry_after(self, headers) -> None:
+        """Remember a response's Retry-After seconds for the indexing backoff"""
+        retry_after = headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            self.last_retry_after = float(retry_after)
     
     async def search_documents(self, query: str, filters: Dict = None, search_type: str = 'text') -> List[SearchResult]:
         """Search documents using text search (vector search disabled for now)"""
         try:
-            search_results = []
-            
-            # Use simple text search for now
-            search_params = {
-                'search_text': query,
-                'top': self.search_config['top_k'],
-                'include_total_count': True,
-                'highlight_fields': ['title', 'content'],
-                'select': ['id', 'url', 'title', 'content', 'content_type', 'view_type', 'metadata']
-            }
+            search_params = self._build_search_params(query, filters)
             
-            # Add filters if provided
-            if filters:
-                filter_expressions = []
-                for key, value in filters.items():
-                    if isinstance(value, list):
-                        filter_expr = f"{key}/any(x: x eq '{value[0]}')"
-                        for v in value[1:]:
-                            filter_expr += f" or {key}/any(x: x eq '{v}')"
-                    else:
-                        filter_expr = f"{key} eq '{value}'"
-                    filter_expressions.append(filter_expr)
-                
-                if filter_expressions:
-                    search_params['filter'] = ' and '.join(filter_expressions)
+            # Execute search off the event loop; the SDK client is synchronous and pages lazily
+            results = await asyncio.to_thread(lambda: list(self.search_client.search(**search_params)))
             
-            # Execute search
-            results = self.search_client.search(**search_params)
-            
-            # Process results
-            for result in results:
-                highlights = []
-                if hasattr(result, '@search.highlights'):
-                    for field, highlight_list in result['@search.highlights'].items():
-                        highlights.extend(highlight_list)
-                
-                content = result.get('content', '')
-                snippet = content[:300] + "..." if len(content) > 300 else content
-                
-                search_result = SearchResult(
-                    document_id=result['id'],
-                    url=result['url'],
-                    title=result['title'],
-                    content_snippet=snippet,
-                    score=result.get('@search.score', 0.0),
-                    highlights=highlights,
-                    metadata=result.get('metadata', {})
-                )
-                
-                search_results.append(search_result)
+            search_results = [self._to_search_result(result) for result in results]
             
             self.logger.info(f"Search completed: {len(search_results)} results for query '{query}'")
             return search_results
@@ -375,10 +487,143 @@ class AzureSearchIntegration:
             self.logger.error(f"Search failed: {str(e)}")
             return []
     
+    async def iter_search_documents(self, query: str, filters: Dict = None, search_type: str = 'text') -> AsyncIterator[SearchResult]:
+        """Yield search results page by page as Azure returns them"""
+        try:
+            search_params = self._build_search_params(query, filters)
+            pages = await asyncio.to_thread(lambda: self.search_client.search(**search_params).by_page())
+            
+            while True:
+                page = await asyncio.to_thread(lambda: list(next(pages, [])))
+                if not page:
+                    break
+                for result in page:
+                    yield self._to_search_result(result)
+            
+        except Exception as e:
+            self.logger.error(f"Streaming search failed: {str(e)}")
+    
+    def _build_search_params(self, query: str, filters: Optional[Dict]) -> Dict:
+        """Build the SearchClient.search keyword arguments for a query"""
+        # Use simple text search for now
+        search_params = {
+            'search_text': query,
+            'top': self.search_config['top_k'],
+            'include_total_count': True,
+            'highlight_fields': ['title', 'content'],
+            'select': ['id', 'url', 'title', 'content', 'content_type', 'view_type', 'metadata']
+        }
+        
+        # Add filters if provided
+        if filters:
+            filter_expressions = [
+                self._build_filter_expression(key, value)
+                for key, value in filters.items()
+                if value != []
+            ]
+
+            if filter_expressions:
+                search_params['filter'] = ' and '.join(filter_expressions)
+        
+        return search_params
+    
+    def _to_search_result(self, result: Dict) -> SearchResult:
+        """Convert a raw Azure Search hit into a SearchResult"""
+        highlights = []
+        if hasattr(result, '@search.highlights'):
+            for field, highlight_list in result['@search.highlights'].items():
+                highlights.extend(highlight_list)
+        
+        content = result.get('content', '')
+        snippet = content[:300] + "..." if len(content) > 300 else content
+        
+        return SearchResult(
+            id=result['id'],
+            url=result['url'],
+            title=result['title'],
+            snippet=snippet,
+            score=result.get('@search.score', 0.0),
+            highlights=highlights,
+            metadata=result.get('metadata', {})
+        )
+    
+    def _build_filter_expression(self, key: str, value: Any) -> str:
+        """Build an OData filter clause, using search.in() for multi-value filters"""
+        if not isinstance(value, list):
+            return f"{key} eq '{self._escape_filter_value(value)}'"
+        
+        values = [self._escape_filter_value(v) for v in value]
+        target = 'x' if key in self.COLLECTION_FIELDS else key
+        # search.in splits on the delimiter, so pick one that no value contains
+        delimiter = next(
+            (d for d in self.FILTER_DELIMITERS if not any(d in v for v in values)), None
+        )
+        if delimiter is None:
+            # Every candidate occurs in some value; plain equality clauses are always safe
+            clause = '(' + ' or '.join(f"{target} eq '{v}'" for v in values) + ')'
+        else:
+            clause = f"search.in({target}, '{delimiter.join(values)}', '{delimiter}')"
+        
+        if key in self.COLLECTION_FIELDS:
+            return f"{key}/any(x: {clause})"
+        return clause
+    
+    @staticmethod
+    def _escape_filter_value(value: Any) -> str:
+        """Escape a value for use inside an OData string literal"""
+        return str(value).replace("'", "''")
+    
+    def _load_suggestion_trie(self) -> None:
+        """Rebuild the suggestion trie from the terms saved by the last refresh"""
+        if not self.suggestion_terms_path or not os.path.exists(self.suggestion_terms_path):
+            return
+        
+        try:
+            with open(self.suggestion_terms_path, 'r', encoding='utf-8') as f:
+                self.suggestion_trie = SuggestionTrie(json.load(f))
+            self.logger.info(f"Loaded {self.suggestion_trie.size} suggestion terms")
+        except Exception as e:
+            self.logger.warning(f"Could not load suggestion terms: {str(e)}")
+    
+    async def refresh_suggestion_trie(self) -> None:
+        """Rebuild the suggestion trie from the titles currently in the index"""
+        try:
+            results = await asyncio.to_thread(lambda: list(self.search_client.search(
+                search_text='*',
+                select=['title'],
+                top=self.suggestion_max_terms
+            )))
+            terms = sorted({result['title'] for result in results if result.get('title')})
+            
+            # Swap in a fully built trie so concurrent lookups never see a partial one
+            self.suggestion_trie = SuggestionTrie(terms)
+            
+            if self.suggestion_terms_path:
+                await asyncio.to_thread(self._save_suggestion_terms, terms)
+            
+            self.logger.info(f"Suggestion trie refreshed with {self.suggestion_trie.size} terms")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to refresh suggestion trie: {str(e)}")
+    
+    def _save_suggestion_terms(self, terms: List[str]) -> None:
+        """Write the suggestion terms file; replaced atomically, as every worker refreshes it"""
+        os.makedirs(os.path.dirname(self.suggestion_terms_path) or '.', exist_ok=True)
+        temp_path = f"{self.suggestion_terms_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(terms, f)
+        os.replace(temp_path, self.suggestion_terms_path)
+    
     async def suggest_queries(self, partial_query: str, top: int = 5) -> List[str]:
         """Get query suggestions"""
         try:
-            suggestions = self.search_client.suggest(
+            if self.suggestion_trie is not None:
+                matches = self.suggestion_trie.complete(partial_query, top)
+                if len(matches) >= top:
+                    return matches
+            
+            suggestions = await asyncio.to_thread(
+                self.search_client.suggest,
                 search_text=partial_query,
                 suggester_name="default-suggester",
                 top=top
@@ -404,16 +649,32 @@ class AzureSearchIntegration:
     
     async def delete_document(self, document_id: str) -> bool:
         """Delete a document from the index"""
-        try:
-            result = self.search_client.delete_documents([{"id": document_id}])
-            
-            if result and len(result) > 0 and result[0].succeeded:
-                self.logger.info(f"Document {document_id} deleted from index")
-                return True
-            else:
-                self.logger.error(f"Failed to delete document {document_id}")
-                return False
-                
-        except Exception as e:
-            self.logger.error(f"Error deleting document: {str(e)}")
-            return False
\ No newline at end of file
+        return (await self.delete_documents_batch([document_id]))[0]
+    
+    async def delete_documents_batch(self, document_ids: List[str]) -> List[bool]:
+        """
+        Delete documents with one request per MAX_BATCH_DOCUMENTS IDs.
+        
+        Returns:
+            Whether each document was deleted, in input order
+        """
+        succeeded: Dict[str, bool] = {}
+        
+        for i in range(0, len(document_ids), MAX_BATCH_DOCUMENTS):
+            chunk = document_ids[i:i + MAX_BATCH_DOCUMENTS]
+            try:
+                for result in await asyncio.to_thread(
+                    self.search_client.delete_documents, [{"id": document_id} for document_id in chunk]
+                ):
+                    succeeded[result.key] = result.succeeded
+            except Exception as e:
+                self.logger.error(f"Error deleting {len(chunk)} documents: {str(e)}")
+        
+        results = [succeeded.get(document_id, False) for document_id in document_ids]
+        deleted = sum(results)
+        if deleted:
+            self.logger.info(f"{deleted} documents deleted from index")
+        if deleted < len(document_ids):
+            self.logger.error(f"Failed to delete {len(document_ids) - deleted} documents")
+        
+        return results
\ No newline at end of file
@@ -6,14 +6,19 @@ Monitors content changes, manages update detection, and triggers synchronization
 import asyncio
 import json
 import hashlib
+import heapq
 import logging
+from collections import Counter
 from typing import Dict, List, Set, Optional, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-import schedule
+from dataclasses import dataclass
+import numpy as np
+import orjson
 import time
+import xxhash
+import zstandard
 
-from azure.storage.blob import BlobServiceClient
+from azure.storage.blob import BlobServiceClient, ContentSettings
 from azure.identity import DefaultAzureCredential
 
 
@@ -29,6 +34,13 @@ class ContentFingerprint:
     title: str
     section_count: int
     link_count: int
+    simhash: int = 0  # 64-bit SimHash of the content's words; 0 if not computed
+    doc_id: str = ''  # Search index document ID (SHA-256 of the URL); '' if not computed
+
+
+# Metadata fields left out of the metadata hash: timestamps differ on every
+# scrape, and content-derived fields are covered by the content checks
+VOLATILE_METADATA_FIELDS = frozenset({'content_hash', 'word_count', 'last_modified', 'extraction_timestamp'})
 
 
 @dataclass
@@ -74,6 +86,14 @@ class ChangeDetectionSystem:
         self.change_history: List[ChangeEvent] = []
         self.monitoring_schedules: Dict[str, MonitoringSchedule] = {}
         
+        # Min-heap of (next check timestamp, url, next_check) pushed on every schedule
+        # change; entries no longer matching monitoring_schedules are dropped lazily
+        self._schedule_heap: List[Tuple[float, str, str]] = []
+        
+        # Conditional request headers (If-None-Match / If-Modified-Since) from the
+        # last HTTP scrape of each URL, so unchanged pages can be confirmed cheaply
+        self.http_validators: Dict[str, Dict[str, str]] = {}
+        
         # Azure clients
         self.blob_client = None
         
@@ -82,7 +102,9 @@ class ChangeDetectionSystem:
             'content_similarity_threshold': 0.95,
             'structural_change_threshold': 0.8,
             'minimum_change_interval_hours': 1,
-            'max_history_days': 90
+            'max_history_days': 90,
+            # Content edits within this many differing SimHash bits are ignored
+            'simhash_max_distance': config.get('simhash_max_distance', 3)
         }
         
         # Monitoring frequency by content type
@@ -140,8 +162,8 @@ class ChangeDetectionSystem:
             ContentFingerprint object
         """
         try:
-            # Generate content hash
-            content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            # Content hash; the scraper's metadata already carries the same SHA-256
+            content_hash = metadata.get('content_hash') or hashlib.sha256(content.encode('utf-8')).hexdigest()
             
             # Generate structural hash (based on headings and structure)
             structural_elements = self._extract_structural_elements(content)
@@ -150,11 +172,16 @@ class ChangeDetectionSystem:
             ).hexdigest()
             
             # Generate metadata hash
-            metadata_str = json.dumps(metadata, sort_keys=True, default=str)
+            metadata_str = json.dumps(
+                {key: value for key, value in metadata.items() if key not in VOLATILE_METADATA_FIELDS},
+                sort_keys=True, default=str
+            )
             metadata_hash = hashlib.sha256(metadata_str.encode('utf-8')).hexdigest()
             
             # Extract content statistics
-            word_count = len(content.split())
+            word_count = metadata.get('word_count')
+            if word_count is None:
+                word_count = len(content.split())
             section_count = content.count('\n##') + content.count('\n#')
             link_count = content.count('http') + content.count('[')
             
@@ -167,13 +194,39 @@ class ChangeDetectionSystem:
                 word_count=word_count,
                 title=metadata.get('title', ''),
                 section_count=section_count,
-                link_count=link_count
+                link_count=link_count,
+                simhash=self._simhash(content),
+                doc_id=hashlib.sha256(url.encode('utf-8')).hexdigest()
             )
             
         except Exception as e:
             self.logger.error(f"Error creating content fingerprint: {str(e)}")
             raise
     
+    def _simhash(self, content: str) -> int:
+        """64-bit SimHash of the content's words, weighted by frequency"""
+        counts = Counter(content.lower().split())
+        if not counts:
+            return 0
+        
+        hashes = np.fromiter(
+            (xxhash.xxh3_64_intdigest(word.encode('utf-8')) for word in counts),
+            dtype='<u8', count=len(counts)
+        )
+        # Row i, column j: bit j of word i's hash
+        bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+        weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        votes = weights @ (bits.astype(np.int64) * 2 - 1)
+        
+        return int(np.packbits(votes > 0, bitorder='little').view('<u8')[0])
+    
+    def _is_near_duplicate(self, old_fp: ContentFingerprint, new_fp: ContentFingerprint) -> bool:
+        """Whether differing content is close enough by SimHash to count as unchanged"""
+        if not old_fp.simhash or not new_fp.simhash:
+            return False
+        distance = (old_fp.simhash ^ new_fp.simhash).bit_count()
+        return distance <= self.detection_settings['simhash_max_distance']
+    
     def _extract_structural_elements(self, content: str) -> Dict:
         """Extract structural elements from content for fingerprinting"""
         try:
@@ -256,9 +309,11 @@ class ChangeDetectionSystem:
             # Check for changes
             changes_detected = []
             change_details = {}
+            content_changed = old_fingerprint.content_hash != new_fingerprint.content_hash
+            near_duplicate = content_changed and self._is_near_duplicate(old_fingerprint, new_fingerprint)
             
             # Content changes
-            if old_fingerprint.content_hash != new_fingerprint.content_hash:
+            if content_changed and not near_duplicate:
                 changes_detected.append('content')
                 change_details['content_change'] = {
                     'old_word_count': old_fingerprint.word_count,
@@ -308,6 +363,11 @@ class ChangeDetectionSystem:
                 
                 return change_event
             
+            if near_duplicate:
+                # Keep the stored fingerprint, so small edits are measured against
+                # the last stored version and cannot accumulate unnoticed
+                return None
+            
             # No changes detected, update timestamp
             new_fingerprint.last_modified = old_fingerprint.last_modified
             self.content_fingerprints[url] = new_fingerprint
@@ -389,23 +449,49 @@ class ChangeDetectionSystem:
             )
             
             self.monitoring_schedules[url] = schedule_entry
+            self._push_schedule(url, schedule_entry)
             
             self.logger.info(f"Setup monitoring for {url}: {frequency_hours}h frequency")
             
         except Exception as e:
             self.logger.error(f"Error setting up monitoring schedule: {str(e)}")
     
+    def _push_schedule(self, url: str, schedule_entry: MonitoringSchedule) -> None:
+        """Add a URL's current next check to the schedule heap"""
+        heapq.heappush(self._schedule_heap, (
+            datetime.fromisoformat(schedule_entry.next_check).timestamp(), url, schedule_entry.next_check
+        ))
+    
+    def _rebuild_schedule_heap(self) -> None:
+        """Rebuild the schedule heap from monitoring_schedules"""
+        self._schedule_heap = [
+            (datetime.fromisoformat(schedule_entry.next_check).timestamp(), url, schedule_entry.next_check)
+            for url, schedule_entry in self.monitoring_schedules.items()
+        ]
+        heapq.heapify(self._schedule_heap)
+    
     def get_urls_due_for_check(self) -> List[str]:
         """Get list of URLs that are due for monitoring check"""
-        due_urls = []
-        current_time = datetime.now()
+        due_entries: Dict[str, Tuple[float, str, str]] = {}
+        current_time = datetime.now().timestamp()
         
         try:
-            for url, schedule_entry in self.monitoring_schedules.items():
-                next_check_time = datetime.fromisoformat(schedule_entry.next_check)
+            heap = self._schedule_heap
+            while heap and heap[0][0] <= current_time:
+                entry = heapq.heappop(heap)
+                _, url, next_check = entry
                 
-                if current_time >= next_check_time:
-                    due_urls.append(url)
+                # Skip entries superseded by a later schedule, removed URLs and duplicates
+                schedule_entry = self.monitoring_schedules.get(url)
+                if schedule_entry is None or schedule_entry.next_check != next_check or url in due_entries:
+                    continue
+                due_entries[url] = entry
+            
+            # Due URLs stay due until update_monitoring_schedule reschedules them
+            for entry in due_entries.values():
+                heapq.heappush(heap, entry)
+            
+            due_urls = list(due_entries)
             
             # Sort by priority
             def priority_sort_key(url):
@@ -432,12 +518,28 @@ class ChangeDetectionSystem:
                 
                 next_check_time = current_time + timedelta(hours=schedule_entry.frequency_hours)
                 schedule_entry.next_check = next_check_time.isoformat()
+                self._push_schedule(url, schedule_entry)
                 
                 self.logger.debug(f"Updated monitoring schedule for {url}")
             
         except Exception as e:
             self.logger.error(f"Error updating monitoring schedule: {str(e)}")
     
+    def record_http_validators(self, url: str, validators: Optional[Dict[str, str]]) -> None:
+        """Remember the validators of an HTTP scrape for later conditional checks"""
+        if validators:
+            self.http_validators[url] = validators
+        else:
+            self.http_validators.pop(url, None)
+    
+    def forget_content_state(self, url: str) -> None:
+        """
+        Drop a URL's fingerprint and validators, so the next sync treats it as new
+        and re-scrapes it (used when its scraped content never reached the index)
+        """
+        self.content_fingerprints.pop(url, None)
+        self.http_validators.pop(url, None)
+    
     def get_recent_changes(self, hours: int = 24) -> List[ChangeEvent]:
         """Get changes detected in the last N hours"""
         try:
@@ -458,6 +560,18 @@ class ChangeDetectionSystem:
             self.logger.error(f"Error getting recent changes: {str(e)}")
             return []
     
+    def count_recent_changes(self, hours: int = 24) -> int:
+        """Count changes detected in the last N hours without building the list"""
+        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+        
+        # change_history is appended in detection order, so scan back from the newest
+        count = 0
+        for change in reversed(self.change_history):
+            if change.detected_at < cutoff:
+                break
+            count += 1
+        return count
+    
     def get_change_statistics(self) -> Dict:
         """Get statistics about detected changes"""
         try:
@@ -507,15 +621,18 @@ class ChangeDetectionSystem:
             if days is None:
                 days = self.detection_settings['max_history_days']
             
-            cutoff_time = datetime.now() - timedelta(days=days)
+            cutoff = (datetime.now() - timedelta(days=days)).isoformat()
             
-            original_count = len(self.change_history)
-            self.change_history = [
-                change for change in self.change_history
-                if datetime.fromisoformat(change.detected_at) >= cutoff_time
-            ]
+            # change_history is in detection order: trim the expired prefix in
+            # place, so changes appended meanwhile (e.g. from the event loop while
+            # this runs in a worker thread) are kept
+            removed_count = 0
+            for change in self.change_history:
+                if change.detected_at >= cutoff:
+                    break
+                removed_count += 1
+            del self.change_history[:removed_count]
             
-            removed_count = original_count - len(self.change_history)
             if removed_count > 0:
                 self.logger.info(f"Cleaned up {removed_count} old change history entries")
             
@@ -528,31 +645,46 @@ class ChangeDetectionSystem:
             if not self.blob_client:
                 self.initialize_azure_clients()
             
-            # Prepare state data
-            state_data = {
-                'fingerprints': {url: asdict(fp) for url, fp in self.content_fingerprints.items()},
-                'change_history': [asdict(change) for change in self.change_history],
-                'monitoring_schedules': {url: asdict(schedule) for url, schedule in self.monitoring_schedules.items()},
-                'saved_at': datetime.now().isoformat()
-            }
-            
-            # Convert to JSON
-            state_json = json.dumps(state_data, indent=2)
-            
-            # Upload to blob storage
-            blob_name = f"change_detection_state_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            blob_client = self.blob_client.get_blob_client(
-                container=container_name,
-                blob=blob_name
-            )
-            
-            blob_client.upload_blob(state_json, overwrite=True)
+            # Snapshot the containers on the loop; converting and uploading them
+            # runs in a worker thread so the loop keeps serving scrapes meanwhile
+            snapshot = (dict(self.content_fingerprints), list(self.change_history),
+                        dict(self.monitoring_schedules), dict(self.http_validators))
+            blob_name = await asyncio.to_thread(self._upload_state, container_name, *snapshot)
             
             self.logger.info(f"Saved change detection state to {blob_name}")
             
         except Exception as e:
             self.logger.error(f"Error saving state to Azure: {str(e)}")
     
+    def _upload_state(self, container_name: str, fingerprints: Dict[str, ContentFingerprint],
+                      change_history: List[ChangeEvent], monitoring_schedules: Dict[str, MonitoringSchedule],
+                      http_validators: Dict[str, Dict[str, str]]) -> str:
+        """Serialize a state snapshot and upload it, returning the blob name (blocking)"""
+        state_data = {
+            'fingerprints': fingerprints,
+            'change_history': change_history,
+            'monitoring_schedules': monitoring_schedules,
+            'http_validators': http_validators,
+            'saved_at': datetime.now().isoformat()
+        }
+        
+        # Compact JSON (orjson serializes the dataclasses natively), zstd-compressed
+        state_zst = zstandard.ZstdCompressor(level=3).compress(orjson.dumps(state_data))
+        
+        # Upload to blob storage
+        blob_name = f"change_detection_state_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json.zst"
+        blob_client = self.blob_client.get_blob_client(
+            container=container_name,
+            blob=blob_name
+        )
+        
+        blob_client.upload_blob(
+            state_zst, overwrite=True,
+            content_settings=ContentSettings(content_type='application/json', content_encoding='zstd')
+        )
+        
+        return blob_name
+    
     async def load_state_from_azure(self, container_name: str = 'change-detection', 
                                   blob_name: str = None) -> None:
         """Load change detection state from Azure Blob Storage"""
@@ -578,8 +710,10 @@ class ChangeDetectionSystem:
                 blob=blob_name
             )
             
-            state_json = blob_client.download_blob().readall().decode('utf-8')
-            state_data = json.loads(state_json)
+            state_bytes = blob_client.download_blob().readall()
+            if blob_name.endswith('.zst'):
+                state_bytes = zstandard.ZstdDecompressor().decompress(state_bytes)
+            state_data = orjson.loads(state_bytes)
             
             # Restore state
             self.content_fingerprints = {
@@ -596,6 +730,9 @@ class ChangeDetectionSystem:
                 url: MonitoringSchedule(**schedule_data)
                 for url, schedule_data in state_data.get('monitoring_schedules', {}).items()
             }
+            self._rebuild_schedule_heap()
+            
+            self.http_validators = state_data.get('http_validators', {})
             
             self.logger.info(f"Loaded change detection state from {blob_name}")
             
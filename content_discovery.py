@@ -1,728 +1,978 @@
-import asyncio
-import json
-import re
-import logging
-from typing import Dict, List, Set, Optional, Tuple, Pattern
-from urllib.parse import urljoin, urlparse, unquote, quote
-from dataclasses import dataclass, asdict
-from datetime import datetime
-import hashlib
-
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
-from bs4 import BeautifulSoup
-
-
-@dataclass
-class URLPattern:
-    """Structure for URL pattern information"""
-    pattern: str
-    fragment_template: str
-    view_type: str
-    content_type: str
-    examples: List[str]
-    confidence_score: float
-
-
-@dataclass
-class ContentMap:
-    """Structure for content mapping information"""
-    url: str
-    title: str
-    section_path: List[str]
-    parent_url: Optional[str]
-    child_urls: List[str]
-    content_type: str
-    last_discovered: str
-    validation_status: str
-
-
-class ContentDiscoveryService:
-    """
-    Service for discovering and mapping ExponentHR documentation content. 
-    Handles URL pattern recognition, content hierarchy mapping, and discovery optimization. 
-    """
-
-    def __init__(self, config: Dict):
-        """
-        Initialize the content discovery service.
-        
-        Args:
-            config: Configuration dictionary
-        """
-        self.config = config 
-        self.logger = self._setup_logging() 
-
-        # Discovery state
-        self.discovered_patterns: List[URLPattern] = [] 
-        self.content_map: Dict[str, ContentMap] = {} 
-        self.url_validation_cache: Dict[str, bool] = {} 
-
-        # Base URLs and patterns
-        self.base_urls = {
-            'personal': 'https://www.exponenthr.com/service/Help/Online/Exempt/ExponentHR_Personal_View.htm', 
-            'management': 'https://www.exponenthr.com/service/Help/Online/Exempt/ExponentHR_Management_View.htm' 
-        }
-
-        # Known URL patterns from analysis
-        self.known_patterns = {
-            'accepted_prefix': 'Accepted%2F', 
-            'direct_topics': [
-                'Edit_Direct_Deposit.htm', 
-                'Edit_Retirement_Plan_Contributions.htm', 
-                'Edit_W-4_Payroll_Withholding.htm' 
-            ],
-            'encoding_rules': {
-                '/': '%2F', 
-                ' ': '%20', 
-                '&': '%26', 
-                '?': '%3F', 
-                '#': '%23', 
-                '+': '%2B', 
-                '=': '%3D' 
-            }
-        }
-
-        # Content type classification patterns
-        self.content_type_patterns = {
-            'procedure': [
-                r'edit_.*\.htm', 
-                r'change_.*\.htm', 
-                r'update_.*\.htm', 
-                r'modify_.*\.htm' 
-            ],
-            'reference': [
-                r'view_.*\.htm', 
-                r'display_.*\.htm', 
-                r'show_.*\.htm' 
-            ],
-            'overview': [
-                r'about_.*\.htm', 
-                r'overview_.*\.htm', 
-                r'introduction_.*\.htm' 
-            ],
-            'faq': [
-                r'faq.*\.htm', 
-                r'frequently.*\.htm', 
-                r'questions.*\.htm' 
-            ]
-        }
-
-    def _setup_logging(self) -> logging.Logger:
-        """Setup logging configuration"""
-        logger = logging.getLogger('ContentDiscoveryService') 
-        logger.setLevel(logging.INFO) 
-
-        if not logger.handlers: 
-            handler = logging.StreamHandler() 
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            ) 
-            handler.setFormatter(formatter) 
-            logger.addHandler(handler) 
-
-        return logger
-
-    async def discover_navigation_structure(self, page: Page, view_type: str) -> Dict:
-        """
-        Discover the complete navigation structure for a view.
-        """
-        self.logger.info(f"Discovering navigation structure for {view_type} view")
-
-        try:
-            # Navigate to the base URL
-            base_url = self.base_urls[view_type]
-            self.logger.info(f"Navigating to base URL: {base_url}")
-
-            try:
-                # Use 'domcontentloaded' to avoid getting stuck on anti-bot scripts
-                await page.goto(base_url, wait_until='domcontentloaded')
-            except PlaywrightTimeoutError:
-                self.logger.error(f"FATAL: Playwright timed out while trying to navigate to {base_url}.")
-                self.logger.error("This could be a network issue or the site is blocking the container.")
-                raise  # Re-raise the exception to stop the process
-
-            # Wait a few seconds for the initial JavaScript to settle
-            await page.wait_for_timeout(5000)
-            self.logger.info("Navigation successful. Expanding sections...")
-
-            # Expand all navigation sections
-            await self._expand_all_sections(page)
-            self.logger.info("Section expansion complete. Extracting hierarchy...")
-
-            # Extract navigation hierarchy
-            navigation_structure = await self._extract_navigation_hierarchy(page, view_type)
-            self.logger.info("Hierarchy extraction complete. Analyzing patterns...")
-
-            # Analyze URL patterns
-            patterns = self._analyze_url_patterns(navigation_structure)
-            self.discovered_patterns.extend(patterns)
-
-            # Build content map
-            self._build_content_map(navigation_structure, view_type)
-            self.logger.info("Content map built. Discovery finished.")
-
-            return navigation_structure
-
-        except Exception as e:
-            self.logger.error(f"Error discovering navigation structure: {str(e)}")
-            raise
-
-    async def _expand_all_sections(self, page: Page) -> None:
-        """Expand all collapsible sections in the navigation"""
-        try:
-            self.logger.info("Attempting to find and click the main 'Expand All' button.") 
-            # Click expand/collapse all button if available
-            expand_buttons = await page.query_selector_all('a[title*="Expand"], button[title*="Expand"]') 
-            for i, button in enumerate(expand_buttons): 
-                try:
-                    self.logger.info(f"Clicking main expand button #{i+1}") 
-                    await button.click() 
-                    await page.wait_for_timeout(1000) 
-                except:
-                    self.logger.warning(f"Could not click main expand button #{i+1}") 
-                    continue
-
-            # Find and expand individual collapsible elements
-            collapsible_selectors = [
-                'li[class*="collaps"]', 
-                'div[class*="collaps"]', 
-                '.expandable', 
-                '[data-toggle="collapse"]', 
-                '.tree-node[class*="closed"]' 
-            ]
-
-            for selector in collapsible_selectors: 
-                elements = await page.query_selector_all(selector) 
-                for element in elements: 
-                    try:
-                        await element.click() 
-                        await page.wait_for_timeout(500) 
-                    except:
-                        continue
-
-            # Wait for all expansions to complete
-            await page.wait_for_timeout(2000) 
-
-            self.logger.info("Navigation sections expanded") 
-
-        except Exception as e:
-            self.logger.warning(f"Error expanding navigation sections: {str(e)}") 
-
-    async def _extract_navigation_hierarchy(self, page: Page, view_type: str) -> Dict:
-        """Extract the complete navigation hierarchy"""
-        try:
-            # Get the page HTML for parsing
-            html_content = await page.content() 
-            soup = BeautifulSoup(html_content, 'html.parser') 
-
-            # Find navigation containers
-            nav_containers = self._find_navigation_containers(soup) 
-
-            hierarchy = {
-                'view_type': view_type, 
-                'base_url': self.base_urls[view_type], 
-                'sections': [], 
-                'all_links': [], 
-                'discovered_at': datetime.now().isoformat() 
-            }
-
-            for container in nav_containers: 
-                section_data = self._parse_navigation_section(container, view_type) 
-                if section_data: 
-                    hierarchy['sections'].append(section_data) 
-
-            # Extract all links with fragment identifiers
-            all_links = soup.find_all('a', href=re.compile(r'#t=')) 
-            for link in all_links: 
-                link_data = self._parse_navigation_link(link, view_type) 
-                if link_data: 
-                    hierarchy['all_links'].append(link_data) 
-
-            return hierarchy
-
-        except Exception as e:
-            self.logger.error(f"Error extracting navigation hierarchy: {str(e)}") 
-            return {} 
-
-    def _find_navigation_containers(self, soup: BeautifulSoup) -> List:
-        """Find navigation containers in the HTML"""
-        containers = [] 
-
-        # Common navigation container selectors
-        nav_selectors = [
-            '.toc', 
-            '.navigation', 
-            '.nav-tree', 
-            '.sidebar', 
-            '#navigation', 
-            '#toc', 
-            'nav', 
-            '.menu' 
-        ]
-
-        for selector in nav_selectors: 
-            elements = soup.select(selector) 
-            containers.extend(elements) 
-
-        # If no specific containers found, look for lists with links
-        if not containers: 
-            lists = soup.find_all(['ul', 'ol']) 
-            for lst in lists: 
-                if lst.find('a', href=re.compile(r'#t=')): 
-                    containers.append(lst) 
-
-        return containers
-
-    def _parse_navigation_section(self, container, view_type: str) -> Optional[Dict]:
-        """Parse a navigation section to extract structure"""
-        try:
-            section = {
-                'title': '', 
-                'level': 0, 
-                'items': [], 
-                'subsections': [] 
-            }
-
-            # Try to find section title
-            title_elements = container.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']) 
-            if title_elements: 
-                section['title'] = title_elements[0].get_text().strip() 
-
-            # Parse navigation items
-            items = container.find_all('a', href=re.compile(r'#t=')) 
-            for item in items: 
-                item_data = self._parse_navigation_link(item, view_type) 
-                if item_data: 
-                    section['items'].append(item_data) 
-
-            # Parse nested sections
-            nested_lists = container.find_all(['ul', 'ol']) 
-            for nested_list in nested_lists: 
-                if nested_list.parent == container:  # Direct child
-                    nested_section = self._parse_navigation_section(nested_list, view_type) 
-                    if nested_section: 
-                        section['subsections'].append(nested_section) 
-
-            return section if section['items'] or section['subsections'] else None
-
-        except Exception as e:
-            self.logger.warning(f"Error parsing navigation section: {str(e)}") 
-            return None
-
-    def _parse_navigation_link(self, link_element, view_type: str) -> Optional[Dict]:
-        """Parse a navigation link to extract information"""
-        try:
-            href = link_element.get('href', '') 
-            text = link_element.get_text().strip() 
-
-            if not href or '#t=' not in href: 
-                return None 
-
-            # Extract fragment identifier
-            fragment = href.split('#t=')[1] if '#t=' in href else '' 
-
-            # Build full URL
-            full_url = urljoin(self.base_urls[view_type], href) 
-
-            # Decode fragment for analysis
-            decoded_fragment = unquote(fragment) 
-
-            # Extract section path
-            section_path = self._extract_section_path(decoded_fragment) 
-
-            # Classify content type
-            content_type = self._classify_content_type(decoded_fragment, text) 
-
-            return {
-                'text': text, 
-                'href': href, 
-                'full_url': full_url, 
-                'fragment': fragment, 
-                'decoded_fragment': decoded_fragment, 
-                'section_path': section_path, 
-                'content_type': content_type, 
-                'view_type': view_type 
-            }
-
-        except Exception as e:
-            self.logger.warning(f"Error parsing navigation link: {str(e)}") 
-            return None
-
-    def _extract_section_path(self, decoded_fragment: str) -> List[str]:
-        """Extract hierarchical section path from fragment"""
-        try:
-            # Remove file extension
-            path = decoded_fragment.replace('.htm', '').replace('.html', '') 
-
-            # Split by common separators
-            parts = re.split(r'[/\\]', path) 
-
-            # Clean up parts
-            clean_parts = [] 
-            for part in parts: 
-                # Convert underscores to spaces and clean up
-                clean_part = part.replace('_', ' ').strip() 
-                if clean_part and clean_part.lower() not in ['accepted', 'default']: 
-                    clean_parts.append(clean_part) 
-
-            return clean_parts
-
-        except:
-            return [] 
-
-    def _classify_content_type(self, fragment: str, text: str) -> str:
-        """Classify content type based on fragment and text"""
-        fragment_lower = fragment.lower() 
-        text_lower = text.lower() 
-
-        # Check against known patterns
-        for content_type, patterns in self.content_type_patterns.items(): 
-            for pattern in patterns: 
-                if re.search(pattern, fragment_lower): 
-                    return content_type
-
-        # Check text content for clues
-        if any(word in text_lower for word in ['edit', 'change', 'update', 'modify']): 
-            return 'procedure'
-        elif any(word in text_lower for word in ['view', 'display', 'show']): 
-            return 'reference'
-        elif any(word in text_lower for word in ['about', 'overview', 'introduction']): 
-            return 'overview' 
-        elif any(word in text_lower for word in ['faq', 'questions', 'help']): 
-            return 'faq'
-        else:
-            return 'documentation' 
-
-    def _analyze_url_patterns(self, navigation_structure: Dict) -> List[URLPattern]:
-        """Analyze discovered URLs to identify patterns"""
-        patterns = [] 
-
-        try:
-            all_links = navigation_structure.get('all_links', []) 
-
-            # Group links by pattern characteristics
-            pattern_groups = {} 
-
-            for link in all_links: 
-                fragment = link.get('decoded_fragment', '') 
-                content_type = link.get('content_type', 'unknown') 
-
-                # Create pattern key based on structure
-                pattern_key = self._create_pattern_key(fragment) 
-
-                if pattern_key not in pattern_groups: 
-                    pattern_groups[pattern_key] = {
-                        'examples': [], 
-                        'content_types': set(), 
-                        'view_types': set() 
-                    }
-
-                pattern_groups[pattern_key]['examples'].append(link['full_url']) 
-                pattern_groups[pattern_key]['content_types'].add(content_type) 
-                pattern_groups[pattern_key]['view_types'].add(link['view_type']) 
-
-            # Create URLPattern objects
-            for pattern_key, group_data in pattern_groups.items(): 
-                if len(group_data['examples']) >= 2:  # Only patterns with multiple examples
-                    pattern = URLPattern(
-                        pattern=pattern_key, 
-                        fragment_template=self._create_fragment_template(pattern_key), 
-                        view_type=list(group_data['view_types'])[0], 
-                        content_type=list(group_data['content_types'])[0], 
-                        examples=group_data['examples'][:5],  # Limit examples 
-                        confidence_score=min(len(group_data['examples']) / 10.0, 1.0) 
-                    )
-                    patterns.append(pattern) 
-
-            self.logger.info(f"Identified {len(patterns)} URL patterns") 
-            return patterns
-
-        except Exception as e:
-            self.logger.error(f"Error analyzing URL patterns: {str(e)}") 
-            return []
-
-    def _create_pattern_key(self, fragment: str) -> str:
-        """Create a pattern key for grouping similar URLs"""
-        try:
-            # Remove specific identifiers and create a pattern
-            pattern = fragment 
-
-            # Replace specific terms with placeholders
-            pattern = re.sub(r'\d+', '{ID}', pattern) 
-            pattern = re.sub(r'[A-Z]{2,}', '{CODE}', pattern) 
-
-            # Normalize path separators
-            pattern = pattern.replace('/', '_') 
-
-            return pattern
-
-        except:
-            return fragment 
-
-    def _create_fragment_template(self, pattern_key: str) -> str:
-        """Create a fragment template from a pattern key"""
-        # Convert pattern key back to fragment template
-        template = pattern_key.replace('_', '/') 
-        template = template.replace('{ID}', '{id}') 
-        template = template.replace('{CODE}', '{code}') 
-
-        return template
-
-    def _build_content_map(self, navigation_structure: Dict, view_type: str) -> None:
-        """Build a content map from the navigation structure"""
-        try:
-            all_links = navigation_structure.get('all_links', []) 
-
-            for link in all_links: 
-                url = link['full_url'] 
-
-                content_map_entry = ContentMap(
-                    url=url, 
-                    title=link['text'], 
-                    section_path=link['section_path'], 
-                    parent_url=None,  # Will be determined later 
-                    child_urls=[],    # Will be populated later 
-                    content_type=link['content_type'], 
-                    last_discovered=datetime.now().isoformat(), 
-                    validation_status='pending' 
-                )
-
-                self.content_map[url] = content_map_entry 
-
-            # Build parent-child relationships
-            self._build_content_relationships() 
-
-            self.logger.info(f"Built content map with {len(self.content_map)} entries") 
-
-        except Exception as e:
-            self.logger.error(f"Error building content map: {str(e)}") 
-
-    def _build_content_relationships(self) -> None:
-        """Build parent-child relationships in the content map"""
-        try:
-            # Sort URLs by section path depth
-            sorted_urls = sorted(
-                self.content_map.keys(), 
-                key=lambda url: len(self.content_map[url].section_path) 
-            )
-
-            for url in sorted_urls: 
-                entry = self.content_map[url] 
-
-                # Find potential parent
-                for parent_url in sorted_urls: 
-                    parent_entry = self.content_map[parent_url] 
-
-                    if (len(parent_entry.section_path) < len(entry.section_path) and
-                        self._is_parent_child_relationship(parent_entry.section_path, entry.section_path)): 
-
-                        entry.parent_url = parent_url 
-                        parent_entry.child_urls.append(url) 
-                        break
-
-        except Exception as e:
-            self.logger.error(f"Error building content relationships: {str(e)}") 
-
-    def _is_parent_child_relationship(self, parent_path: List[str], child_path: List[str]) -> bool:
-        """Check if two section paths have a parent-child relationship"""
-        if len(parent_path) >= len(child_path): 
-            return False
-
-        # Check if parent path is a prefix of child path
-        for i, parent_part in enumerate(parent_path): 
-            if i >= len(child_path) or parent_part.lower() != child_path[i].lower(): 
-                return False
-
-        return True
-
-    async def validate_discovered_urls(self, page: Page, urls: List[str]) -> Dict[str, bool]:
-        """
-        Validate that discovered URLs actually contain content.
-        
-        Args:
-            page: Playwright page instance
-            urls: List of URLs to validate
-            
-        Returns:
-            Dictionary mapping URLs to validation status
-        """
-        validation_results = {} 
-
-        for url in urls: 
-            if url in self.url_validation_cache: 
-                validation_results[url] = self.url_validation_cache[url] 
-                continue
-
-            try:
-                await page.goto(url, wait_until='networkidle', timeout=15000) 
-                await page.wait_for_timeout(2000) 
-
-                # Check if content is loaded
-                content = await page.inner_text('body') 
-
-                # Validate content quality
-                is_valid = self._validate_content_quality(content, url) 
-
-                validation_results[url] = is_valid 
-                self.url_validation_cache[url] = is_valid 
-
-                # Update content map
-                if url in self.content_map: 
-                    self.content_map[url].validation_status = 'valid' if is_valid else 'invalid' 
-
-            except Exception as e:
-                self.logger.warning(f"Failed to validate URL {url}: {str(e)}") 
-                validation_results[url] = False 
-                self.url_validation_cache[url] = False 
-
-                if url in self.content_map: 
-                    self.content_map[url].validation_status = 'error' 
-
-        return validation_results
-
-    def _validate_content_quality(self, content: str, url: str) -> bool:
-        """Validate the quality of extracted content"""
-        try:
-            # Check minimum content length
-            if len(content.strip()) < 50: 
-                return False 
-
-            # Check for error indicators
-            error_indicators = [
-                'page not found', 
-                '404', 
-                'error', 
-                'not available', 
-                'access denied' 
-            ]
-
-            content_lower = content.lower() 
-            if any(indicator in content_lower for indicator in error_indicators): 
-                return False 
-
-            # Check for meaningful content
-            word_count = len(content.split()) 
-            if word_count < 10: 
-                return False
-
-            # Check for navigation-only content
-            if content_lower.count('click') > word_count * 0.1:  # Too many "click" instructions 
-                return False
-
-            return True
-
-        except:
-            return False 
-
-    def generate_urls_from_patterns(self, pattern: URLPattern, parameters: Dict) -> List[str]:
-        """
-        Generate URLs from discovered patterns with given parameters.
-        
-        Args:
-            pattern: URLPattern to use for generation
-            parameters: Dictionary of parameters to substitute
-            
-        Returns:
-            List of generated URLs
-        """
-        generated_urls = [] 
-
-        try:
-            template = pattern.fragment_template 
-
-            # Substitute parameters in template
-            for key, value in parameters.items(): 
-                placeholder = f'{{{key}}}' 
-                if placeholder in template: 
-                    template = template.replace(placeholder, str(value)) 
-
-            # Encode the fragment
-            encoded_fragment = self._encode_fragment(template) 
-
-            # Build full URL
-            base_url = self.base_urls.get(pattern.view_type, self.base_urls['personal']) 
-            full_url = f"{base_url}#t={encoded_fragment}" 
-
-            generated_urls.append(full_url) 
-
-        except Exception as e:
-            self.logger.error(f"Error generating URLs from pattern: {str(e)}") 
-
-        return generated_urls
-
-    def _encode_fragment(self, fragment: str) -> str:
-        """Encode fragment identifier according to ExponentHR conventions"""
-        # Apply known encoding rules
-        encoded = fragment 
-        for char, encoded_char in self.known_patterns['encoding_rules'].items(): 
-            encoded = encoded.replace(char, encoded_char) 
-
-        return encoded
-
-    def get_discovery_statistics(self) -> Dict:
-        """Get statistics about the discovery process"""
-        return {
-            'discovered_patterns': len(self.discovered_patterns), 
-            'content_map_entries': len(self.content_map), 
-            'validated_urls': len([url for url, valid in self.url_validation_cache.items() if valid]), 
-            'invalid_urls': len([url for url, valid in self.url_validation_cache.items() if not valid]), 
-            'content_types': list(set(entry.content_type for entry in self.content_map.values())), 
-            'view_types': list(set(pattern.view_type for pattern in self.discovered_patterns))
-        }
-
-    def export_discovery_results(self) -> Dict:
-        """Export discovery results for persistence or analysis"""
-        return {
-            'patterns': [asdict(pattern) for pattern in self.discovered_patterns], 
-            'content_map': {url: asdict(entry) for url, entry in self.content_map.items()}, 
-            'validation_cache': self.url_validation_cache, 
-            'statistics': self.get_discovery_statistics(), 
-            'export_timestamp': datetime.now().isoformat() 
-        }
-
-
-# Example usage
-async def main():
-    """Example usage of the content discovery service"""
-    from exponenthr_scraper import ExponentHRScraper
-
-    config = {
-        'max_concurrent_requests': 5, 
-        'request_delay': 1.0 
-    }
-
-    discovery_service = ContentDiscoveryService(config) 
-    scraper = ExponentHRScraper(config) 
-
-    try:
-        await scraper.initialize_browser() 
-
-        # Discover navigation structure for personal view
-        nav_structure = await discovery_service.discover_navigation_structure(
-            scraper.page, 'personal'
-        ) 
-
-        print(f"Discovered {len(nav_structure.get('all_links', []))} links") 
-
-        # Validate some URLs
-        sample_urls = [link['full_url'] for link in nav_structure.get('all_links', [])[:5]] 
-        validation_results = await discovery_service.validate_discovered_urls(
-            scraper.page, sample_urls
-        ) 
-
-        print("Validation results:") 
-        for url, is_valid in validation_results.items(): 
-            print(f"  {url}: {'Valid' if is_valid else 'Invalid'}") 
-
-        # Print statistics
-        stats = discovery_service.get_discovery_statistics() 
-        print("\nDiscovery Statistics:") 
-        for key, value in stats.items(): 
-            print(f"  {key}: {value}") 
-
-    finally:
-        await scraper.close_browser() 
-
-
-if __name__ == "__main__":
+import asyncio
+import json
+import re
+import logging
+import os
+import sqlite3
+import sys
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Set, Optional, Tuple, Pattern, Union
+from urllib.parse import urljoin, urlparse, unquote, quote
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from functools import lru_cache
+
+import aiohttp
+import lxml.html
+from playwright.async_api import BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
+
+
+def _class_xpath(class_name: str) -> str:
+    """XPath predicate matching an element carrying the given CSS class"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+# XPath equivalents of the navigation container selectors
+# (.toc, .navigation, .nav-tree, .sidebar, #navigation, #toc, nav, .menu)
+NAV_CONTAINER_XPATH = '//*[{}]'.format(' or '.join([
+    _class_xpath('toc'),
+    _class_xpath('navigation'),
+    _class_xpath('nav-tree'),
+    _class_xpath('sidebar'),
+    "@id='navigation'",
+    "@id='toc'",
+    'self::nav',
+    _class_xpath('menu'),
+]))
+LINK_LIST_XPATH = "//*[(self::ul or self::ol) and .//a[contains(@href, '#t=')]]"
+# Default on-disk URL validation cache, anchored to the repo root rather than the
+# working directory (gunicorn chdirs into the API package); the env var overrides it
+DEFAULT_VALIDATION_CACHE_PATH = os.environ.get(
+    'URL_VALIDATION_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'url_validation_cache.db')
+)
+# Clicks every element matching each selector group in turn; returns the click count
+EXPAND_SECTIONS_SCRIPT = """
+selectors => {
+    let clicked = 0;
+    for (const selector of selectors) {
+        document.querySelectorAll(selector).forEach(el => {
+            try { el.click(); clicked++; } catch (e) {}
+        });
+    }
+    return clicked;
+}
+"""
+HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+
+# Regexes used per link, compiled once at import
+_SPLIT_RE = re.compile(r'[/\\]')
+_DIGIT_RE = re.compile(r'\d+')
+_UPPER_RE = re.compile(r'[A-Z]{2,}')
+_ERROR_INDICATOR_RE = re.compile(r'page not found|404|error|not available|access denied', re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def _unquote_fragment(fragment: str) -> str:
+    """Memoized unquote; navigation trees repeat the same fragments"""
+    return unquote(fragment)
+
+
+@lru_cache(maxsize=4096)
+def _classify_content_type(fragment_lower: str, text_lower: str,
+                           patterns: Tuple[Tuple[str, Pattern], ...],
+                           keywords: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> str:
+    """Memoized content type classification; the same topics recur across navigation sections"""
+    # Check against known patterns
+    for content_type, pattern in patterns:
+        if pattern.search(fragment_lower):
+            return content_type
+
+    # Check text content for clues
+    for content_type, words in keywords:
+        if any(word in text_lower for word in words):
+            return content_type
+
+    return 'documentation'
+
+
+# HEAD responses that say nothing about whether the page exists (HEAD not
+# supported, bot protection, throttling); these URLs still get a browser check
+_HEAD_INCONCLUSIVE_STATUSES = frozenset({403, 405, 429, 501})
+
+
+@dataclass(slots=True)
+class URLPattern:
+    """Structure for URL pattern information"""
+    pattern: str
+    fragment_template: str
+    view_type: str
+    content_type: str
+    examples: List[str]
+    confidence_score: float
+
+
+@dataclass(slots=True)
+class ContentMap:
+    """Structure for content mapping information"""
+    url: str
+    title: str
+    section_path: List[str]
+    parent_url: Optional[str]
+    child_urls: List[str]
+    content_type: str
+    last_discovered: str
+    validation_status: str
+
+
+class ContentDiscoveryService:
+    """
+    Service for discovering and mapping ExponentHR documentation content. 
+    Handles URL pattern recognition, content hierarchy mapping, and discovery optimization. 
+    """
+
+    # Link-text keywords used when the fragment matches no content type pattern
+    _PROCEDURE_WORDS = ('edit', 'change', 'update', 'modify')
+    _REFERENCE_WORDS = ('view', 'display', 'show')
+    _OVERVIEW_WORDS = ('about', 'overview', 'introduction')
+    _FAQ_WORDS = ('faq', 'questions', 'help')
+    _CONTENT_TYPE_KEYWORDS = (
+        ('procedure', _PROCEDURE_WORDS),
+        ('reference', _REFERENCE_WORDS),
+        ('overview', _OVERVIEW_WORDS),
+        ('faq', _FAQ_WORDS),
+    )
+
+    def __init__(self, config: Dict):
+        """
+        Initialize the content discovery service.
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config 
+        self.logger = self._setup_logging() 
+
+        # Discovery state
+        self.discovered_patterns: List[URLPattern] = [] 
+        self.content_map: Dict[str, ContentMap] = {} 
+        self.url_validation_cache: Dict[str, bool] = {} 
+        self.url_validation_timestamps: Dict[str, float] = {} 
+
+        # Validation results persist across runs in SQLite and are reused until they expire
+        self.validation_cache_path: Optional[str] = config.get(
+            'validation_cache_path', DEFAULT_VALIDATION_CACHE_PATH
+        ) 
+        self.validation_cache_ttl: float = config.get('validation_cache_ttl_seconds', 7 * 24 * 3600) 
+        self._validation_db: Optional[sqlite3.Connection] = None 
+        self._load_validation_cache() 
+
+        # Base URLs and patterns
+        self.base_urls = {
+            'personal': 'https://www.exponenthr.com/service/Help/Online/Exempt/ExponentHR_Personal_View.htm', 
+            'management': 'https://www.exponenthr.com/service/Help/Online/Exempt/ExponentHR_Management_View.htm' 
+        }
+        # Fragment-less bases so '#t=...' hrefs can be resolved by concatenation
+        self._base_for_view = {
+            view: url.split('#', 1)[0] for view, url in self.base_urls.items()
+        }
+
+        # Known URL patterns from analysis
+        self.known_patterns = {
+            'accepted_prefix': 'Accepted%2F', 
+            'direct_topics': [
+                'Edit_Direct_Deposit.htm', 
+                'Edit_Retirement_Plan_Contributions.htm', 
+                'Edit_W-4_Payroll_Withholding.htm' 
+            ],
+            'encoding_rules': {
+                '/': '%2F', 
+                ' ': '%20', 
+                '&': '%26', 
+                '?': '%3F', 
+                '#': '%23', 
+                '+': '%2B', 
+                '=': '%3D' 
+            }
+        }
+        self._encode_table = str.maketrans(self.known_patterns['encoding_rules']) 
+
+        # Content type classification patterns
+        self.content_type_patterns = {
+            'procedure': [
+                r'edit_.*\.htm', 
+                r'change_.*\.htm', 
+                r'update_.*\.htm', 
+                r'modify_.*\.htm' 
+            ],
+            'reference': [
+                r'view_.*\.htm', 
+                r'display_.*\.htm', 
+                r'show_.*\.htm' 
+            ],
+            'overview': [
+                r'about_.*\.htm', 
+                r'overview_.*\.htm', 
+                r'introduction_.*\.htm' 
+            ],
+            'faq': [
+                r'faq.*\.htm', 
+                r'frequently.*\.htm', 
+                r'questions.*\.htm' 
+            ]
+        }
+        # One alternation per category, checked in declaration order so that
+        # category priority is the same as testing each pattern in turn
+        self._ctype_re: Dict[str, Pattern] = {
+            content_type: re.compile('|'.join(patterns))
+            for content_type, patterns in self.content_type_patterns.items()
+        }
+        self._ctype_re_items: Tuple[Tuple[str, Pattern], ...] = tuple(self._ctype_re.items())
+
+    def _setup_logging(self) -> logging.Logger:
+        """Setup logging configuration"""
+        logger = logging.getLogger('ContentDiscoveryService') 
+        logger.setLevel(logging.INFO) 
+
+        if not logger.handlers: 
+            handler = logging.StreamHandler() 
+            formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            ) 
+            handler.setFormatter(formatter) 
+            logger.addHandler(handler) 
+
+        return logger
+
+    async def discover_navigation_structure(self, page: Page, view_type: str) -> Dict:
+        """
+        Discover the complete navigation structure for a view.
+        """
+        self.logger.info(f"Discovering navigation structure for {view_type} view")
+        view_type = sys.intern(view_type)
+
+        try:
+            # Navigate to the base URL
+            base_url = self.base_urls[view_type]
+            self.logger.info(f"Navigating to base URL: {base_url}")
+
+            try:
+                # Use 'domcontentloaded' to avoid getting stuck on anti-bot scripts
+                await page.goto(base_url, wait_until='domcontentloaded')
+            except PlaywrightTimeoutError:
+                self.logger.error(f"FATAL: Playwright timed out while trying to navigate to {base_url}.")
+                self.logger.error("This could be a network issue or the site is blocking the container.")
+                raise  # Re-raise the exception to stop the process
+
+            # Wait a few seconds for the initial JavaScript to settle
+            await page.wait_for_timeout(5000)
+            self.logger.info("Navigation successful. Expanding sections...")
+
+            # Expand all navigation sections
+            await self._expand_all_sections(page)
+            self.logger.info("Section expansion complete. Extracting hierarchy...")
+
+            # Extract navigation hierarchy
+            navigation_structure = await self._extract_navigation_hierarchy(page, view_type)
+            self.logger.info("Hierarchy extraction complete. Analyzing patterns...")
+
+            # Analyze URL patterns and build the content map in one pass over the links
+            patterns = self._index_navigation_links(navigation_structure.get('all_links', []))
+            self.discovered_patterns.extend(patterns)
+            self.logger.info("Content map built. Discovery finished.")
+
+            return navigation_structure
+
+        except Exception as e:
+            self.logger.error(f"Error discovering navigation structure: {str(e)}")
+            raise
+
+    async def discover_all(self, browser_context: BrowserContext,
+                           view_types: Optional[List[str]] = None) -> Dict[str, Union[Dict, Exception]]:
+        """
+        Discover the navigation structure of several views concurrently.
+        
+        Each view gets its own page from the context. Shared discovery state
+        (patterns, content map) is only updated between awaits, so the
+        concurrent runs cannot interleave their writes.
+        
+        Args:
+            browser_context: Playwright browser context to open pages from
+            view_types: Views to discover (defaults to all known views)
+            
+        Returns:
+            Dictionary mapping each view type to its navigation structure,
+            or to the exception raised while discovering it
+        """
+        if view_types is None: 
+            view_types = list(self.base_urls.keys()) 
+
+        pages = await asyncio.gather(*(browser_context.new_page() for _ in view_types)) 
+        try:
+            structures = await asyncio.gather(
+                *(self.discover_navigation_structure(page, view_type) for page, view_type in zip(pages, view_types)),
+                return_exceptions=True
+            ) 
+        finally:
+            await asyncio.gather(*(page.close() for page in pages), return_exceptions=True) 
+
+        return dict(zip(view_types, structures))
+
+    async def _expand_all_sections(self, page: Page) -> None:
+        """Expand all collapsible sections in the navigation"""
+        try:
+            # Click the main 'Expand All' buttons first, then every individual
+            # collapsible element, all inside the page in one round-trip
+            clicked = await page.evaluate(EXPAND_SECTIONS_SCRIPT, [
+                'a[title*="Expand"], button[title*="Expand"]', 
+                'li[class*="collaps"]', 
+                'div[class*="collaps"]', 
+                '.expandable', 
+                '[data-toggle="collapse"]', 
+                '.tree-node[class*="closed"]' 
+            ]) 
+
+            # Wait for all expansions to complete
+            await page.wait_for_timeout(2000) 
+
+            self.logger.info(f"Navigation sections expanded ({clicked} elements clicked)") 
+
+        except Exception as e:
+            self.logger.warning(f"Error expanding navigation sections: {str(e)}") 
+
+    async def _extract_navigation_hierarchy(self, page: Page, view_type: str) -> Dict:
+        """Extract the complete navigation hierarchy"""
+        try:
+            # Get the page HTML for parsing
+            html_content = await page.content() 
+            tree = lxml.html.fromstring(html_content) 
+
+            # Find navigation containers
+            nav_containers = tree.xpath(NAV_CONTAINER_XPATH) 
+
+            # If no specific containers found, look for lists with links
+            if not nav_containers: 
+                nav_containers = tree.xpath(LINK_LIST_XPATH) 
+
+            hierarchy = {
+                'view_type': view_type, 
+                'base_url': self.base_urls[view_type], 
+                'sections': [], 
+                'all_links': [], 
+                'discovered_at': datetime.now().isoformat() 
+            }
+
+            # Parse every link with a fragment identifier exactly once; the
+            # section walk below reuses these parses. Keying by element keeps
+            # the lxml proxies alive, so identity lookups stay valid.
+            parsed_links = {
+                link: self._parse_navigation_link(link, view_type)
+                for link in self._iter_fragment_links(tree)
+            } 
+            hierarchy['all_links'].extend(
+                link_data for link_data in parsed_links.values() if link_data
+            ) 
+
+            for container in nav_containers: 
+                section_data = self._parse_navigation_section(container, view_type, parsed_links) 
+                if section_data: 
+                    hierarchy['sections'].append(section_data) 
+
+            return hierarchy
+
+        except Exception as e:
+            self.logger.error(f"Error extracting navigation hierarchy: {str(e)}") 
+            return {} 
+
+    def _iter_fragment_links(self, tree) -> Iterator:
+        """Lazily yield every link element with a fragment identifier"""
+        for link in tree.iter('a'): 
+            if '#t=' in (link.get('href') or ''): 
+                yield link
+
+    def _parse_navigation_section(self, container, view_type: str,
+                                  parsed_links: Optional[Dict] = None) -> Optional[Dict]:
+        """Parse a navigation section to extract structure"""
+        try:
+            section = {
+                'title': '', 
+                'level': 0, 
+                'items': [], 
+                'subsections': [] 
+            }
+
+            # Walk the container once: links become items, nested lists become
+            # subsections (each parsed by its own walk), and the first heading
+            # seen supplies the title. Children are pushed in reverse so nodes
+            # pop in document order.
+            stack = list(reversed(container)) 
+            while stack: 
+                element = stack.pop() 
+                tag = element.tag 
+                if not isinstance(tag, str):  # comments / processing instructions
+                    continue
+
+                if tag == 'a' and '#t=' in (element.get('href') or ''): 
+                    if parsed_links is not None and element in parsed_links: 
+                        item_data = parsed_links[element] 
+                    else:
+                        item_data = self._parse_navigation_link(element, view_type) 
+                    if item_data: 
+                        section['items'].append(item_data) 
+                elif tag in ('ul', 'ol'): 
+                    nested_section = self._parse_navigation_section(element, view_type, parsed_links) 
+                    if nested_section: 
+                        section['subsections'].append(nested_section) 
+                else:
+                    if tag in HEADING_TAGS and not section['title']: 
+                        section['title'] = element.text_content().strip() 
+                    stack.extend(reversed(element)) 
+
+            return section if section['items'] or section['subsections'] else None
+
+        except Exception as e:
+            self.logger.warning(f"Error parsing navigation section: {str(e)}") 
+            return None
+
+    def _parse_navigation_link(self, link_element, view_type: str) -> Optional[Dict]:
+        """Parse a navigation link to extract information"""
+        try:
+            href = link_element.get('href', '') 
+            text = link_element.text_content().strip() 
+
+            if not href or '#t=' not in href: 
+                return None 
+
+            # Extract fragment identifier
+            fragment = href.split('#t=')[1] if '#t=' in href else '' 
+
+            # Build full URL
+            if href.startswith('#'): 
+                full_url = self._base_for_view[view_type] + href 
+            else:
+                full_url = urljoin(self.base_urls[view_type], href) 
+
+            # Decode fragment for analysis
+            decoded_fragment = _unquote_fragment(fragment) 
+
+            # Extract section path
+            section_path = self._extract_section_path(decoded_fragment) 
+
+            # Classify content type
+            content_type = sys.intern(self._classify_content_type(decoded_fragment, text)) 
+
+            return {
+                'text': text, 
+                'href': href, 
+                'full_url': full_url, 
+                'fragment': fragment, 
+                'decoded_fragment': decoded_fragment, 
+                'section_path': section_path, 
+                'content_type': content_type, 
+                'view_type': view_type 
+            }
+
+        except Exception as e:
+            self.logger.warning(f"Error parsing navigation link: {str(e)}") 
+            return None
+
+    def _extract_section_path(self, decoded_fragment: str) -> List[str]:
+        """Extract hierarchical section path from fragment"""
+        try:
+            # Remove file extension
+            path = decoded_fragment.replace('.htm', '').replace('.html', '') 
+
+            # Split by common separators
+            parts = _SPLIT_RE.split(path) 
+
+            # Clean up parts
+            clean_parts = [] 
+            for part in parts: 
+                # Convert underscores to spaces and clean up
+                clean_part = part.replace('_', ' ').strip() 
+                if clean_part and clean_part.lower() not in ['accepted', 'default']: 
+                    # Section names recur across many links; share one string object each
+                    clean_parts.append(sys.intern(clean_part)) 
+
+            return clean_parts
+
+        except:
+            return [] 
+
+    def _classify_content_type(self, fragment: str, text: str) -> str:
+        """Classify content type based on fragment and text"""
+        return _classify_content_type(
+            fragment.lower(), text.lower(), self._ctype_re_items, self._CONTENT_TYPE_KEYWORDS
+        )
+
+    def _create_pattern_key(self, fragment: str) -> str:
+        """Create a pattern key for grouping similar URLs"""
+        try:
+            # Remove specific identifiers and create a pattern
+            pattern = fragment 
+
+            # Replace specific terms with placeholders
+            pattern = _DIGIT_RE.sub('{ID}', pattern) 
+            pattern = _UPPER_RE.sub('{CODE}', pattern) 
+
+            # Normalize path separators
+            pattern = pattern.replace('/', '_') 
+
+            return pattern
+
+        except:
+            return fragment 
+
+    def _create_fragment_template(self, pattern_key: str) -> str:
+        """Create a fragment template from a pattern key"""
+        # Convert pattern key back to fragment template
+        template = pattern_key.replace('_', '/') 
+        template = template.replace('{ID}', '{id}') 
+        template = template.replace('{CODE}', '{code}') 
+
+        return template
+
+    def _index_navigation_links(self, all_links: List[Dict]) -> List[URLPattern]:
+        """
+        Group links into URL patterns and add them to the content map in a single pass.
+        
+        Returns:
+            URL patterns that have at least two examples
+        """
+        patterns = [] 
+
+        try:
+            # Group links by pattern characteristics
+            pattern_groups: Dict[str, Dict] = defaultdict(lambda: {
+                'examples': [], 
+                'content_types': set(), 
+                'view_types': set() 
+            })
+            discovered_at = datetime.now().isoformat() 
+
+            for link in all_links: 
+                url = link['full_url'] 
+                fragment = link.get('decoded_fragment', '') 
+                content_type = link.get('content_type', 'unknown') 
+
+                # Create pattern key based on structure
+                pattern_key = self._create_pattern_key(fragment) 
+
+                group = pattern_groups[pattern_key] 
+                group['examples'].append(url) 
+                group['content_types'].add(content_type) 
+                group['view_types'].add(link['view_type']) 
+
+                self.content_map[url] = ContentMap(
+                    url=url, 
+                    title=link['text'], 
+                    section_path=link['section_path'], 
+                    parent_url=None,  # Will be determined later 
+                    child_urls=[],    # Will be populated later 
+                    content_type=link['content_type'], 
+                    last_discovered=discovered_at, 
+                    validation_status='pending' 
+                )
+
+            # Create URLPattern objects
+            for pattern_key, group_data in pattern_groups.items(): 
+                if len(group_data['examples']) >= 2:  # Only patterns with multiple examples
+                    pattern = URLPattern(
+                        pattern=pattern_key, 
+                        fragment_template=self._create_fragment_template(pattern_key), 
+                        view_type=list(group_data['view_types'])[0], 
+                        content_type=list(group_data['content_types'])[0], 
+                        examples=group_data['examples'][:5],  # Limit examples 
+                        confidence_score=min(len(group_data['examples']) / 10.0, 1.0) 
+                    )
+                    patterns.append(pattern) 
+
+            # Build parent-child relationships
+            self._build_content_relationships() 
+
+            self.logger.info(f"Identified {len(patterns)} URL patterns") 
+            self.logger.info(f"Built content map with {len(self.content_map)} entries") 
+            return patterns
+
+        except Exception as e:
+            self.logger.error(f"Error indexing navigation links: {str(e)}") 
+            return []
+
+    def _build_content_relationships(self) -> None:
+        """Build parent-child relationships in the content map"""
+        try:
+            # Bucket entries by depth. Within each depth, paths are indexed
+            # case-folded; the first entry seen for a path wins, matching the
+            # previous ordered scan.
+            urls_by_depth: Dict[int, List[Tuple[str, Tuple[str, ...]]]] = defaultdict(list) 
+            paths_by_depth: Dict[int, Dict[Tuple[str, ...], str]] = defaultdict(dict) 
+            for url, entry in self.content_map.items(): 
+                entry.parent_url = None 
+                entry.child_urls = [] 
+                key = tuple(part.lower() for part in entry.section_path) 
+                urls_by_depth[len(key)].append((url, key)) 
+                paths_by_depth[len(key)].setdefault(key, url) 
+
+            # Walk depths in ascending order; a direct parent can only live one level up
+            for depth in sorted(urls_by_depth): 
+                parents = paths_by_depth.get(depth - 1) 
+                if not parents: 
+                    continue
+
+                for url, key in urls_by_depth[depth]: 
+                    parent_url = parents.get(key[:-1]) 
+                    if parent_url is not None: 
+                        self.content_map[url].parent_url = parent_url 
+                        self.content_map[parent_url].child_urls.append(url) 
+
+        except Exception as e:
+            self.logger.error(f"Error building content relationships: {str(e)}") 
+
+    def _is_parent_child_relationship(self, parent_path: List[str], child_path: List[str]) -> bool:
+        """Check if two section paths have a parent-child relationship"""
+        if len(parent_path) >= len(child_path): 
+            return False
+
+        # Check if parent path is a prefix of child path
+        for i, parent_part in enumerate(parent_path): 
+            if i >= len(child_path) or parent_part.lower() != child_path[i].lower(): 
+                return False
+
+        return True
+
+    async def validate_discovered_urls(self, browser_context: BrowserContext, urls: List[str]) -> Dict[str, bool]:
+        """
+        Validate that discovered URLs actually contain content.
+        
+        Args:
+            browser_context: Playwright browser context to open pages from
+            urls: List of URLs to validate
+            
+        Returns:
+            Dictionary mapping URLs to validation status
+        """
+        async for _ in self.iter_valid_urls(browser_context, urls): 
+            pass 
+
+        return {url: self.url_validation_cache[url] for url in urls}
+
+    async def iter_valid_urls(self, browser_context: BrowserContext, urls: List[str]) -> AsyncIterator[str]:
+        """
+        Validate discovered URLs, yielding each valid one as soon as it is known.
+        
+        URLs with a fresh cached result are yielded first. Each distinct
+        document (URL without fragment) is then checked with an HTTP HEAD
+        request so dead pages are rejected without a browser load, and the
+        remaining URLs are validated concurrently on a pool of pages opened
+        from the context, sized by the 'max_concurrent_requests' setting.
+        Those are yielded in completion order, so callers can start work on
+        them while the rest are still being validated.
+        
+        Args:
+            browser_context: Playwright browser context to open pages from
+            urls: List of URLs to validate
+            
+        Yields:
+            Each distinct valid URL
+        """
+        expiry = time.time() - self.validation_cache_ttl 
+        unique_urls = list(dict.fromkeys(urls)) 
+        pending_urls = [
+            url for url in unique_urls
+            if url not in self.url_validation_cache or self.url_validation_timestamps.get(url, 0.0) <= expiry
+        ] 
+        validated_urls = list(pending_urls) 
+
+        pending = set(pending_urls) 
+        for url in unique_urls: 
+            if url not in pending and self.url_validation_cache[url]: 
+                yield url 
+
+        try:
+            if pending_urls: 
+                dead_bases = await self._find_dead_base_urls(
+                    {url.split('#', 1)[0] for url in pending_urls}
+                ) 
+                if dead_bases: 
+                    for url in pending_urls: 
+                        if url.split('#', 1)[0] in dead_bases: 
+                            self._record_validation(url, False) 
+                            if url in self.content_map: 
+                                self.content_map[url].validation_status = 'invalid' 
+                    pending_urls = [url for url in pending_urls if url.split('#', 1)[0] not in dead_bases] 
+
+            if pending_urls: 
+                pool_size = max(1, min(self.config.get('max_concurrent_requests', 5), len(pending_urls))) 
+                pages = await asyncio.gather(*(browser_context.new_page() for _ in range(pool_size))) 
+                page_pool: asyncio.Queue = asyncio.Queue() 
+                for pooled_page in pages: 
+                    page_pool.put_nowait(pooled_page) 
+
+                async def validate_one(url: str) -> Tuple[str, bool]:
+                    pooled_page = await page_pool.get() 
+                    try:
+                        is_valid = await self._validate_url(pooled_page, url) 
+                        self._record_validation(url, is_valid) 
+                        return url, is_valid 
+                    finally:
+                        page_pool.put_nowait(pooled_page) 
+
+                tasks = [asyncio.create_task(validate_one(url)) for url in pending_urls] 
+                try:
+                    for next_result in asyncio.as_completed(tasks): 
+                        url, is_valid = await next_result 
+                        if is_valid: 
+                            yield url 
+                finally:
+                    for task in tasks: 
+                        task.cancel() 
+                    await asyncio.gather(*tasks, return_exceptions=True) 
+                    await asyncio.gather(*(pooled_page.close() for pooled_page in pages), return_exceptions=True) 
+        finally:
+            self._persist_validation_cache(validated_urls) 
+
+    def _record_validation(self, url: str, is_valid: bool) -> None:
+        """Store a validation result in the in-memory cache"""
+        self.url_validation_cache[url] = is_valid 
+        self.url_validation_timestamps[url] = time.time() 
+
+    def _load_validation_cache(self) -> None:
+        """Load unexpired validation results from the on-disk cache"""
+        if not self.validation_cache_path: 
+            return
+
+        try:
+            directory = os.path.dirname(self.validation_cache_path) 
+            if directory: 
+                os.makedirs(directory, exist_ok=True) 
+
+            # One connection for the life of the service; WAL lets the periodic
+            # writes from validation runs proceed without blocking reads
+            conn = sqlite3.connect(self.validation_cache_path, check_same_thread=False) 
+            conn.execute('PRAGMA journal_mode=WAL') 
+            conn.execute('PRAGMA synchronous=NORMAL') 
+            conn.execute('PRAGMA temp_store=MEMORY') 
+            self._validation_db = conn 
+
+            with conn: 
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS url_validation '
+                    '(url TEXT PRIMARY KEY, valid INTEGER NOT NULL, ts REAL NOT NULL)'
+                ) 
+                rows = conn.execute(
+                    'SELECT url, valid, ts FROM url_validation WHERE ts > ?',
+                    (time.time() - self.validation_cache_ttl,)
+                ).fetchall() 
+
+            for url, valid, ts in rows: 
+                self.url_validation_cache[url] = bool(valid) 
+                self.url_validation_timestamps[url] = ts 
+
+            self.logger.info(f"Loaded {len(rows)} cached URL validation results") 
+
+        except (sqlite3.Error, OSError) as e:
+            # An unwritable or missing location leaves the cache in memory only
+            self.logger.warning(f"Could not load validation cache, keeping it in memory: {str(e)}") 
+            if self._validation_db is not None: 
+                self._validation_db.close() 
+                self._validation_db = None 
+
+    def _persist_validation_cache(self, urls: List[str]) -> None:
+        """Write validation results for the given URLs to the on-disk cache"""
+        if self._validation_db is None or not urls: 
+            return
+
+        try:
+            with self._validation_db as conn: 
+                conn.executemany(
+                    'INSERT OR REPLACE INTO url_validation (url, valid, ts) VALUES (?, ?, ?)',
+                    [
+                        (url, int(self.url_validation_cache[url]), self.url_validation_timestamps[url])
+                        for url in urls if url in self.url_validation_cache
+                    ]
+                ) 
+
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not persist validation cache: {str(e)}") 
+
+    async def _find_dead_base_urls(self, base_urls: Set[str]) -> Set[str]:
+        """Return the base URLs whose HEAD request fails with a definitive error status"""
+        dead_bases = set() 
+        timeout = aiohttp.ClientTimeout(total=10) 
+
+        async def check(session: aiohttp.ClientSession, base_url: str) -> None:
+            try:
+                async with session.head(base_url, allow_redirects=True) as response: 
+                    if response.status >= 400 and response.status not in _HEAD_INCONCLUSIVE_STATUSES: 
+                        dead_bases.add(base_url) 
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Leave the decision to the browser check
+                self.logger.debug(f"HEAD check failed for {base_url}: {str(e)}") 
+
+        async with aiohttp.ClientSession(timeout=timeout) as session: 
+            await asyncio.gather(*(check(session, base_url) for base_url in base_urls)) 
+
+        if dead_bases: 
+            self.logger.info(f"HEAD check rejected {len(dead_bases)} base URLs") 
+        return dead_bases
+
+    async def _validate_url(self, page: Page, url: str) -> bool:
+        """Load a single URL on the given page and validate its content"""
+        try:
+            base_url, _, fragment = url.partition('#') 
+            if fragment and page.url.split('#', 1)[0] == base_url: 
+                # Same document already loaded: switch topics via the hash
+                # instead of reloading the whole help shell
+                await page.evaluate("hash => { window.location.hash = hash; }", '#' + fragment) 
+                await page.wait_for_load_state('networkidle', timeout=15000) 
+                await page.wait_for_timeout(self.config.get('hash_navigation_settle_ms', 500)) 
+            else:
+                await page.goto(url, wait_until='networkidle', timeout=15000) 
+                await page.wait_for_timeout(2000) 
+
+            # Check if content is loaded
+            content = await page.inner_text('body') 
+
+            # Validate content quality
+            is_valid = self._validate_content_quality(content, url) 
+
+            # Update content map
+            if url in self.content_map: 
+                self.content_map[url].validation_status = 'valid' if is_valid else 'invalid' 
+
+            return is_valid
+
+        except PlaywrightTimeoutError:
+            self.logger.warning(f"Timed out validating URL {url}") 
+        except Exception as e:
+            self.logger.warning(f"Failed to validate URL {url}: {str(e)}") 
+
+        if url in self.content_map: 
+            self.content_map[url].validation_status = 'error' 
+        return False
+
+    def _validate_content_quality(self, content: str, url: str) -> bool:
+        """Validate the quality of extracted content"""
+        try:
+            # Check minimum content length
+            if len(content.strip()) < 50: 
+                return False 
+
+            # Check for error indicators (case-insensitive, no lowercased copy)
+            if _ERROR_INDICATOR_RE.search(content): 
+                return False 
+
+            # Check for meaningful content
+            word_count = len(content.split()) 
+            if word_count < 10: 
+                return False
+
+            # Check for navigation-only content
+            click_count = content.count('click') + content.count('Click') + content.count('CLICK') 
+            if click_count > word_count * 0.1:  # Too many "click" instructions 
+                return False
+
+            return True
+
+        except:
+            return False 
+
+    def generate_urls_from_patterns(self, pattern: URLPattern, parameters: Dict) -> List[str]:
+        """
+        Generate URLs from discovered patterns with given parameters.
+        
+        Args:
+            pattern: URLPattern to use for generation
+            parameters: Dictionary of parameters to substitute
+            
+        Returns:
+            List of generated URLs
+        """
+        generated_urls = [] 
+
+        try:
+            template = pattern.fragment_template 
+
+            # Substitute parameters in template
+            for key, value in parameters.items(): 
+                placeholder = f'{{{key}}}' 
+                if placeholder in template: 
+                    template = template.replace(placeholder, str(value)) 
+
+            # Encode the fragment
+            encoded_fragment = self._encode_fragment(template) 
+
+            # Build full URL
+            base_url = self.base_urls.get(pattern.view_type, self.base_urls['personal']) 
+            full_url = f"{base_url}#t={encoded_fragment}" 
+
+            generated_urls.append(full_url) 
+
+        except Exception as e:
+            self.logger.error(f"Error generating URLs from pattern: {str(e)}") 
+
+        return generated_urls
+
+    def _encode_fragment(self, fragment: str) -> str:
+        """Encode fragment identifier according to ExponentHR conventions"""
+        # Apply known encoding rules in a single pass
+        return fragment.translate(self._encode_table)
+
+    def get_discovery_statistics(self) -> Dict:
+        """Get statistics about the discovery process"""
+        return {
+            'discovered_patterns': len(self.discovered_patterns), 
+            'content_map_entries': len(self.content_map), 
+            'validated_urls': len([url for url, valid in self.url_validation_cache.items() if valid]), 
+            'invalid_urls': len([url for url, valid in self.url_validation_cache.items() if not valid]), 
+            'content_types': list(set(entry.content_type for entry in self.content_map.values())), 
+            'view_types': list(set(pattern.view_type for pattern in self.discovered_patterns))
+        }
+
+    def export_discovery_results(self) -> Dict:
+        """Export discovery results for persistence or analysis"""
+        return {
+            'patterns': [asdict(pattern) for pattern in self.discovered_patterns], 
+            'content_map': {url: asdict(entry) for url, entry in self.content_map.items()}, 
+            'validation_cache': self.url_validation_cache, 
+            'statistics': self.get_discovery_statistics(), 
+            'export_timestamp': datetime.now().isoformat() 
+        }
+
+
+# Example usage
+async def main():
+    """Example usage of the content discovery service"""
+    from exponenthr_scraper import ExponentHRScraper
+
+    config = {
+        'max_concurrent_requests': 5, 
+        'request_delay': 1.0 
+    }
+
+    discovery_service = ContentDiscoveryService(config) 
+    scraper = ExponentHRScraper(config) 
+
+    try:
+        await scraper.initialize_browser() 
+
+        # Discover navigation structure for personal view
+        nav_structure = await discovery_service.discover_navigation_structure(
+            scraper.page, 'personal'
+        ) 
+
+        print(f"Discovered {len(nav_structure.get('all_links', []))} links") 
+
+        # Validate some URLs
+        sample_urls = [link['full_url'] for link in nav_structure.get('all_links', [])[:5]] 
+        validation_results = await discovery_service.validate_discovered_urls(
+            scraper.context, sample_urls
+        ) 
+
+        print("Validation results:") 
+        for url, is_valid in validation_results.items(): 
+            print(f"  {url}: {'Valid' if is_valid else 'Invalid'}") 
+
+        # Print statistics
+        stats = discovery_service.get_discovery_statistics() 
+        print("\nDiscovery Statistics:") 
+        for key, value in stats.items(): 
+            print(f"  {key}: {value}") 
+
+    finally:
+        await scraper.close_browser() 
+
+
+if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
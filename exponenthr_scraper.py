@@ -5,22 +5,28 @@ that handles dynamic content loading and fragment-based navigation.
 """
 
 import asyncio
+import gzip
 import json
 import hashlib
 import re
 import time
 import logging
 from datetime import datetime
-from typing import Dict, List, Set, Optional, Tuple
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Set, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse, unquote
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
-from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+import aiohttp
+import orjson
 import requests
-from azure.storage.blob import BlobServiceClient
-from azure.identity import DefaultAzureCredential
+import xxhash
+from content_discovery import EXPAND_SECTIONS_SCRIPT
+from azure.storage.blob import ContentSettings
+from azure.storage.blob.aio import BlobServiceClient
+from azure.identity.aio import DefaultAzureCredential
 
 
 @dataclass
@@ -37,6 +43,68 @@ class DocumentMetadata:
     images: List[str]
     extraction_timestamp: str
     source_view: str  # 'personal' or 'management'
+    
+    def as_dict(self) -> Dict:
+        """Field dict without dataclasses.asdict's recursive deep copy"""
+        return {
+            'url': self.url,
+            'title': self.title,
+            'content_hash': self.content_hash,
+            'last_modified': self.last_modified,
+            'content_type': self.content_type,
+            'section_hierarchy': self.section_hierarchy,
+            'word_count': self.word_count,
+            'links': self.links,
+            'images': self.images,
+            'extraction_timestamp': self.extraction_timestamp,
+            'source_view': self.source_view
+        }
+
+
+# Link texts of navigation controls rather than content topics (matched lowercased)
+NAVIGATION_LINK_PATTERN = re.compile(r'table of contents|index|glossary|search|print|expand|collapse')
+
+# Classes of navigation elements stripped from a page body
+NAVIGATION_CLASS_PATTERN = re.compile(r'nav|toc|sidebar')
+
+# Phrase marking FAQ content; case-insensitive so content needs no lowercased copy
+FAQ_PHRASE_PATTERN = re.compile(r'frequently asked', re.IGNORECASE)
+
+# Words marking step-by-step instructions
+PROCEDURE_WORD_PATTERN = re.compile(r'step|click|select|enter', re.IGNORECASE)
+
+# Tag groups handled by _extract_structured_text
+HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+LIST_TAGS = frozenset({'ul', 'ol'})
+BLOCK_TAGS = frozenset({'div', 'section'})
+
+# Tags whose nested divs and sections are already covered by their own text
+TEXT_BLOCK_TAGS = HEADING_TAGS | {'p'}
+
+# Characters of content UTF-8 encoded per hash update, bounding the copy held at once
+HASH_CHUNK_CHARS = 1 << 20
+
+
+def url_blob_key(url: str) -> str:
+    """Short non-cryptographic key identifying a document URL in blob names"""
+    return xxhash.xxh3_64_hexdigest(url.encode('utf-8'))
+
+
+def content_blob_name(metadata: DocumentMetadata) -> str:
+    """Blob name of a scraped document, stable across changes to its content"""
+    return f"content/{metadata.source_view}/{url_blob_key(metadata.url)}.json"
+
+
+# Properties of every stored document blob; readers must honour the gzip encoding
+CONTENT_BLOB_SETTINGS = ContentSettings(content_type='application/json', content_encoding='gzip')
+
+
+def encode_content_blob(content_data: Dict) -> bytes:
+    """
+    Stored form of a document blob: compact JSON, gzip-encoded, as scraped text
+    compresses several-fold. Every writer uses it, so one encoding covers the container.
+    """
+    return gzip.compress(orjson.dumps(content_data), compresslevel=5)
 
 
 @dataclass
@@ -47,6 +115,7 @@ class ScrapingResult:
     content: Optional[str]
     error_message: Optional[str]
     processing_time: float
+    http_validators: Optional[Dict[str, str]] = None  # conditional request headers, HTTP scrapes only
 
 
 class ExponentHRScraper:
@@ -70,12 +139,16 @@ class ExponentHRScraper:
         self.failed_urls: Set[str] = set()
         self.content_cache: Dict[str, DocumentMetadata] = {}
         
-        # Azure clients (will be initialized when needed)
+        # Azure clients (async, will be initialized when needed)
+        self.credential = None
         self.blob_client = None
         
         # Browser and page instances
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self._page_pool: Optional[asyncio.Queue] = None
+        self._pool_pages: List[Page] = []
         
         # Base URLs for different views
         self.base_urls = {
@@ -122,19 +195,22 @@ class ExponentHRScraper:
                 args=['--no-sandbox', '--disable-dev-shm-usage']
             )
 
-            # Create a new page
-            self.page = await self.browser.new_page(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36'
+            # Create a shared context so additional pages (e.g. for concurrent
+            # URL validation) get the same user agent, viewport and stealth scripts
+            self.context = await self.browser.new_context(
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36',
+                viewport={"width": 1920, "height": 1080}
             )
 
-            # Apply the stealth plugin to the page
-            await stealth_async(self.page)
-
-            await self.page.set_viewport_size({"width": 1920, "height": 1080})
+            # Apply the stealth plugin to the context (it registers init scripts)
+            await stealth_async(self.context)
 
             # Set reasonable timeouts
-            self.page.set_default_timeout(60000)  # 60 seconds for general actions
-            self.page.set_default_navigation_timeout(120000)  # 2 minutes for page navigation
+            self.context.set_default_timeout(60000)  # 60 seconds for general actions
+            self.context.set_default_navigation_timeout(120000)  # 2 minutes for page navigation
+
+            # Create the main page
+            self.page = await self.context.new_page()
 
             self.logger.info("Browser initialized successfully with stealth plugin")
 
@@ -142,11 +218,43 @@ class ExponentHRScraper:
             self.logger.error(f"Failed to initialize browser: {str(e)}")
             raise
     
+    async def _get_pooled_page(self) -> Page:
+        """
+        Borrow a page from the scraper's own pool, for scrape_document calls
+        that bring no page. The pool, sized by 'max_concurrent_requests', is
+        only opened on first use, since callers that pool pages themselves
+        never need it.
+        """
+        if self._page_pool is None:
+            # Set before awaiting, so concurrent first callers wait on this pool
+            self._page_pool = asyncio.Queue()
+            try:
+                if not self.context:
+                    await self.initialize_browser()
+                pool_size = max(1, self.config.get('max_concurrent_requests', 5))
+                self._pool_pages = list(await asyncio.gather(
+                    *(self.context.new_page() for _ in range(pool_size))
+                ))
+            except Exception:
+                # Let the next call try again instead of waiting on an empty pool
+                self._page_pool = None
+                raise
+            for pooled_page in self._pool_pages:
+                self._page_pool.put_nowait(pooled_page)
+        
+        return await self._page_pool.get()
+    
     async def close_browser(self) -> None:
         """Clean up browser resources"""
         try:
+            for pooled_page in self._pool_pages:
+                await pooled_page.close()
+            self._pool_pages = []
+            self._page_pool = None
             if self.page:
                 await self.page.close()
+            if self.context:
+                await self.context.close()
             if self.browser:
                 await self.browser.close()
             if hasattr(self, 'playwright'):
@@ -160,14 +268,14 @@ class ExponentHRScraper:
     def initialize_azure_clients(self) -> None:
         """Initialize Azure service clients"""
         try:
-            credential = DefaultAzureCredential()
+            self.credential = DefaultAzureCredential()
             
             # Initialize Blob Storage client
             storage_account_url = self.config.get('azure_storage_account_url')
             if storage_account_url:
                 self.blob_client = BlobServiceClient(
                     account_url=storage_account_url,
-                    credential=credential
+                    credential=self.credential
                 )
                 self.logger.info("Azure Blob Storage client initialized")
             
@@ -175,6 +283,69 @@ class ExponentHRScraper:
             self.logger.error(f"Failed to initialize Azure clients: {str(e)}")
             raise
     
+    async def close_azure_clients(self) -> None:
+        """Close the Azure clients opened by initialize_azure_clients"""
+        if self.blob_client:
+            await self.blob_client.close()
+        if self.credential:
+            await self.credential.close()
+    
+    async def process_urls_concurrently(self, urls: Union[List[str], AsyncIterator[str]],
+                                        process_url: Callable[[str, Page], Awaitable],
+                                        pool_size: int, request_delay: float) -> List[Tuple[str, object]]:
+        """
+        Run process_url(url, page) for every URL on a pool of browser pages.
+        
+        Shared by the orchestrator and the sync service. The pool holds
+        pool_size pages, and each page waits request_delay seconds between its
+        own requests, so the load on the site scales with the pool size rather
+        than the number of URLs. urls may be an async iterator, in which case
+        each URL is queued for the pool as soon as it is produced.
+        
+        Returns:
+            (url, result or raised exception) for each URL, in the order received
+        """
+        if isinstance(urls, list):
+            if not urls:
+                return []
+            pool_size = min(pool_size, len(urls))
+        
+        if not self.context:
+            await self.initialize_browser()
+        
+        pages = await asyncio.gather(*(self.context.new_page() for _ in range(max(1, pool_size))))
+        page_pool: asyncio.Queue = asyncio.Queue()
+        for pooled_page in pages:
+            page_pool.put_nowait(pooled_page)
+        
+        async def process_one(url: str):
+            pooled_page = await page_pool.get()
+            try:
+                result = await process_url(url, pooled_page)
+                await asyncio.sleep(request_delay)
+                return result
+            finally:
+                page_pool.put_nowait(pooled_page)
+        
+        queued_urls: List[str] = []
+        tasks: List[asyncio.Task] = []
+        try:
+            if isinstance(urls, list):
+                queued_urls = urls
+                tasks = [asyncio.create_task(process_one(url)) for url in urls]
+            else:
+                async for url in urls:
+                    queued_urls.append(url)
+                    tasks.append(asyncio.create_task(process_one(url)))
+            
+            return list(zip(queued_urls, await asyncio.gather(*tasks, return_exceptions=True)))
+        finally:
+            # Only reached with tasks pending if the URL iterator failed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.gather(*(pooled_page.close() for pooled_page in pages), return_exceptions=True)
+    
     async def discover_all_urls(self, view_type: str = 'personal') -> List[str]:
         """
         Discover all available documentation URLs for a specific view.
@@ -215,54 +386,48 @@ class ExponentHRScraper:
     async def _expand_navigation_tree(self) -> None:
         """Expand all collapsible sections in the navigation tree"""
         try:
-            # Look for expand/collapse all button
-            expand_button = await self.page.query_selector('a[title*="Expand"]')
-            if expand_button:
-                await expand_button.click()
-                await self.page.wait_for_timeout(2000)
-            
-            # Look for individual expandable sections
-            expandable_elements = await self.page.query_selector_all(
+            # Click the expand-all button, then every expandable section, in one round-trip
+            clicked = await self.page.evaluate(EXPAND_SECTIONS_SCRIPT, [
+                'a[title*="Expand"]',
                 'li[class*="expandable"], .toc-item[class*="expandable"], [class*="collaps"]'
-            )
+            ])
             
-            for element in expandable_elements:
-                try:
-                    await element.click()
-                    await self.page.wait_for_timeout(500)
-                except:
-                    continue  # Skip if element is not clickable
+            # Wait once for all expansions to complete
+            if clicked:
+                await self.page.wait_for_timeout(2000)
             
-            self.logger.info("Navigation tree expanded")
+            self.logger.info(f"Navigation tree expanded ({clicked} elements clicked)")
             
         except Exception as e:
             self.logger.warning(f"Error expanding navigation tree: {str(e)}")
     
     async def _extract_navigation_urls(self, view_type: str) -> List[str]:
         """Extract all navigation URLs from the current page"""
-        urls = []
+        # Accepted hrefs mapped to their full URLs; duplicates of an accepted
+        # href skip re-joining and re-validation
+        accepted: Dict[str, str] = {}
+        base_url = self.base_urls[view_type]
         
         try:
-            # Get all links that contain fragment identifiers
-            links = await self.page.query_selector_all('a[href*="#t="]')
+            # Get the href and text of all links that contain fragment identifiers in one round-trip
+            links = await self.page.eval_on_selector_all(
+                'a[href*="#t="]', 'links => links.map(link => [link.getAttribute("href"), link.innerText])'
+            )
             
-            for link in links:
-                href = await link.get_attribute('href')
-                text = await link.inner_text()
+            for href, text in links:
+                if not href or href in accepted or '#t=' not in href:
+                    continue
+                
+                # Extract fragment identifier
+                fragment = href.split('#t=')[1]
                 
-                if href and '#t=' in href:
-                    # Clean and validate the URL
-                    full_url = urljoin(self.base_urls[view_type], href)
-                    
-                    # Extract fragment identifier
-                    fragment = href.split('#t=')[1] if '#t=' in href else ''
-                    
-                    if fragment and self._is_valid_content_url(fragment, text):
-                        urls.append(full_url)
-                        self.discovered_urls.add(full_url)
+                if fragment and self._is_valid_content_url(fragment, text):
+                    # Clean the URL
+                    accepted[href] = urljoin(base_url, href)
             
             # Remove duplicates while preserving order
-            unique_urls = list(dict.fromkeys(urls))
+            unique_urls = list(dict.fromkeys(accepted.values()))
+            self.discovered_urls.update(unique_urls)
             
             return unique_urls
             
@@ -282,17 +447,7 @@ class ExponentHRScraper:
             True if the URL appears to be valid content
         """
         # Skip navigation elements
-        skip_patterns = [
-            'table of contents',
-            'index',
-            'glossary',
-            'search',
-            'print',
-            'expand',
-            'collapse'
-        ]
-        
-        if any(pattern in link_text.lower() for pattern in skip_patterns):
+        if NAVIGATION_LINK_PATTERN.search(link_text.lower()):
             return False
         
         # Skip empty or very short fragments
@@ -305,31 +460,34 @@ class ExponentHRScraper:
         
         return True
     
-    async def scrape_document(self, url: str) -> ScrapingResult:
+    async def scrape_document(self, url: str, page: Optional[Page] = None) -> ScrapingResult:
         """
         Scrape a single document from the given URL.
         
         Args:
             url: The URL to scrape
+            page: Page to load the document in; defaults to a page borrowed
+                  from the scraper's page pool, so calls may run concurrently.
             
         Returns:
             ScrapingResult containing the scraped content and metadata
         """
         start_time = time.time()
+        pooled_page = None
         
         try:
-            if not self.page:
-                await self.initialize_browser()
+            if page is None:
+                page = pooled_page = await self._get_pooled_page()
             
             self.logger.info(f"Scraping document: {url}")
             
             # Navigate to the URL
-            await self.page.goto(url, wait_until='networkidle')
-            await self.page.wait_for_timeout(3000)  # Wait for dynamic content
+            await page.goto(url, wait_until='domcontentloaded')
+            await page.wait_for_timeout(3000)  # Wait for dynamic content
             
             # Extract content and metadata
-            content = await self._extract_content()
-            metadata = await self._extract_metadata(url, content)
+            content = await self._extract_content(page)
+            metadata = await self._extract_metadata(url, content, page)
             
             processing_time = time.time() - start_time
             
@@ -357,150 +515,258 @@ class ExponentHRScraper:
                 error_message=error_msg,
                 processing_time=processing_time
             )
+        
+        finally:
+            if pooled_page is not None:
+                self._page_pool.put_nowait(pooled_page)
     
-    async def _extract_content(self) -> str:
-        """Extract the main content from the current page"""
+    def _topic_url(self, url: str) -> str:
+        """
+        URL of the HTML file behind a help URL.
+        
+        Help pages address topics with a '#t=' fragment holding the topic's
+        path relative to the view page; other URLs just drop their fragment.
+        """
+        base_url, _, fragment = url.partition('#')
+        if fragment.startswith('t='):
+            return urljoin(base_url, unquote(fragment[2:]))
+        return base_url
+    
+    async def scrape_document_http(self, url: str, session: aiohttp.ClientSession) -> Optional[ScrapingResult]:
+        """
+        Scrape a document with a plain HTTP GET of its topic file, without a browser.
+        
+        Args:
+            url: The URL to scrape
+            session: Shared HTTP session, so connections are reused across documents
+            
+        Returns:
+            ScrapingResult, or None if the topic could not be fetched or has no
+            extractable content and the page should be rendered with
+            scrape_document instead
+        """
+        start_time = time.time()
+        topic_url = self._topic_url(url)
+        
+        try:
+            async with session.get(topic_url) as response:
+                if response.status != 200 or 'html' not in response.content_type:
+                    return None
+                html_content = await response.text()
+                validators = {
+                    request_header: response.headers[response_header]
+                    for response_header, request_header in (('ETag', 'If-None-Match'),
+                                                            ('Last-Modified', 'If-Modified-Since'))
+                    if response_header in response.headers
+                }
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.debug(f"HTTP fetch failed for {url}, falling back to browser: {str(e)}")
+            return None
+        
+        soup = BeautifulSoup(html_content, 'lxml')
+        title = soup.title.get_text().strip() if soup.title else ''
+        links = [link['href'] for link in soup.find_all('a', href=True)]
+        images = [img['src'] for img in soup.find_all('img', src=True)]
+        
+        content = self._extract_content_from_soup(soup)
+        if not content:
+            return None
+        
+        self.processed_urls.add(url)
+        
+        return ScrapingResult(
+            success=True,
+            metadata=self._build_metadata(url, content, title, links, images),
+            content=content,
+            error_message=None,
+            processing_time=time.time() - start_time,
+            http_validators=validators or None
+        )
+    
+    async def is_unchanged_http(self, url: str, session: aiohttp.ClientSession,
+                                validators: Dict[str, str]) -> bool:
+        """
+        Check with a conditional HEAD whether a topic file is unchanged since
+        the scrape that returned validators.
+        
+        Returns:
+            True only if the server answers 304 Not Modified; False when the
+            file changed or the check failed
+        """
+        try:
+            async with session.head(self._topic_url(url), headers=validators) as response:
+                return response.status == 304
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+    
+    async def _extract_content(self, page: Page) -> str:
+        """Extract the main content from the given page"""
         try:
             # Wait for content to load
-            await self.page.wait_for_selector('body', timeout=10000)
+            await page.wait_for_selector('body', timeout=10000)
             
             # Get the page HTML
-            html_content = await self.page.content()
-            
-            # Parse with BeautifulSoup for better content extraction
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove navigation, headers, footers, and other non-content elements
-            for element in soup.find_all(['nav', 'header', 'footer', 'aside']):
-                element.decompose()
+            html_content = await page.content()
             
-            # Remove elements with common navigation classes/IDs
-            for selector in ['.navigation', '.nav', '.sidebar', '.toc', '#navigation', '#nav']:
-                for element in soup.select(selector):
-                    element.decompose()
-            
-            # Find the main content area
-            main_content = None
-            
-            # Try common content selectors
-            content_selectors = [
-                'main',
-                '.content',
-                '.main-content',
-                '#content',
-                '#main-content',
-                '.document-content',
-                'article'
-            ]
-            
-            for selector in content_selectors:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
-            
-            # If no specific content area found, use body but remove navigation
-            if not main_content:
-                main_content = soup.find('body')
-                if main_content:
-                    # Remove known navigation elements
-                    for nav_element in main_content.find_all(class_=re.compile(r'nav|toc|sidebar')):
-                        nav_element.decompose()
+            # Parse with BeautifulSoup (lxml's C parser) for better content extraction
+            soup = BeautifulSoup(html_content, 'lxml')
             
-            if main_content:
-                # Extract text content while preserving some structure
-                text_content = self._extract_structured_text(main_content)
-                return text_content
-            else:
+            text_content = self._extract_content_from_soup(soup)
+            if text_content is None:
                 # Fallback to page text
-                return await self.page.inner_text('body')
+                return await page.inner_text('body')
+            return text_content
                 
         except Exception as e:
             self.logger.error(f"Error extracting content: {str(e)}")
             return ""
     
+    def _extract_content_from_soup(self, soup: BeautifulSoup) -> Optional[str]:
+        """Extract the main content from parsed HTML, or None if the document has no body"""
+        # Remove navigation, headers, footers, and other non-content elements
+        for element in soup.find_all(['nav', 'header', 'footer', 'aside']):
+            element.decompose()
+        
+        # Remove elements with common navigation classes/IDs
+        for selector in ['.navigation', '.nav', '.sidebar', '.toc', '#navigation', '#nav']:
+            for element in soup.select(selector):
+                element.decompose()
+        
+        # Find the main content area
+        main_content = None
+        
+        # Try common content selectors
+        content_selectors = [
+            'main',
+            '.content',
+            '.main-content',
+            '#content',
+            '#main-content',
+            '.document-content',
+            'article'
+        ]
+        
+        for selector in content_selectors:
+            main_content = soup.select_one(selector)
+            if main_content:
+                break
+        
+        # If no specific content area found, use body but remove navigation
+        if not main_content:
+            main_content = soup.find('body')
+            if main_content:
+                # Remove known navigation elements
+                for nav_element in main_content.find_all(class_=NAVIGATION_CLASS_PATTERN):
+                    nav_element.decompose()
+        
+        if main_content:
+            # Extract text content while preserving some structure
+            return self._extract_structured_text(main_content)
+        return None
+    
     def _extract_structured_text(self, element) -> str:
         """Extract text content while preserving document structure"""
         text_parts = []
         
-        for child in element.descendants:
-            if child.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+        # Pre-order walk over tags only (text nodes never match any branch
+        # below), carrying whether a tag sits inside a paragraph or heading
+        # so divs need not rescan their ancestors
+        in_text_block = element.name in TEXT_BLOCK_TAGS or any(
+            ancestor.name in TEXT_BLOCK_TAGS for ancestor in element.parents
+        )
+        stack = [(child, in_text_block) for child in reversed(element.contents) if isinstance(child, Tag)]
+        
+        while stack:
+            child, in_text_block = stack.pop()
+            name = child.name
+            
+            if name in HEADING_TAGS:
                 text_parts.append(f"\n\n## {child.get_text().strip()}\n")
-            elif child.name == 'p':
+            elif name == 'p':
                 text_parts.append(f"\n{child.get_text().strip()}\n")
-            elif child.name in ['ul', 'ol']:
+            elif name in LIST_TAGS:
                 for li in child.find_all('li'):
                     text_parts.append(f"- {li.get_text().strip()}\n")
-            elif child.name == 'table':
+            elif name == 'table':
                 # Simple table extraction
                 text_parts.append("\n[TABLE]\n")
                 for row in child.find_all('tr'):
                     cells = [cell.get_text().strip() for cell in row.find_all(['td', 'th'])]
                     text_parts.append(" | ".join(cells) + "\n")
                 text_parts.append("[/TABLE]\n")
-            elif child.name in ['div', 'section'] and child.get_text().strip():
-                if not any(ancestor.name in ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'] 
-                          for ancestor in child.parents):
-                    text_parts.append(f"{child.get_text().strip()}\n")
+            elif name in BLOCK_TAGS and not in_text_block:
+                text = child.get_text().strip()
+                if text:
+                    text_parts.append(f"{text}\n")
+            
+            in_text_block = in_text_block or name in TEXT_BLOCK_TAGS
+            stack.extend((grandchild, in_text_block) for grandchild in reversed(child.contents)
+                         if isinstance(grandchild, Tag))
         
         return ''.join(text_parts).strip()
     
-    async def _extract_metadata(self, url: str, content: str) -> DocumentMetadata:
-        """Extract metadata from the current page and content"""
+    async def _extract_metadata(self, url: str, content: str, page: Page) -> DocumentMetadata:
+        """Extract metadata from the given page and content"""
         try:
-            # Get page title
-            title = await self.page.title()
-            
-            # Generate content hash
-            content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
-            
-            # Extract section hierarchy from URL
-            section_hierarchy = self._extract_section_hierarchy(url)
-            
-            # Count words
-            word_count = len(content.split())
-            
-            # Extract links
-            links = await self._extract_links()
-            
-            # Extract images
-            images = await self._extract_images()
-            
-            # Determine view type
-            view_type = 'personal' if 'Personal_View' in url else 'management'
-            
-            # Determine content type
-            content_type = self._classify_content_type(url, content)
-            
-            return DocumentMetadata(
-                url=url,
-                title=title,
-                content_hash=content_hash,
-                last_modified=datetime.now().isoformat(),
-                content_type=content_type,
-                section_hierarchy=section_hierarchy,
-                word_count=word_count,
-                links=links,
-                images=images,
-                extraction_timestamp=datetime.now().isoformat(),
-                source_view=view_type
+            # Title, links and images are independent round-trips, so overlap them
+            title, links, images = await asyncio.gather(
+                page.title(),
+                self._extract_links(page),
+                self._extract_images(page)
             )
             
         except Exception as e:
             self.logger.error(f"Error extracting metadata: {str(e)}")
-            # Return minimal metadata
+            # Return minimal metadata; only the page round-trips are guarded, so
+            # the content is never hashed or word-counted twice
+            extracted_at = datetime.now().isoformat()
             return DocumentMetadata(
                 url=url,
                 title="Unknown",
-                content_hash=hashlib.sha256(content.encode('utf-8')).hexdigest(),
-                last_modified=datetime.now().isoformat(),
+                content_hash=self.calculate_content_hash(content),
+                last_modified=extracted_at,
                 content_type="unknown",
                 section_hierarchy=[],
                 word_count=len(content.split()),
                 links=[],
                 images=[],
-                extraction_timestamp=datetime.now().isoformat(),
+                extraction_timestamp=extracted_at,
                 source_view="unknown"
             )
+        
+        return self._build_metadata(url, content, title, links, images)
+    
+    def _build_metadata(self, url: str, content: str, title: str,
+                        links: List[str], images: List[str]) -> DocumentMetadata:
+        """Build document metadata from the extracted page parts"""
+        # Generate content hash
+        content_hash = self.calculate_content_hash(content)
+        
+        # Extract section hierarchy from URL
+        section_hierarchy = self._extract_section_hierarchy(url)
+        
+        # Count words
+        word_count = len(content.split())
+        
+        # Determine view type
+        view_type = 'personal' if 'Personal_View' in url else 'management'
+        
+        # Determine content type
+        content_type = self._classify_content_type(url, content, word_count)
+        
+        return DocumentMetadata(
+            url=url,
+            title=title,
+            content_hash=content_hash,
+            last_modified=datetime.now().isoformat(),
+            content_type=content_type,
+            section_hierarchy=section_hierarchy,
+            word_count=word_count,
+            links=links,
+            images=images,
+            extraction_timestamp=datetime.now().isoformat(),
+            source_view=view_type
+        )
     
     def _extract_section_hierarchy(self, url: str) -> List[str]:
         """Extract section hierarchy from URL fragment"""
@@ -510,8 +776,10 @@ class ExponentHRScraper:
                 # Decode URL encoding
                 decoded_fragment = unquote(fragment)
                 
-                # Split by path separators
-                parts = decoded_fragment.replace('/', ' > ').replace('.htm', '').split(' > ')
+                # Drop the page extension and split by path separators
+                if decoded_fragment.endswith('.htm'):
+                    decoded_fragment = decoded_fragment[:-4]
+                parts = decoded_fragment.split('/')
                 
                 # Clean up parts
                 hierarchy = [part.strip() for part in parts if part.strip()]
@@ -522,42 +790,31 @@ class ExponentHRScraper:
         
         return []
     
-    async def _extract_links(self) -> List[str]:
-        """Extract all links from the current page"""
+    async def _extract_links(self, page: Page) -> List[str]:
+        """Extract all links from the given page"""
         try:
-            links = []
-            link_elements = await self.page.query_selector_all('a[href]')
-            
-            for link in link_elements:
-                href = await link.get_attribute('href')
-                if href:
-                    links.append(href)
-            
-            return links
+            hrefs = await page.eval_on_selector_all(
+                'a[href]', 'links => links.map(link => link.getAttribute("href"))'
+            )
+            return [href for href in hrefs if href]
         except:
             return []
     
-    async def _extract_images(self) -> List[str]:
-        """Extract all image URLs from the current page"""
+    async def _extract_images(self, page: Page) -> List[str]:
+        """Extract all image URLs from the given page"""
         try:
-            images = []
-            img_elements = await self.page.query_selector_all('img[src]')
-            
-            for img in img_elements:
-                src = await img.get_attribute('src')
-                if src:
-                    images.append(src)
-            
-            return images
+            srcs = await page.eval_on_selector_all(
+                'img[src]', 'images => images.map(img => img.getAttribute("src"))'
+            )
+            return [src for src in srcs if src]
         except:
             return []
     
-    def _classify_content_type(self, url: str, content: str) -> str:
+    def _classify_content_type(self, url: str, content: str, word_count: int) -> str:
         """Classify the type of content based on URL and content analysis"""
         url_lower = url.lower()
-        content_lower = content.lower()
         
-        if 'faq' in url_lower or 'frequently asked' in content_lower:
+        if 'faq' in url_lower or FAQ_PHRASE_PATTERN.search(content):
             return 'faq'
         elif 'edit' in url_lower or 'change' in url_lower:
             return 'procedure'
@@ -565,16 +822,23 @@ class ExponentHRScraper:
             return 'reference'
         elif 'about' in url_lower:
             return 'overview'
-        elif any(word in content_lower for word in ['step', 'click', 'select', 'enter']):
+        elif PROCEDURE_WORD_PATTERN.search(content):
             return 'procedure'
-        elif len(content.split()) < 100:
+        elif word_count < 100:
             return 'summary'
         else:
             return 'documentation'
     
     def calculate_content_hash(self, content: str) -> str:
         """Calculate SHA-256 hash of content for change detection"""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        if len(content) <= HASH_CHUNK_CHARS:
+            return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        
+        # Same digest as hashing the whole encoding, without materializing it
+        digest = hashlib.sha256()
+        for start in range(0, len(content), HASH_CHUNK_CHARS):
+            digest.update(content[start:start + HASH_CHUNK_CHARS].encode('utf-8'))
+        return digest.hexdigest()
     
     def get_scraping_statistics(self) -> Dict:
         """Get statistics about the scraping process"""
@@ -607,9 +871,10 @@ async def main():
         personal_urls = await scraper.discover_all_urls('personal')
         print(f"Discovered {len(personal_urls)} URLs in personal view")
         
-        # Scrape a few documents as examples
-        for i, url in enumerate(personal_urls[:3]):  # Limit to first 3 for testing
-            result = await scraper.scrape_document(url)
+        # Scrape a few documents concurrently as examples
+        sample_urls = personal_urls[:3]  # Limit to first 3 for testing
+        results = await asyncio.gather(*(scraper.scrape_document(url) for url in sample_urls))
+        for url, result in zip(sample_urls, results):
             if result.success:
                 print(f"Successfully scraped: {result.metadata.title}")
                 print(f"Content length: {len(result.content)} characters")
@@ -0,0 +1,25 @@
+"""
+Gunicorn settings for the ExponentHR RAG API.
+Runs the Quart app (rag_api_service/src/main.py) on uvicorn workers, which use uvloop.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+# SO_REUSEPORT, so a restarted or second server can bind while the old socket drains
+reuse_port = True
+chdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rag_api_service', 'src')
+worker_class = 'uvicorn.workers.UvicornWorker'
+
+# Each worker starts its own browser, sync service and caches, and sync operations
+# are only visible in the worker that started them, so scale out deliberately.
+# No preload: the background event loop thread and the browser do not survive fork.
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'info')
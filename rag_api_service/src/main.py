@@ -1,16 +1,35 @@
 import os
 import sys
 import asyncio
-import json
+import atexit
+import hashlib
 import logging
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache, partial
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional
 
 # Add parent directories to path for RAG components
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from flask import Flask, send_from_directory, request, jsonify
-from flask_cors import CORS
+import gzip
+import msgspec
+import orjson
+from quart import Quart, Response, request
+from quart_cors import cors
+from cachetools import LRUCache, TTLCache
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+from semantic_cache import SemanticCache
 
 # Import RAG system components
 try:
@@ -24,14 +43,51 @@ except ImportError as e:
     print("Make sure the RAG system files are in the parent directory")
     RAG_IMPORTS_AVAILABLE = False
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'exponenthr-rag-secret-key-change-in-production'
+app = Quart(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'exponenthr-rag-secret-key-change-in-production')
 
 # Enable CORS for all routes
-CORS(app)
+app = cors(app, allow_origin='*')
+
+# ASGI entry point for uvicorn
+asgi_app = app
+
+@dataclass(frozen=True, slots=True)
+class RagConfig:
+    """RAG settings read from the environment once at startup"""
+    azure_storage_account_url: Optional[str]
+    azure_storage_key: Optional[str]
+    azure_search_endpoint: Optional[str]
+    azure_search_key: Optional[str]
+    search_index_name: str
+    content_container: str
+    request_delay: float
+    sync_batch_size: int
+    search_top_k: int
+    search_cache_size: int
+    search_cache_ttl: int
+    system_status_ttl: float
+    semantic_cache_enabled: bool
+    semantic_cache_threshold: float
+    semantic_cache_ttl: float
+    semantic_cache_size: int
+    use_azure_openai: bool
+    embedding_model: str
+    embedding_dimension: int
+    openai_api_key: Optional[str] = None
+    azure_openai_endpoint: Optional[str] = None
+    azure_openai_api_key: Optional[str] = None
+    azure_openai_deployment_name: Optional[str] = None
+    azure_openai_api_version: Optional[str] = None
+    
+    def as_component_config(self) -> Dict:
+        """Dict form for the RAG components, which read settings with .get() and their own defaults"""
+        return {name: value for name, value in asdict(self).items() if value is not None}
+
 
 # RAG system configuration - Updated for Azure OpenAI
-def get_rag_config():
+@lru_cache(maxsize=1)
+def get_rag_config() -> RagConfig:
     """Get RAG configuration with Azure OpenAI support"""
     config = {
         'azure_storage_account_url': os.getenv('AZURE_STORAGE_ACCOUNT_URL'),
@@ -43,6 +99,13 @@ def get_rag_config():
         'request_delay': float(os.getenv('REQUEST_DELAY', '1.0')),
         'sync_batch_size': int(os.getenv('SYNC_BATCH_SIZE', '20')),
         'search_top_k': int(os.getenv('SEARCH_TOP_K', '10')),
+        'search_cache_size': int(os.getenv('SEARCH_CACHE_SIZE', '4096')),
+        'search_cache_ttl': int(os.getenv('SEARCH_CACHE_TTL', '60')),
+        'system_status_ttl': float(os.getenv('SYSTEM_STATUS_TTL', '5')),
+        'semantic_cache_enabled': os.getenv('SEMANTIC_CACHE_ENABLED', 'false').lower() == 'true',
+        'semantic_cache_threshold': float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.97')),
+        'semantic_cache_ttl': float(os.getenv('SEMANTIC_CACHE_TTL', '900')),
+        'semantic_cache_size': int(os.getenv('SEMANTIC_CACHE_SIZE', '1024')),
     }
     
     # Check if using Azure OpenAI
@@ -68,38 +131,115 @@ def get_rag_config():
             'embedding_dimension': int(os.getenv('EMBEDDING_DIMENSION', '1536'))
         })
     
-    return config
+    return RagConfig(**config)
 
 RAG_CONFIG = get_rag_config()
+COMPONENT_CONFIG = RAG_CONFIG.as_component_config()
+
+# Configuration blocks of the status endpoints only change at process start
+_SYSTEM_STATUS_CONFIGURATION = {
+    'search_index_name': RAG_CONFIG.search_index_name,
+    'embedding_model': RAG_CONFIG.embedding_model,
+    'search_top_k': RAG_CONFIG.search_top_k,
+    'use_azure_openai': RAG_CONFIG.use_azure_openai,
+    'azure_openai_deployment': RAG_CONFIG.azure_openai_deployment_name if RAG_CONFIG.use_azure_openai else None
+}
+_HEALTH_CONFIGURATION = {
+    'azure_openai_configured': RAG_CONFIG.use_azure_openai,
+    'search_configured': bool(RAG_CONFIG.azure_search_endpoint),
+    'storage_configured': bool(RAG_CONFIG.azure_storage_account_url),
+    'rag_imports_available': RAG_IMPORTS_AVAILABLE
+}
 
 # Global RAG system instances
 rag_orchestrator = None
 search_integration = None
 sync_service = None
 
+# Readiness of the RAG components as a bitmask, set as each one is published
+SEARCH_READY, ORCHESTRATOR_READY, SYNC_READY = 1, 2, 4
+ALL_SERVICES_READY = SEARCH_READY | ORCHESTRATOR_READY | SYNC_READY
+_service_bits = 0
+
+# Clients are told to retry 503s from components that are still initializing after this long
+RETRY_AFTER_SECONDS = '5'
+
+
+def _services_block(bits: int) -> Dict:
+    """'services' block of /api/health and /api/ready for a readiness state"""
+    return {
+        'api': True,
+        'search': bool(bits & SEARCH_READY),
+        'orchestrator': bool(bits & ORCHESTRATOR_READY),
+        'sync': bool(bits & SYNC_READY)
+    }
+
+
+# /api/health body for every readiness state, serialized up to the opening quote of the
+# trailing timestamp value, so a request only splices in the current time
+_HEALTH_BODY_PREFIXES = tuple(
+    orjson.dumps({
+        'status': 'healthy' if bits == ALL_SERVICES_READY else 'degraded',
+        'services': _services_block(bits),
+        'configuration': _HEALTH_CONFIGURATION,
+        'timestamp': ''
+    })[:-2]
+    for bits in range(ALL_SERVICES_READY + 1)
+)
+
+# /api/ready body for every readiness state
+_READY_BODIES = tuple(
+    orjson.dumps({'ready': bits == ALL_SERVICES_READY, 'services': _services_block(bits)})
+    for bits in range(ALL_SERVICES_READY + 1)
+)
+
+# 'services' block of /api/system/status for every readiness state
+_SYSTEM_STATUS_SERVICES = tuple(
+    {
+        'search_integration': bool(bits & SEARCH_READY),
+        'rag_orchestrator': bool(bits & ORCHESTRATOR_READY),
+        'sync_service': bool(bits & SYNC_READY)
+    }
+    for bits in range(ALL_SERVICES_READY + 1)
+)
+
+# Serialized /api/search responses, cleared whenever a sync changes the index
+_search_cache = TTLCache(maxsize=RAG_CONFIG.search_cache_size, ttl=RAG_CONFIG.search_cache_ttl)
+
+# Formatted results of past searches keyed by query embedding, so rephrased queries skip
+# Azure Search; only created when enabled and the embedding service is reachable
+semantic_cache: Optional[SemanticCache] = None
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Hand records to a background thread so request handlers never block on stderr writes
+_root_logger = logging.getLogger()
+_log_listener = QueueListener(queue.SimpleQueue(), *_root_logger.handlers, respect_handler_level=True)
+_root_logger.handlers = [QueueHandler(_log_listener.queue)]
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 # Add startup logging
 logger.info("=== ExponentHR RAG API Starting ===")
 logger.info(f"Python version: {sys.version}")
 logger.info(f"Working directory: {os.getcwd()}")
 logger.info(f"Python path: {sys.path[:3]}...")  # First 3 entries
 logger.info(f"RAG imports available: {RAG_IMPORTS_AVAILABLE}")
-logger.info(f"Azure Storage URL: {RAG_CONFIG.get('azure_storage_account_url')}")
-logger.info(f"Azure Search Endpoint: {RAG_CONFIG.get('azure_search_endpoint')}")
-logger.info(f"Search Index Name: {RAG_CONFIG.get('search_index_name')}")
-logger.info(f"Using Azure OpenAI: {RAG_CONFIG.get('use_azure_openai')}")
-if RAG_CONFIG.get('use_azure_openai'):
-    logger.info(f"Azure OpenAI Endpoint: {RAG_CONFIG.get('azure_openai_endpoint')}")
-    logger.info(f"Azure OpenAI Deployment: {RAG_CONFIG.get('azure_openai_deployment_name')}")
+logger.info(f"Azure Storage URL: {RAG_CONFIG.azure_storage_account_url}")
+logger.info(f"Azure Search Endpoint: {RAG_CONFIG.azure_search_endpoint}")
+logger.info(f"Search Index Name: {RAG_CONFIG.search_index_name}")
+logger.info(f"Using Azure OpenAI: {RAG_CONFIG.use_azure_openai}")
+if RAG_CONFIG.use_azure_openai:
+    logger.info(f"Azure OpenAI Endpoint: {RAG_CONFIG.azure_openai_endpoint}")
+    logger.info(f"Azure OpenAI Deployment: {RAG_CONFIG.azure_openai_deployment_name}")
 logger.info("=====================================")
 
 
 async def initialize_rag_system():
     """Initialize the RAG system components"""
-    global rag_orchestrator, search_integration, sync_service
+    global rag_orchestrator, search_integration, sync_service, semantic_cache, embedding_batcher, _service_bits
     
     if not RAG_IMPORTS_AVAILABLE:
         raise Exception("RAG system components not available")
@@ -107,20 +247,50 @@ async def initialize_rag_system():
     try:
         logger.info("Initializing RAG system components...")
         
-        # Initialize search integration
-        search_integration = AzureSearchIntegration(RAG_CONFIG)
-        search_integration.initialize_clients()
-        logger.info("Search integration initialized")
-        
-        # Initialize orchestrator
-        rag_orchestrator = RAGOrchestrator(RAG_CONFIG)
-        await rag_orchestrator.initialize()
-        logger.info("RAG orchestrator initialized")
-        
-        # Initialize synchronization service
-        sync_service = SynchronizationService(RAG_CONFIG)
-        await sync_service.initialize()
-        logger.info("Synchronization service initialized")
+        search = AzureSearchIntegration(COMPONENT_CONFIG)
+        orchestrator = RAGOrchestrator(COMPONENT_CONFIG)
+        sync = SynchronizationService(COMPONENT_CONFIG)
+        
+        # The components connect to independent services, so overlap their setup
+        search_result, orchestrator_result, sync_result = await asyncio.gather(
+            asyncio.to_thread(search.initialize_clients),
+            orchestrator.initialize(),
+            sync.initialize(),
+            return_exceptions=True
+        )
+        
+        # Publish each component that came up, even if another one failed
+        if not isinstance(search_result, Exception):
+            if search.suggestion_trie is None:
+                await search.refresh_suggestion_trie()
+            if RAG_CONFIG.semantic_cache_enabled and await asyncio.to_thread(search.enable_query_embeddings):
+                # Building the cache compiles its matcher; keep that off the event loop
+                semantic_cache = await asyncio.to_thread(
+                    SemanticCache,
+                    search.embedding_dimension,
+                    threshold=RAG_CONFIG.semantic_cache_threshold,
+                    ttl=RAG_CONFIG.semantic_cache_ttl,
+                    max_entries=RAG_CONFIG.semantic_cache_size
+                )
+                embedding_batcher = EmbeddingBatcher(search.generate_embeddings)
+                logger.info("Semantic search cache enabled")
+            search_integration = search
+            _service_bits |= SEARCH_READY
+            logger.info("Search integration initialized")
+        
+        if not isinstance(orchestrator_result, Exception):
+            rag_orchestrator = orchestrator
+            _service_bits |= ORCHESTRATOR_READY
+            logger.info("RAG orchestrator initialized")
+        
+        if not isinstance(sync_result, Exception):
+            sync_service = sync
+            _service_bits |= SYNC_READY
+            logger.info("Synchronization service initialized")
+        
+        for result in (search_result, orchestrator_result, sync_result):
+            if isinstance(result, Exception):
+                raise result
         
         logger.info("RAG system initialized successfully")
         
@@ -132,206 +302,485 @@ async def initialize_rag_system():
         raise
 
 
-def run_async(coro):
-    """Helper function to run async functions in Flask routes"""
+def _new_event_loop():
+    """Create an event loop, preferring uvloop when it is installed"""
     try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        import uvloop
+        return uvloop.new_event_loop()
+    except ImportError:
+        return asyncio.new_event_loop()
+
+
+# Background event loop for long-running scraping/sync work, so it never
+# competes with request handling on the server loop
+_bg_loop = _new_event_loop()
+threading.Thread(target=_bg_loop.run_forever, name='rag-event-loop', daemon=True).start()
+atexit.register(_bg_loop.call_soon_threadsafe, _bg_loop.stop)
+
+
+async def run_on_background_loop(coro):
+    """Run a coroutine on the background loop and await its result from the server loop"""
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, _bg_loop))
+
+
+# Responses smaller than this are not worth compressing
+COMPRESS_MIN_SIZE = 512
+
+# Brotli quality 4 compresses JSON better than gzip level 5 at similar CPU cost
+BROTLI_QUALITY = 4
+
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def ojsonify(obj, status: int = 200) -> Response:
+    """Serialize obj with orjson into a JSON response"""
+    return Response(orjson.dumps(obj, option=ORJSON_OPTIONS), status=status, mimetype='application/json')
+
+
+@app.after_request
+async def compress_response(response: Response) -> Response:
+    """Brotli- or gzip-compress large JSON responses for clients that accept it"""
+    # Parsed tokens with q-values: 'br;q=0' refuses Brotli, and no other token matches it
+    accept_encodings = request.accept_encodings
+    br_quality = accept_encodings['br'] if BROTLI_AVAILABLE else 0
+    gzip_quality = accept_encodings['gzip']
+    if br_quality > 0 and br_quality >= gzip_quality:
+        encoding = 'br'
+    elif gzip_quality > 0:
+        encoding = 'gzip'
+    else:
+        return response
     
-    return loop.run_until_complete(coro)
+    if response.mimetype != 'application/json' or 'Content-Encoding' in response.headers:
+        return response
+    
+    body = await response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    
+    if encoding == 'br':
+        response.set_data(brotli.compress(body, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY))
+    else:
+        response.set_data(gzip.compress(body, compresslevel=5))
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+# 503 bodies for routes whose component has not finished initializing
+_SEARCH_NOT_READY_BODY = orjson.dumps({'error': 'Search service not initialized'})
+_SYNC_NOT_READY_BODY = orjson.dumps({'error': 'Sync service not initialized'})
+
+
+def _not_ready(body: bytes) -> Response:
+    """503 response from a prebuilt body"""
+    return Response(body, status=503, mimetype='application/json', headers={'Retry-After': RETRY_AFTER_SECONDS})
+
+
+# Second-resolution timestamp shared by the status endpoints: [epoch second, formatted]
+_timestamp_cache = [0, '']
+
+
+def now_iso() -> str:
+    """Current local time as an ISO string, formatted at most once per second"""
+    now = int(time.time())
+    if _timestamp_cache[0] != now:
+        _timestamp_cache[:] = [now, datetime.fromtimestamp(now).isoformat()]
+    return _timestamp_cache[1]
+
+
+# Last serialized body per status endpoint: name -> (monotonic time, body, status code)
+_status_cache: Dict[str, tuple] = {}
+
+
+def _cached_status_response(name: str, ttl: float) -> Optional[Response]:
+    """Return the stored response for a status endpoint if it is younger than ttl"""
+    entry = _status_cache.get(name)
+    if entry is None or time.monotonic() - entry[0] >= ttl:
+        return None
+    return Response(entry[1], status=entry[2], mimetype='application/json')
+
+
+async def _store_status_response(name: str, response: Response) -> Response:
+    """Remember a status endpoint response for _cached_status_response"""
+    _status_cache[name] = (time.monotonic(), await response.get_data(), response.status_code)
+    return response
+
+
+def _search_scope(filters: Dict, search_type: str) -> str:
+    """Canonical form of the non-query parts of a search request"""
+    return f"{search_type}|{orjson.dumps(filters, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode()}"
+
+
+def _search_cache_key(query: str, scope: str) -> bytes:
+    """Build a stable cache key for a search request"""
+    return hashlib.blake2b(f"{scope}|{query}".encode('utf-8'), digest_size=16).digest()
+
+
+class SearchRequest(msgspec.Struct):
+    """Body of /api/search and /api/search/stream"""
+    query: str = ''
+    filters: Optional[Dict[str, Any]] = None
+    search_type: str = 'hybrid'
+
+
+class FullSyncRequest(msgspec.Struct):
+    """Body of /api/sync/full"""
+    view_types: List[str] = msgspec.field(default_factory=lambda: ['personal', 'management'])
+
+
+async def _decode_body(request_type: type):
+    """Decode and validate the JSON request body in one pass; an empty body gives the defaults"""
+    # Routes read the body only here, so don't keep a second copy on the request
+    body = await request.get_data(cache=False)
+    return msgspec.json.decode(body, type=request_type) if body else request_type()
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent query embeddings into one Azure OpenAI request"""
+    
+    def __init__(self, embed_many, max_batch: int = 16, max_wait: float = 0.01):
+        self.embed_many = embed_many
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending: List[tuple] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+    
+    async def submit(self, text: str) -> List[float]:
+        """Embed text together with whatever else arrives within max_wait"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        """Send the pending texts as one batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._embed_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _embed_batch(self, batch: List[tuple]) -> None:
+        """Embed a batch and resolve each submitter's future"""
+        try:
+            embeddings = await self.embed_many([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+
+# Shared by all searches once query embeddings are enabled
+embedding_batcher: Optional[EmbeddingBatcher] = None
+
+# Query embeddings by normalized query text, so repeated queries skip the embeddings API
+_query_embeddings = LRUCache(maxsize=4096)
+
+
+async def _embed_query(query: str) -> List[float]:
+    """Embed a search query, reusing the embedding of any query that differs only in case or spacing"""
+    key = " ".join(query.lower().split())
+    embedding = _query_embeddings.get(key)
+    if embedding is None:
+        embedding = await embedding_batcher.submit(query)
+        # Failed embeddings come back as zero vectors; don't keep them
+        if any(embedding):
+            _query_embeddings[key] = embedding
+    return embedding
+
+
+# Searches currently running, so identical concurrent requests share one backend call
+_inflight_searches: Dict[bytes, asyncio.Task] = {}
+
+
+async def _run_search(cache_key: bytes, scope: str, query: str, filters: Dict, search_type: str) -> bytes:
+    """
+    Run a search once per key and return the serialized response body.
+    
+    The search runs in a detached task that every identical concurrent request
+    awaits through a shield, so a disconnecting client cancels only its own
+    wait and never the search the others share.
+    """
+    search_task = _inflight_searches.get(cache_key)
+    if search_task is None:
+        search_task = asyncio.create_task(_search_body(cache_key, scope, query, filters, search_type))
+        _inflight_searches[cache_key] = search_task
+        search_task.add_done_callback(partial(_finish_search, cache_key))
+    return await asyncio.shield(search_task)
+
+
+def _finish_search(cache_key: bytes, search_task: asyncio.Task) -> None:
+    """Drop a finished search from the in-flight map"""
+    if _inflight_searches.get(cache_key) is search_task:
+        del _inflight_searches[cache_key]
+    # Mark the exception retrieved in case every waiting request went away
+    if not search_task.cancelled():
+        search_task.exception()
+
+
+async def _search_body(cache_key: bytes, scope: str, query: str, filters: Dict, search_type: str) -> bytes:
+    """Search (or answer from the semantic cache) and serialize the response body"""
+    # A near-identical earlier query in the same scope answers without calling Azure Search
+    embedding = None
+    results = None
+    if semantic_cache is not None:
+        embedding = await _embed_query(query)
+        results = semantic_cache.lookup(scope, embedding)
+    
+    if results is None:
+        results = await search_integration.search_documents(query, filters, search_type)
+        
+        if results and embedding is not None:
+            semantic_cache.store(scope, embedding, results)
+    
+    # SearchResult fields are the response fields; orjson serializes the dataclasses directly
+    body = orjson.dumps({
+        'query': query,
+        'results': results,
+        'total_results': len(results),
+        'search_type': search_type
+    }, option=ORJSON_OPTIONS)
+    
+    # Failed searches come back empty, so only cache real hits
+    if results:
+        _search_cache[cache_key] = body
+    
+    return body
 
 
 # RAG API Routes
 
 @app.route('/api/search', methods=['POST'])
-def search_documents():
+async def search_documents():
     """Search documents in the knowledge base"""
     try:
-        data = request.get_json()
-        query = data.get('query', '')
-        filters = data.get('filters', {})
-        search_type = data.get('search_type', 'hybrid')
+        search_request = await _decode_body(SearchRequest)
+        query = search_request.query
+        filters = search_request.filters or {}
+        search_type = search_request.search_type
         
         if not query:
-            return jsonify({'error': 'Query is required'}), 400
+            return ojsonify({'error': 'Query is required'}, 400)
         
         if not search_integration:
-            return jsonify({'error': 'Search service not initialized'}), 503
+            return _not_ready(_SEARCH_NOT_READY_BODY)
+        
+        scope = _search_scope(filters, search_type)
+        cache_key = _search_cache_key(query, scope)
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            return Response(cached, mimetype='application/json')
         
         # Perform search
-        results = run_async(search_integration.search_documents(query, filters, search_type))
-        
-        # Format results
-        formatted_results = []
-        for result in results:
-            formatted_results.append({
-                'id': result.document_id,
-                'url': result.url,
-                'title': result.title,
-                'snippet': result.content_snippet,
-                'score': result.score,
-                'highlights': result.highlights,
-                'metadata': result.metadata
-            })
-        
-        return jsonify({
-            'query': query,
-            'results': formatted_results,
-            'total_results': len(formatted_results),
-            'search_type': search_type
-        })
+        body = await _run_search(cache_key, scope, query, filters, search_type)
+        
+        return Response(body, mimetype='application/json')
+        
+    except msgspec.DecodeError as e:
+        return ojsonify({'error': f'Invalid request body: {str(e)}'}, 400)
+    except Exception as e:
+        logger.error("Search error: %s", e)
+        return ojsonify({'error': str(e)}, 500)
+
+
+@app.route('/api/search/stream', methods=['POST'])
+async def stream_search_documents():
+    """Stream search results as NDJSON, one document per line"""
+    try:
+        search_request = await _decode_body(SearchRequest)
+        query = search_request.query
+        filters = search_request.filters or {}
+        search_type = search_request.search_type
+        
+        if not query:
+            return ojsonify({'error': 'Query is required'}, 400)
+        
+        if not search_integration:
+            return _not_ready(_SEARCH_NOT_READY_BODY)
+        
+        async def generate():
+            async for result in search_integration.iter_search_documents(query, filters, search_type):
+                yield orjson.dumps(result) + b'\n'
         
+        return Response(generate(), mimetype='application/x-ndjson')
+        
+    except msgspec.DecodeError as e:
+        return ojsonify({'error': f'Invalid request body: {str(e)}'}, 400)
     except Exception as e:
-        logger.error(f"Search error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Streaming search error: %s", e)
+        return ojsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/suggest', methods=['GET'])
-def get_suggestions():
+async def get_suggestions():
     """Get query suggestions"""
     try:
         partial_query = request.args.get('q', '')
         top = int(request.args.get('top', 5))
         
         if not partial_query:
-            return jsonify({'suggestions': []})
+            return ojsonify({'suggestions': []})
         
         if not search_integration:
-            return jsonify({'error': 'Search service not initialized'}), 503
+            return _not_ready(_SEARCH_NOT_READY_BODY)
         
-        suggestions = run_async(search_integration.suggest_queries(partial_query, top))
+        suggestions = await search_integration.suggest_queries(partial_query, top)
         
-        return jsonify({'suggestions': suggestions})
+        return ojsonify({'suggestions': suggestions})
         
     except Exception as e:
-        logger.error(f"Suggestions error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Suggestions error: %s", e)
+        return ojsonify({'error': str(e)}, 500)
+
+
+async def _run_sync_in_background(coro, operation_id: str, refresh_suggestions: bool) -> None:
+    """Run a sync operation on the background loop and refresh caches when it succeeds"""
+    try:
+        result = await run_on_background_loop(coro)
+        
+        if result.success:
+            _search_cache.clear()
+            if semantic_cache is not None:
+                semantic_cache.clear()
+            if refresh_suggestions and search_integration:
+                await search_integration.refresh_suggestion_trie()
+        
+        logger.info("Sync operation %s finished: success=%s, processed=%s, errors=%s",
+                    operation_id, result.success, result.total_processed, len(result.errors))
+        
+    except Exception as e:
+        logger.error("Sync operation %s error: %s", operation_id, e)
 
 
 @app.route('/api/sync/full', methods=['POST'])
-def trigger_full_sync():
-    """Trigger a full synchronization"""
+async def trigger_full_sync():
+    """Start a full synchronization; poll /api/sync/status for progress"""
     try:
-        data = request.get_json() or {}
-        view_types = data.get('view_types', ['personal', 'management'])
+        view_types = (await _decode_body(FullSyncRequest)).view_types
         
         if not sync_service:
-            return jsonify({'error': 'Sync service not initialized'}), 503
-        
-        # Start synchronization
-        result = run_async(sync_service.perform_full_synchronization(view_types))
-        
-        return jsonify({
-            'operation_id': result.operation_id,
-            'success': result.success,
-            'total_processed': result.total_processed,
-            'newly_indexed': result.newly_indexed,
-            'updated_indexed': result.updated_indexed,
-            'removed_indexed': result.removed_indexed,
-            'errors': result.errors,
-            'execution_time': result.execution_time
-        })
-        
+            return _not_ready(_SYNC_NOT_READY_BODY)
+        
+        # Start synchronization without holding the request open; the sync
+        # service's operation state lives on the background loop
+        operation_id = await run_on_background_loop(sync_service.reserve_operation_id('full_sync'))
+        app.add_background_task(
+            _run_sync_in_background,
+            sync_service.perform_full_synchronization(view_types, operation_id),
+            operation_id,
+            True
+        )
+        
+        return ojsonify({'operation_id': operation_id, 'status': 'accepted'}, 202)
+        
+    except msgspec.DecodeError as e:
+        return ojsonify({'error': f'Invalid request body: {str(e)}'}, 400)
     except Exception as e:
-        logger.error(f"Full sync error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Full sync error: %s", e)
+        return ojsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/sync/incremental', methods=['POST'])
-def trigger_incremental_sync():
-    """Trigger an incremental synchronization"""
+async def trigger_incremental_sync():
+    """Start an incremental synchronization; poll /api/sync/status for progress"""
     try:
         if not sync_service:
-            return jsonify({'error': 'Sync service not initialized'}), 503
+            return _not_ready(_SYNC_NOT_READY_BODY)
         
-        result = run_async(sync_service.perform_incremental_synchronization())
+        operation_id = await run_on_background_loop(sync_service.reserve_operation_id('incremental_sync'))
+        app.add_background_task(
+            _run_sync_in_background,
+            sync_service.perform_incremental_synchronization(operation_id),
+            operation_id,
+            False
+        )
         
-        return jsonify({
-            'operation_id': result.operation_id,
-            'success': result.success,
-            'total_processed': result.total_processed,
-            'updated_indexed': result.updated_indexed,
-            'errors': result.errors,
-            'execution_time': result.execution_time
-        })
+        return ojsonify({'operation_id': operation_id, 'status': 'accepted'}, 202)
+        
+    except Exception as e:
+        logger.error("Incremental sync error: %s", e)
+        return ojsonify({'error': str(e)}, 500)
+
+
+@app.route('/api/cache/clear', methods=['POST'])
+async def clear_caches():
+    """Drop every cached search response, query embedding and status body"""
+    try:
+        _search_cache.clear()
+        _query_embeddings.clear()
+        _status_cache.clear()
+        if semantic_cache is not None:
+            semantic_cache.clear()
+        
+        return ojsonify({'status': 'cleared', 'timestamp': now_iso()})
         
     except Exception as e:
-        logger.error(f"Incremental sync error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Cache clear error: %s", e)
+        return ojsonify({'error': str(e)}, 500)
+
+
+# Serialized /api/sync/status snapshot: [sync service status_version, body without its closing brace]
+_sync_status_body = [None, b'']
 
 
 @app.route('/api/sync/status', methods=['GET'])
-def get_sync_status():
+async def get_sync_status():
     """Get synchronization status"""
     try:
         if not sync_service:
-            return jsonify({'error': 'Sync service not initialized'}), 503
-        
-        # Get active operations
-        active_operations = sync_service.get_all_active_operations()
-        
-        # Get recent sync history
-        recent_syncs = sync_service.get_sync_history(10)
-        
-        # Get sync statistics
-        stats = sync_service._get_sync_statistics()
-        
-        return jsonify({
-            'active_operations': [
-                {
-                    'operation_id': op.operation_id,
-                    'operation_type': op.operation_type,
-                    'status': op.status,
-                    'started_at': op.started_at,
-                    'urls_processed': op.urls_processed,
-                    'urls_updated': op.urls_updated,
-                    'urls_failed': op.urls_failed
-                }
-                for op in active_operations
-            ],
-            'recent_syncs': [
-                {
-                    'operation_id': sync.operation_id,
-                    'success': sync.success,
-                    'total_processed': sync.total_processed,
-                    'execution_time': sync.execution_time
-                }
-                for sync in recent_syncs
-            ],
-            'statistics': stats
-        })
+            return _not_ready(_SYNC_NOT_READY_BODY)
+        
+        # The sync service rebuilds this snapshot only when its state changes; serialize it once per version
+        version = sync_service.status_version
+        if _sync_status_body[0] != version:
+            _sync_status_body[:] = [version, orjson.dumps(sync_service.get_status_snapshot(), option=ORJSON_OPTIONS)[:-1]]
+        
+        # Statistics change without a version bump, so they are serialized fresh and appended
+        statistics = orjson.dumps(sync_service.get_sync_statistics(), option=ORJSON_OPTIONS)
+        return Response(_sync_status_body[1] + b',"statistics":' + statistics + b'}', mimetype='application/json')
         
     except Exception as e:
-        logger.error(f"Sync status error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Sync status error: %s", e)
+        return ojsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/system/status', methods=['GET'])
-def get_system_status():
+async def get_system_status():
     """Get overall system status"""
     try:
+        # Index and orchestrator stats are backend round-trips; serve dashboards from a short cache
+        cached = _cached_status_response('system_status', RAG_CONFIG.system_status_ttl)
+        if cached is not None:
+            return cached
+        
         status = {
-            'timestamp': datetime.now().isoformat(),
-            'services': {
-                'search_integration': search_integration is not None,
-                'rag_orchestrator': rag_orchestrator is not None,
-                'sync_service': sync_service is not None
-            },
-            'configuration': {
-                'search_index_name': RAG_CONFIG.get('search_index_name'),
-                'embedding_model': RAG_CONFIG.get('embedding_model'),
-                'search_top_k': RAG_CONFIG.get('search_top_k'),
-                'use_azure_openai': RAG_CONFIG.get('use_azure_openai', False),
-                'azure_openai_deployment': RAG_CONFIG.get('azure_openai_deployment_name') if RAG_CONFIG.get('use_azure_openai') else None
-            }
+            'timestamp': now_iso(),
+            'services': _SYSTEM_STATUS_SERVICES[_service_bits],
+            'configuration': _SYSTEM_STATUS_CONFIGURATION
         }
         
         # Get search index statistics if available
         if search_integration:
             try:
-                index_stats = search_integration.get_index_statistics()
+                index_stats = await asyncio.to_thread(search_integration.get_index_statistics)
                 status['index_statistics'] = index_stats
             except Exception as e:
                 status['index_statistics'] = {'error': f'Could not retrieve index statistics: {str(e)}'}
@@ -351,67 +800,57 @@ def get_system_status():
             except Exception as e:
                 status['orchestrator_status'] = {'error': f'Could not retrieve orchestrator status: {str(e)}'}
         
-        return jsonify(status)
+        return await _store_status_response('system_status', ojsonify(status))
         
     except Exception as e:
-        logger.error(f"System status error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("System status error: %s", e)
+        return ojsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
+async def health_check():
+    """Liveness check: 200 while the API is serving, reporting 'degraded' until every component is up"""
     try:
-        health_status = {
-            'status': 'healthy',
-            'timestamp': datetime.now().isoformat(),
-            'services': {
-                'api': True,
-                'search': search_integration is not None,
-                'orchestrator': rag_orchestrator is not None,
-                'sync': sync_service is not None
-            },
-            'configuration': {
-                'azure_openai_configured': RAG_CONFIG.get('use_azure_openai', False),
-                'search_configured': bool(RAG_CONFIG.get('azure_search_endpoint')),
-                'storage_configured': bool(RAG_CONFIG.get('azure_storage_account_url')),
-                'rag_imports_available': RAG_IMPORTS_AVAILABLE
-            }
-        }
+        body = _HEALTH_BODY_PREFIXES[_service_bits] + now_iso().encode('ascii') + b'"}'
         
-        # Check if all critical services are available
-        all_healthy = all(health_status['services'].values())
-        
-        if not all_healthy:
-            health_status['status'] = 'degraded'
-            return jsonify(health_status), 503
-        
-        return jsonify(health_status)
+        return Response(body, mimetype='application/json')
         
     except Exception as e:
-        logger.error(f"Health check error: {str(e)}")
-        return jsonify({
+        logger.error("Health check error: %s", e)
+        return ojsonify({
             'status': 'unhealthy',
             'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+            'timestamp': now_iso()
+        }, 500)
+
+
+@app.route('/api/ready', methods=['GET'])
+async def readiness_check():
+    """Readiness check: 200 only once every RAG component has initialized"""
+    bits = _service_bits
+    if bits == ALL_SERVICES_READY:
+        return Response(_READY_BODIES[bits], mimetype='application/json')
+    return _not_ready(_READY_BODIES[bits])
 
 
 # Basic route for testing
 @app.route('/')
-def home():
+async def home():
     """Basic home route"""
-    return jsonify({
+    return ojsonify({
         'message': 'ExponentHR RAG API is running',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now_iso(),
         'endpoints': {
             'health': '/api/health',
+            'ready': '/api/ready',
             'system_status': '/api/system/status',
             'search': '/api/search (POST)',
+            'search_stream': '/api/search/stream (POST, NDJSON)',
             'suggestions': '/api/suggest',
             'full_sync': '/api/sync/full (POST)',
             'incremental_sync': '/api/sync/incremental (POST)',
-            'sync_status': '/api/sync/status'
+            'sync_status': '/api/sync/status',
+            'cache_clear': '/api/cache/clear (POST)'
         }
     })
 
@@ -428,33 +867,30 @@ try:
     
     # Check for OpenAI configuration (either regular or Azure)
     has_openai_config = (
-        RAG_CONFIG.get('openai_api_key') or 
-        (RAG_CONFIG.get('use_azure_openai') and RAG_CONFIG.get('azure_openai_api_key'))
+        RAG_CONFIG.openai_api_key or 
+        (RAG_CONFIG.use_azure_openai and RAG_CONFIG.azure_openai_api_key)
     )
     
-    config_complete = all(RAG_CONFIG.get(key) for key in required_config) and has_openai_config and RAG_IMPORTS_AVAILABLE
+    config_complete = all(getattr(RAG_CONFIG, key) for key in required_config) and has_openai_config and RAG_IMPORTS_AVAILABLE
     
     if config_complete:
-        # Initialize in a separate thread to avoid blocking startup
-        import threading
-        
-        def init_rag():
+        # Initialize on the background loop, where the sync work later runs, so the
+        # browser and client sessions created here stay usable; don't block startup
+        def on_init_done(future):
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(initialize_rag_system())
+                future.result()
                 logger.info("RAG system initialized successfully in background")
             except Exception as e:
                 logger.error(f"Failed to initialize RAG system in background: {str(e)}")
         
-        init_thread = threading.Thread(target=init_rag, daemon=True)
-        init_thread.start()
-        logger.info("RAG system initialization started in background thread")
+        init_future = asyncio.run_coroutine_threadsafe(initialize_rag_system(), _bg_loop)
+        init_future.add_done_callback(on_init_done)
+        logger.info("RAG system initialization started on background loop")
         
     else:
         missing_config = []
-        if not all(RAG_CONFIG.get(key) for key in required_config):
-            missing_config.extend([key for key in required_config if not RAG_CONFIG.get(key)])
+        if not all(getattr(RAG_CONFIG, key) for key in required_config):
+            missing_config.extend([key for key in required_config if not getattr(RAG_CONFIG, key)])
         if not has_openai_config:
             missing_config.append("OpenAI configuration")
         if not RAG_IMPORTS_AVAILABLE:
@@ -468,6 +904,16 @@ except Exception as e:
     logger.warning("Running in limited mode")
 
 
+# Production runs under gunicorn (see gunicorn.conf.py); this entry point is for local development
 if __name__ == '__main__':
-    logger.info("Starting Flask application...")
-    app.run(host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
+    import uvicorn
+    
+    logger.info("Starting Quart application (uvicorn + uvloop)...")
+    uvicorn.run(
+        asgi_app,
+        host='0.0.0.0',
+        port=int(os.getenv('PORT', '5000')),
+        loop='uvloop',
+        http='httptools',
+        log_level='info'
+    )
@@ -4,19 +4,38 @@ Main orchestrator that coordinates scraping, discovery, and change detection.
 """
 
 import asyncio
-import json
+import itertools
+import aiohttp
 import logging
-from typing import Dict, List, Optional, Tuple
+import orjson
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-import schedule
+from collections import deque
+from dataclasses import dataclass
 import time
 
-from exponenthr_scraper import ExponentHRScraper, ScrapingResult
+from playwright.async_api import Page
+
+from exponenthr_scraper import (ExponentHRScraper, ScrapingResult, CONTENT_BLOB_SETTINGS,
+                                content_blob_name, encode_content_blob, url_blob_key)
 from content_discovery import ContentDiscoveryService
 from change_detection import ChangeDetectionSystem, ChangeEvent
-from azure.storage.blob import BlobServiceClient
-from azure.identity import DefaultAzureCredential
+from azure.storage.blob.aio import BlobServiceClient
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+from azure.identity.aio import DefaultAzureCredential
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+
+# Maximum number of sub-requests in one Blob Batch call
+BLOB_BATCH_SIZE = 256
+
+# Longest exception text kept in an operation's error messages
+MAX_ERROR_CHARS = 300
+
+# Metadata marking content blobs this orchestrator wrote; the sync service writes
+# to the same container, so pruning only ever touches blobs carrying it
+CONTENT_BLOB_METADATA = {'writer': 'orchestrator'}
 
 
 @dataclass
@@ -27,9 +46,10 @@ class OrchestrationResult:
     processed_urls: int
     new_content: int
     updated_content: int
-    errors: List[str]
+    errors: List[str]  # the most recent messages, up to 'max_errors'
     execution_time: float
     timestamp: str
+    error_count: int = 0
 
 
 @dataclass
@@ -44,6 +64,20 @@ class SystemStatus:
     error_rate: float
 
 
+class _ErrorRing:
+    """The most recent error messages of an operation, plus the total count"""
+    
+    __slots__ = ('messages', 'count')
+    
+    def __init__(self, maxlen: int):
+        self.messages: deque = deque(maxlen=maxlen)
+        self.count = 0
+    
+    def add(self, message: str) -> None:
+        self.messages.append(message)
+        self.count += 1
+
+
 class RAGOrchestrator:
     """
     Main orchestrator for the ExponentHR RAG scraping solution.
@@ -65,8 +99,30 @@ class RAGOrchestrator:
         self.discovery_service = ContentDiscoveryService(config)
         self.change_detector = ChangeDetectionSystem(config)
         
-        # Azure clients
+        # Azure clients (async, bound to the loop that runs initialize())
+        self.credential = None
         self.blob_client = None
+        self.content_container_client = None
+        self.state_container_client = None
+        self.upload_semaphore = asyncio.Semaphore(config.get('upload_concurrency', 16))
+        
+        # Shared HTTP session for fetching static topic pages without the browser
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        
+        # How incremental updates decide a URL needs reprocessing:
+        #   'always'            - re-scrape and fingerprint every due URL
+        #   'trust_incremental' - skip URLs whose topic file answers 304 Not Modified
+        #   'always_reprocess'  - like 'always', but re-store content even if unchanged
+        self.delta_strategy = config.get('delta_strategy', 'always')
+        
+        # Settings read on every scrape/upload, resolved once
+        self.request_delay = float(config.get('request_delay', 1.0))
+        self.scrape_concurrency = int(config.get('scrape_concurrency', 5))
+        self.content_container = config.get('content_container', 'scraped-content')
+        self.max_errors = int(config.get('max_errors', 500))
+        
+        # Content blobs known to exist, so unchanged documents are not re-uploaded
+        self.known_content_blobs: Set[str] = set()
         
         # Orchestration state
         self.system_status = SystemStatus(
@@ -79,10 +135,12 @@ class RAGOrchestrator:
             error_rate=0.0
         )
         
-        # Operation history
-        self.operation_history: List[OrchestrationResult] = []
+        # Operation history, oldest first
+        self.operation_history: deque = deque(maxlen=config.get('max_operation_history', 1000))
+        self._history_blob = None  # append blob client for the current day
         
         # Scheduling
+        self.scheduler: Optional[AsyncIOScheduler] = None
         self.scheduler_running = False
     
     def _setup_logging(self) -> logging.Logger:
@@ -111,6 +169,12 @@ class RAGOrchestrator:
             # Initialize scraper
             await self.scraper.initialize_browser()
             
+            if self.config.get('http_scraping_enabled', True):
+                self.http_session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=30),
+                    timeout=aiohttp.ClientTimeout(total=30)
+                )
+            
             # Initialize change detector
             self.change_detector.initialize_azure_clients()
             
@@ -126,15 +190,18 @@ class RAGOrchestrator:
     async def _initialize_azure_clients(self) -> None:
         """Initialize Azure service clients"""
         try:
-            credential = DefaultAzureCredential()
+            self.credential = DefaultAzureCredential()
             
             # Initialize Blob Storage client
             storage_account_url = self.config.get('azure_storage_account_url')
             if storage_account_url:
                 self.blob_client = BlobServiceClient(
                     account_url=storage_account_url,
-                    credential=credential
+                    credential=self.credential
                 )
+                # Containers are fixed by config; reuse their clients for every upload
+                self.content_container_client = self.blob_client.get_container_client(self.content_container)
+                self.state_container_client = self.blob_client.get_container_client('system-state')
                 self.logger.info("Azure Blob Storage client initialized")
             
             # Initialize other Azure clients as needed
@@ -154,7 +221,7 @@ class RAGOrchestrator:
         Returns:
             OrchestrationResult with operation details
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         operation = "full_discovery_and_scraping"
         
         if view_types is None:
@@ -165,16 +232,17 @@ class RAGOrchestrator:
         processed_urls = 0
         new_content = 0
         updated_content = 0
-        errors = []
+        errors = _ErrorRing(self.max_errors)
         
         try:
+            # Discover the navigation structure of every view concurrently
+            nav_structures = await self.discovery_service.discover_all(self.scraper.context, view_types)
+            
             for view_type in view_types:
                 try:
-                    # Discover navigation structure
-                    self.logger.info(f"Discovering navigation structure for {view_type} view")
-                    nav_structure = await self.discovery_service.discover_navigation_structure(
-                        self.scraper.page, view_type
-                    )
+                    nav_structure = nav_structures[view_type]
+                    if isinstance(nav_structure, Exception):
+                        raise nav_structure
                     
                     # Extract URLs to scrape
                     urls_to_scrape = [
@@ -183,92 +251,63 @@ class RAGOrchestrator:
                     
                     self.logger.info(f"Found {len(urls_to_scrape)} URLs to scrape for {view_type} view")
                     
-                    # Validate URLs
-                    validation_results = await self.discovery_service.validate_discovered_urls(
-                        self.scraper.page, urls_to_scrape
-                    )
-                    
-                    valid_urls = [url for url, is_valid in validation_results.items() if is_valid]
-                    self.logger.info(f"Validated {len(valid_urls)} URLs for scraping")
+                    # Scrape URLs concurrently as validation confirms them
+                    valid_urls = self.discovery_service.iter_valid_urls(self.scraper.context, urls_to_scrape)
+                    results = await self._process_urls_concurrently(valid_urls, self._scrape_and_store)
+                    self.logger.info(f"Validated {len(results)} URLs for scraping")
                     
-                    # Scrape each valid URL
-                    for url in valid_urls:
-                        try:
-                            # Scrape the document
-                            scraping_result = await self.scraper.scrape_document(url)
-                            processed_urls += 1
-                            
-                            if scraping_result.success:
-                                # Create content fingerprint
-                                fingerprint = self.change_detector.create_content_fingerprint(
-                                    url,
-                                    scraping_result.content,
-                                    asdict(scraping_result.metadata)
-                                )
-                                
-                                # Check for changes
-                                change_event = self.change_detector.detect_changes(url, fingerprint)
-                                
-                                if change_event:
-                                    if change_event.change_type == 'new':
-                                        new_content += 1
-                                    else:
-                                        updated_content += 1
-                                
-                                # Setup monitoring schedule
-                                content_type = scraping_result.metadata.content_type
-                                self.change_detector.setup_monitoring_schedule(
-                                    url, content_type, 'medium'
-                                )
-                                
-                                # Store content in Azure Blob Storage
-                                await self._store_content_in_azure(scraping_result)
-                                
-                            else:
-                                errors.append(f"Failed to scrape {url}: {scraping_result.error_message}")
-                            
-                            # Add delay between requests
-                            await asyncio.sleep(self.config.get('request_delay', 1.0))
-                            
-                        except Exception as e:
-                            error_msg = f"Error processing {url}: {str(e)}"
-                            errors.append(error_msg)
+                    for url, result in results:
+                        if isinstance(result, Exception):
+                            error_msg = f"Error processing {url}: {str(result)[:MAX_ERROR_CHARS]}"
+                            errors.add(error_msg)
                             self.logger.error(error_msg)
+                            continue
+                        
+                        processed_urls += 1
+                        change_type, error = result
+                        if error:
+                            errors.add(error)
+                        elif change_type == 'new':
+                            new_content += 1
+                        elif change_type:
+                            updated_content += 1
                     
                 except Exception as e:
-                    error_msg = f"Error processing {view_type} view: {str(e)}"
-                    errors.append(error_msg)
+                    error_msg = f"Error processing {view_type} view: {str(e)[:MAX_ERROR_CHARS]}"
+                    errors.add(error_msg)
                     self.logger.error(error_msg)
             
             # Update system status
-            self.system_status.last_full_scan = datetime.now().isoformat()
+            finished_at = datetime.now().isoformat()
+            self.system_status.last_full_scan = finished_at
             self.system_status.total_documents = len(self.change_detector.content_fingerprints)
             self.system_status.monitored_urls = len(self.change_detector.monitoring_schedules)
             
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             
             result = OrchestrationResult(
                 operation=operation,
-                success=len(errors) == 0,
+                success=errors.count == 0,
                 processed_urls=processed_urls,
                 new_content=new_content,
                 updated_content=updated_content,
-                errors=errors,
+                errors=list(errors.messages),
+                error_count=errors.count,
                 execution_time=execution_time,
-                timestamp=datetime.now().isoformat()
+                timestamp=finished_at
             )
             
-            self.operation_history.append(result)
+            await self._record_operation(result)
             
             self.logger.info(f"Full discovery and scraping completed: {processed_urls} URLs processed, "
-                           f"{new_content} new, {updated_content} updated, {len(errors)} errors")
+                           f"{new_content} new, {updated_content} updated, {errors.count} errors")
             
             return result
             
         except Exception as e:
-            execution_time = time.time() - start_time
-            error_msg = f"Full discovery and scraping failed: {str(e)}"
-            errors.append(error_msg)
+            execution_time = time.monotonic() - start_time
+            error_msg = f"Full discovery and scraping failed: {str(e)[:MAX_ERROR_CHARS]}"
+            errors.add(error_msg)
             self.logger.error(error_msg)
             
             result = OrchestrationResult(
@@ -277,12 +316,13 @@ class RAGOrchestrator:
                 processed_urls=processed_urls,
                 new_content=new_content,
                 updated_content=updated_content,
-                errors=errors,
+                errors=list(errors.messages),
+                error_count=errors.count,
                 execution_time=execution_time,
                 timestamp=datetime.now().isoformat()
             )
             
-            self.operation_history.append(result)
+            await self._record_operation(result)
             return result
     
     async def perform_incremental_update(self) -> OrchestrationResult:
@@ -292,7 +332,7 @@ class RAGOrchestrator:
         Returns:
             OrchestrationResult with operation details
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         operation = "incremental_update"
         
         self.logger.info("Starting incremental update")
@@ -300,7 +340,7 @@ class RAGOrchestrator:
         processed_urls = 0
         new_content = 0
         updated_content = 0
-        errors = []
+        errors = _ErrorRing(self.max_errors)
         
         try:
             # Get URLs due for checking
@@ -308,73 +348,51 @@ class RAGOrchestrator:
             
             self.logger.info(f"Found {len(urls_to_check)} URLs due for checking")
             
-            for url in urls_to_check:
-                try:
-                    # Scrape the document
-                    scraping_result = await self.scraper.scrape_document(url)
-                    processed_urls += 1
-                    
-                    if scraping_result.success:
-                        # Create content fingerprint
-                        fingerprint = self.change_detector.create_content_fingerprint(
-                            url,
-                            scraping_result.content,
-                            asdict(scraping_result.metadata)
-                        )
-                        
-                        # Check for changes
-                        change_event = self.change_detector.detect_changes(url, fingerprint)
-                        
-                        if change_event:
-                            if change_event.change_type == 'new':
-                                new_content += 1
-                            else:
-                                updated_content += 1
-                            
-                            # Store updated content
-                            await self._store_content_in_azure(scraping_result)
-                            
-                            self.logger.info(f"Change detected in {url}: {change_event.change_type}")
-                    
-                    # Update monitoring schedule
-                    self.change_detector.update_monitoring_schedule(url)
-                    
-                    # Add delay between requests
-                    await asyncio.sleep(self.config.get('request_delay', 1.0))
-                    
-                except Exception as e:
-                    error_msg = f"Error checking {url}: {str(e)}"
-                    errors.append(error_msg)
+            results = await self._process_urls_concurrently(urls_to_check, self._check_for_changes)
+            
+            for url, result in results:
+                if isinstance(result, Exception):
+                    error_msg = f"Error checking {url}: {str(result)[:MAX_ERROR_CHARS]}"
+                    errors.add(error_msg)
                     self.logger.error(error_msg)
+                    continue
+                
+                processed_urls += 1
+                if result == 'new':
+                    new_content += 1
+                elif result:
+                    updated_content += 1
             
             # Update system status
-            self.system_status.last_incremental_scan = datetime.now().isoformat()
-            self.system_status.pending_changes = len(self.change_detector.get_recent_changes(24))
+            finished_at = datetime.now().isoformat()
+            self.system_status.last_incremental_scan = finished_at
+            self.system_status.pending_changes = self.change_detector.count_recent_changes(24)
             
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             
             result = OrchestrationResult(
                 operation=operation,
-                success=len(errors) == 0,
+                success=errors.count == 0,
                 processed_urls=processed_urls,
                 new_content=new_content,
                 updated_content=updated_content,
-                errors=errors,
+                errors=list(errors.messages),
+                error_count=errors.count,
                 execution_time=execution_time,
-                timestamp=datetime.now().isoformat()
+                timestamp=finished_at
             )
             
-            self.operation_history.append(result)
+            await self._record_operation(result)
             
             self.logger.info(f"Incremental update completed: {processed_urls} URLs checked, "
-                           f"{updated_content} updated, {len(errors)} errors")
+                           f"{updated_content} updated, {errors.count} errors")
             
             return result
             
         except Exception as e:
-            execution_time = time.time() - start_time
-            error_msg = f"Incremental update failed: {str(e)}"
-            errors.append(error_msg)
+            execution_time = time.monotonic() - start_time
+            error_msg = f"Incremental update failed: {str(e)[:MAX_ERROR_CHARS]}"
+            errors.add(error_msg)
             self.logger.error(error_msg)
             
             result = OrchestrationResult(
@@ -383,23 +401,137 @@ class RAGOrchestrator:
                 processed_urls=processed_urls,
                 new_content=new_content,
                 updated_content=updated_content,
-                errors=errors,
+                errors=list(errors.messages),
+                error_count=errors.count,
                 execution_time=execution_time,
                 timestamp=datetime.now().isoformat()
             )
             
-            self.operation_history.append(result)
+            await self._record_operation(result)
             return result
     
+    async def _process_urls_concurrently(self, urls: Union[List[str], AsyncIterator[str]],
+                                         process_url: Callable[[str, Page], Awaitable]) -> List[Tuple[str, object]]:
+        """Run process_url over urls on the scraper's shared page-pool helper"""
+        return await self.scraper.process_urls_concurrently(
+            urls, process_url, self.scrape_concurrency, self.request_delay
+        )
+    
+    async def _is_unchanged(self, url: str) -> bool:
+        """
+        Whether a fingerprinted URL's topic file is known to be unchanged, so
+        an incremental update needs no re-scrape, fingerprinting or upload
+        """
+        if self.delta_strategy != 'trust_incremental' or self.http_session is None:
+            return False
+        
+        validators = self.change_detector.http_validators.get(url)
+        return (validators is not None
+                and url in self.change_detector.content_fingerprints
+                and await self.scraper.is_unchanged_http(url, self.http_session, validators))
+    
+    async def _scrape(self, url: str, page: Page) -> ScrapingResult:
+        """Scrape a URL over plain HTTP when possible, rendering it in the browser otherwise"""
+        if self.http_session is not None:
+            scraping_result = await self.scraper.scrape_document_http(url, self.http_session)
+            if scraping_result is not None:
+                return scraping_result
+        
+        return await self.scraper.scrape_document(url, page)
+    
+    async def _scrape_and_store(self, url: str, page: Page) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Scrape a URL for a full scan, record its fingerprint and store it.
+        
+        Returns:
+            (change type or None, error message or None)
+        """
+        scraping_result = await self._scrape(url, page)
+        
+        if not scraping_result.success:
+            return None, f"Failed to scrape {url}: {scraping_result.error_message}"
+        
+        # Create content fingerprint
+        metadata = scraping_result.metadata.as_dict()
+        fingerprint = self.change_detector.create_content_fingerprint(
+            url,
+            scraping_result.content,
+            metadata
+        )
+        
+        # Check for changes
+        change_event = self.change_detector.detect_changes(url, fingerprint)
+        self.change_detector.record_http_validators(url, scraping_result.http_validators)
+        
+        # Setup monitoring schedule
+        content_type = scraping_result.metadata.content_type
+        self.change_detector.setup_monitoring_schedule(
+            url, content_type, 'medium'
+        )
+        
+        # Store new or changed content in Azure Blob Storage
+        if self._needs_upload(change_event, scraping_result):
+            await self._store_content_in_azure(scraping_result)
+        
+        return (change_event.change_type if change_event else None), None
+    
+    async def _check_for_changes(self, url: str, page: Page) -> Optional[str]:
+        """
+        Re-scrape a URL due for monitoring and store it if it changed.
+        
+        Returns:
+            The change type, or None if the content is unchanged
+        """
+        if await self._is_unchanged(url):
+            self.change_detector.update_monitoring_schedule(url)
+            return None
+        
+        change_type = None
+        scraping_result = await self._scrape(url, page)
+        
+        if scraping_result.success:
+            # Create content fingerprint
+            metadata = scraping_result.metadata.as_dict()
+            fingerprint = self.change_detector.create_content_fingerprint(
+                url,
+                scraping_result.content,
+                metadata
+            )
+            
+            # Check for changes
+            change_event = self.change_detector.detect_changes(url, fingerprint)
+            self.change_detector.record_http_validators(url, scraping_result.http_validators)
+            
+            if change_event:
+                change_type = change_event.change_type
+                
+                # Store updated content
+                await self._store_content_in_azure(scraping_result)
+                
+                self.logger.info(f"Change detected in {url}: {change_type}")
+            elif self._needs_upload(None, scraping_result):
+                await self._store_content_in_azure(scraping_result)
+        
+        # Update monitoring schedule
+        self.change_detector.update_monitoring_schedule(url)
+        
+        return change_type
+    
+    def _needs_upload(self, change_event: Optional[ChangeEvent], scraping_result: ScrapingResult) -> bool:
+        """Whether scraped content must be (re)uploaded: it changed, or its blob is missing"""
+        return (change_event is not None
+                or self.delta_strategy == 'always_reprocess'
+                or content_blob_name(scraping_result.metadata) not in self.known_content_blobs)
+    
     async def _store_content_in_azure(self, scraping_result: ScrapingResult) -> None:
         """Store scraped content in Azure Blob Storage"""
         try:
             if not self.blob_client or not scraping_result.success:
                 return
             
-            # Prepare content data
+            # Prepare content data; orjson serializes the dataclasses natively
             content_data = {
-                'metadata': asdict(scraping_result.metadata),
+                'metadata': scraping_result.metadata,
                 'content': scraping_result.content,
                 'scraping_result': {
                     'success': scraping_result.success,
@@ -408,19 +540,16 @@ class RAGOrchestrator:
                 }
             }
             
-            # Create blob name based on URL hash
-            url_hash = scraping_result.metadata.content_hash[:16]
-            blob_name = f"content/{scraping_result.metadata.source_view}/{url_hash}.json"
+            blob_name = content_blob_name(scraping_result.metadata)
             
-            # Upload to blob storage
-            container_name = self.config.get('content_container', 'scraped-content')
-            blob_client = self.blob_client.get_blob_client(
-                container=container_name,
-                blob=blob_name
-            )
-            
-            content_json = json.dumps(content_data, indent=2)
-            blob_client.upload_blob(content_json, overwrite=True)
+            # Upload to blob storage in the shared gzip-encoded JSON form
+            content_json = encode_content_blob(content_data)
+            async with self.upload_semaphore:
+                await self.content_container_client.upload_blob(
+                    blob_name, content_json, overwrite=True, max_concurrency=4,
+                    content_settings=CONTENT_BLOB_SETTINGS, metadata=CONTENT_BLOB_METADATA
+                )
+            self.known_content_blobs.add(blob_name)
             
             self.logger.debug(f"Stored content for {scraping_result.metadata.url} in {blob_name}")
             
@@ -428,60 +557,42 @@ class RAGOrchestrator:
             self.logger.error(f"Error storing content in Azure: {str(e)}")
     
     def start_scheduler(self) -> None:
-        """Start the background scheduler for automated operations"""
+        """Start the background scheduler for automated operations (call from the running loop)"""
         try:
             if self.scheduler_running:
                 self.logger.warning("Scheduler is already running")
                 return
             
+            self.scheduler = AsyncIOScheduler()
+            
             # Schedule incremental updates
-            schedule.every(self.config.get('incremental_update_hours', 6)).hours.do(
-                self._schedule_incremental_update
+            self.scheduler.add_job(
+                self.perform_incremental_update, 'interval',
+                hours=self.config.get('incremental_update_hours', 6)
             )
             
             # Schedule full scans
-            schedule.every(self.config.get('full_scan_days', 7)).days.do(
-                self._schedule_full_scan
+            self.scheduler.add_job(
+                self.perform_full_discovery_and_scraping, 'interval',
+                days=self.config.get('full_scan_days', 7)
             )
             
             # Schedule cleanup operations
-            schedule.every().day.at("02:00").do(self._schedule_cleanup)
+            self.scheduler.add_job(self._perform_cleanup, 'cron', hour=2)
             
+            self.scheduler.start()
             self.scheduler_running = True
             self.logger.info("Scheduler started")
             
-            # Start scheduler loop
-            asyncio.create_task(self._scheduler_loop())
-            
         except Exception as e:
             self.logger.error(f"Error starting scheduler: {str(e)}")
     
-    def _schedule_incremental_update(self) -> None:
-        """Schedule incremental update task"""
-        asyncio.create_task(self.perform_incremental_update())
-    
-    def _schedule_full_scan(self) -> None:
-        """Schedule full scan task"""
-        asyncio.create_task(self.perform_full_discovery_and_scraping())
-    
-    def _schedule_cleanup(self) -> None:
-        """Schedule cleanup task"""
-        asyncio.create_task(self._perform_cleanup())
-    
-    async def _scheduler_loop(self) -> None:
-        """Background scheduler loop"""
-        while self.scheduler_running:
-            try:
-                schedule.run_pending()
-                await asyncio.sleep(60)  # Check every minute
-            except Exception as e:
-                self.logger.error(f"Error in scheduler loop: {str(e)}")
-                await asyncio.sleep(60)
-    
     def stop_scheduler(self) -> None:
         """Stop the background scheduler"""
+        if self.scheduler is not None:
+            self.scheduler.shutdown(wait=False)
+            self.scheduler = None
         self.scheduler_running = False
-        schedule.clear()
         self.logger.info("Scheduler stopped")
     
     async def _perform_cleanup(self) -> None:
@@ -490,14 +601,15 @@ class RAGOrchestrator:
             self.logger.info("Performing cleanup operations")
             
             # Clean up old change history
-            self.change_detector.cleanup_old_history()
+            await asyncio.to_thread(self.change_detector.cleanup_old_history)
             
-            # Clean up old operation history
-            cutoff_date = datetime.now() - timedelta(days=30)
-            self.operation_history = [
-                op for op in self.operation_history
-                if datetime.fromisoformat(op.timestamp) >= cutoff_date
-            ]
+            # Clean up old operation history; entries are in completion order
+            cutoff = (datetime.now() - timedelta(days=30)).isoformat()
+            while self.operation_history and self.operation_history[0].timestamp < cutoff:
+                self.operation_history.popleft()
+            
+            # Delete obsolete state and content blobs
+            await self._prune_blobs()
             
             # Save current state
             await self._save_system_state()
@@ -507,30 +619,91 @@ class RAGOrchestrator:
         except Exception as e:
             self.logger.error(f"Error during cleanup: {str(e)}")
     
+    async def _prune_blobs(self) -> None:
+        """Delete expired history/state blobs and this orchestrator's content blobs no fingerprint refers to"""
+        if not self.blob_client:
+            return
+        
+        try:
+            # Daily history blobs older than 30 days, and the timestamped state
+            # snapshots written before state moved to a fixed-name blob
+            cutoff = f"operation_history/{(datetime.now() - timedelta(days=30)).strftime('%Y%m%d')}"
+            state_container = self.state_container_client
+            expired = [
+                blob.name async for blob in state_container.list_blobs()
+                if blob.name.startswith('orchestrator_state_')
+                or (blob.name.startswith('operation_history/') and blob.name < cutoff)
+            ]
+            await self._delete_blobs(state_container, expired)
+            
+            # Content blobs this orchestrator wrote for URLs it no longer fingerprints;
+            # blobs last written by the sync service are tracked by its own detector.
+            # Never prune against an empty fingerprint set
+            live_keys = {url_blob_key(url) for url in self.change_detector.content_fingerprints}
+            if live_keys:
+                content_container = self.content_container_client
+                orphaned = [
+                    blob.name async for blob in content_container.list_blobs(name_starts_with='content/',
+                                                                             include=['metadata'])
+                    if (blob.metadata or {}).get('writer') == CONTENT_BLOB_METADATA['writer']
+                    and blob.name.rsplit('/', 1)[-1].removesuffix('.json') not in live_keys
+                ]
+                await self._delete_blobs(content_container, orphaned)
+                self.known_content_blobs.difference_update(orphaned)
+            
+        except Exception as e:
+            self.logger.error(f"Error pruning blobs: {str(e)}")
+    
+    async def _delete_blobs(self, container_client, blob_names: List[str]) -> None:
+        """Delete blobs with batch requests of up to 256 deletions each"""
+        for i in range(0, len(blob_names), BLOB_BATCH_SIZE):
+            await container_client.delete_blobs(*blob_names[i:i + BLOB_BATCH_SIZE],
+                                                raise_on_any_failure=False)
+        
+        if blob_names:
+            self.logger.info(f"Deleted {len(blob_names)} obsolete blobs from {container_client.container_name}")
+    
+    async def _record_operation(self, result: OrchestrationResult) -> None:
+        """Add an operation to the history and append it to today's history blob"""
+        self.operation_history.append(result)
+        
+        if not self.blob_client:
+            return
+        
+        try:
+            # Create the day's append blob on first use; IfMissing keeps a blob another
+            # worker (or this one before a restart) already created instead of truncating it
+            blob_name = f"operation_history/{datetime.now().strftime('%Y%m%d')}.ndjson"
+            if self._history_blob is None or self._history_blob.blob_name != blob_name:
+                history_blob = self.state_container_client.get_blob_client(blob_name)
+                try:
+                    await history_blob.create_append_blob(match_condition=MatchConditions.IfMissing)
+                except (ResourceExistsError, ResourceModifiedError):
+                    pass
+                self._history_blob = history_blob
+            
+            await self._history_blob.append_block(orjson.dumps(result) + b'\n')
+            
+        except Exception as e:
+            self.logger.error(f"Error appending operation history: {str(e)}")
+    
     async def _save_system_state(self) -> None:
         """Save system state to Azure"""
         try:
             # Save change detection state
             await self.change_detector.save_state_to_azure()
             
-            # Save orchestrator state
+            # Save orchestrator status; operation history is appended as it happens
             orchestrator_state = {
-                'system_status': asdict(self.system_status),
-                'operation_history': [asdict(op) for op in self.operation_history[-100:]],  # Keep last 100
+                'system_status': self.system_status,
                 'config': self.config,
                 'saved_at': datetime.now().isoformat()
             }
             
             if self.blob_client:
-                state_json = json.dumps(orchestrator_state, indent=2)
-                blob_name = f"orchestrator_state_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                
-                blob_client = self.blob_client.get_blob_client(
-                    container='system-state',
-                    blob=blob_name
+                await self.state_container_client.upload_blob(
+                    'orchestrator_state.json', orjson.dumps(orchestrator_state), overwrite=True
                 )
-                
-                blob_client.upload_blob(state_json, overwrite=True)
                 self.logger.info("System state saved to Azure")
             
         except Exception as e:
@@ -542,24 +715,51 @@ class RAGOrchestrator:
             # Load change detection state
             await self.change_detector.load_state_from_azure()
             
-            # Load orchestrator state (implementation would be similar to save)
-            # For brevity, this is simplified
+            if self.blob_client:
+                container_client = self.state_container_client
+                
+                try:
+                    downloader = await container_client.download_blob('orchestrator_state.json')
+                    state_data = orjson.loads(await downloader.readall())
+                    self.system_status = SystemStatus(**state_data['system_status'])
+                except ResourceNotFoundError:
+                    pass
+                
+                # Restore operation history from the most recent day's blob
+                history_blobs = [blob.name async for blob in
+                                 container_client.list_blobs(name_starts_with='operation_history/')]
+                if history_blobs:
+                    downloader = await container_client.download_blob(max(history_blobs))
+                    for line in (await downloader.readall()).splitlines():
+                        if line:
+                            self.operation_history.append(OrchestrationResult(**orjson.loads(line)))
+                
+                # Index stored content blobs; unlisted ones are re-uploaded on next scrape
+                content_container = self.content_container_client
+                self.known_content_blobs = {
+                    blob.name async for blob in content_container.list_blobs(name_starts_with='content/')
+                }
             
             self.logger.info("System state loaded from Azure")
             
         except Exception as e:
             self.logger.warning(f"Could not load system state: {str(e)}")
     
+    def _recent_operations(self, count: int) -> List[OrchestrationResult]:
+        """The last count operations, oldest first"""
+        return list(itertools.islice(self.operation_history,
+                                     max(0, len(self.operation_history) - count), None))
+    
     def get_system_status(self) -> SystemStatus:
         """Get current system status"""
         try:
             # Update dynamic status information
             self.system_status.total_documents = len(self.change_detector.content_fingerprints)
             self.system_status.monitored_urls = len(self.change_detector.monitoring_schedules)
-            self.system_status.pending_changes = len(self.change_detector.get_recent_changes(24))
+            self.system_status.pending_changes = self.change_detector.count_recent_changes(24)
             
             # Calculate error rate from recent operations
-            recent_ops = [op for op in self.operation_history[-10:]]  # Last 10 operations
+            recent_ops = self._recent_operations(10)
             if recent_ops:
                 error_count = sum(1 for op in recent_ops if not op.success)
                 self.system_status.error_rate = error_count / len(recent_ops)
@@ -592,6 +792,16 @@ class RAGOrchestrator:
             # Close browser
             await self.scraper.close_browser()
             
+            if self.http_session:
+                await self.http_session.close()
+            
+            # Close Azure clients
+            if self.blob_client:
+                await self.blob_client.close()
+            if self.credential:
+                await self.credential.close()
+            await self.scraper.close_azure_clients()
+            
             self.logger.info("RAG Orchestrator shutdown completed")
             
         except Exception as e:
@@ -605,6 +815,8 @@ async def main():
         'azure_storage_account_url': 'https://your-storage-account.blob.core.windows.net',
         'content_container': 'scraped-content',
         'request_delay': 1.0,
+        'scrape_concurrency': 5,
+        'delta_strategy': 'always',
         'incremental_update_hours': 6,
         'full_scan_days': 7
     }
@@ -623,7 +835,7 @@ async def main():
         print(f"Processed URLs: {result.processed_urls}")
         print(f"New content: {result.new_content}")
         print(f"Updated content: {result.updated_content}")
-        print(f"Errors: {len(result.errors)}")
+        print(f"Errors: {result.error_count}")
         print(f"Execution time: {result.execution_time:.2f} seconds")
         
         # Get system status
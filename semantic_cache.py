@@ -0,0 +1,176 @@
+"""
+Semantic Response Cache for ExponentHR RAG System
+Serves a stored search response when a new query embeds almost identically to a cached one.
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _best_match_numpy(vectors: np.ndarray, scales: np.ndarray, expires: np.ndarray,
+                      query: np.ndarray, query_scale: float, now: float) -> Tuple[int, float]:
+    """Index and cosine of the live row of vectors closest to query, or (-1, -1.0) if none is live"""
+    scores = (vectors.astype(np.float32) @ query.astype(np.float32)) * scales * query_scale
+    scores[expires <= now] = -1.0
+    best = int(np.argmax(scores))
+    if scores[best] == -1.0:
+        return -1, -1.0
+    return best, float(scores[best])
+
+
+def _best_match_kernel(vectors, scales, expires, query, query_scale, now):
+    """_best_match_numpy for numba: integer dot products without float copies of the matrix"""
+    best_index = -1
+    best_score = -1.0
+    for i in range(vectors.shape[0]):
+        if expires[i] <= now:
+            continue
+        dot = 0
+        for j in range(vectors.shape[1]):
+            dot += np.int32(vectors[i, j]) * np.int32(query[j])
+        score = dot * scales[i] * query_scale
+        if score > best_score:
+            best_index = i
+            best_score = score
+    return best_index, best_score
+
+
+# Matcher shared by every cache, resolved by the first SemanticCache; the cache
+# is off by default, so numba is only imported once one is actually built
+_best_match: Optional[Callable] = None
+
+
+def _load_best_match() -> Callable:
+    """The numba-compiled matcher when numba is installed, else the numpy one"""
+    global _best_match
+    if _best_match is None:
+        try:
+            from numba import njit
+            _best_match = njit(cache=True, fastmath=True)(_best_match_kernel)
+        except ImportError:
+            _best_match = _best_match_numpy
+    return _best_match
+
+
+class _ScopeEntries:
+    """Cached embeddings and values for one search scope (search type and filters)"""
+    
+    __slots__ = ('vectors', 'scales', 'values', 'expires', 'size', 'next_slot')
+    
+    def __init__(self, dimension: int, capacity: int):
+        self.vectors = np.zeros((capacity, dimension), dtype=np.int8)
+        self.scales = np.zeros(capacity, dtype=np.float32)
+        self.values: list = [None] * capacity
+        self.expires = np.zeros(capacity, dtype=np.float64)
+        self.size = 0
+        self.next_slot = 0
+
+
+class SemanticCache:
+    """In-process nearest-neighbour cache keyed by normalized query embeddings
+    
+    Embeddings are kept as int8 with a per-vector scale, a quarter of the float32
+    size; for unit vectors the quantized cosine stays well within the precision the
+    hit threshold needs.
+    """
+    
+    INITIAL_CAPACITY = 16
+    
+    def __init__(self, dimension: int, threshold: float = 0.97, ttl: float = 900,
+                 max_entries: int = 1024, max_scopes: int = 64):
+        self.dimension = dimension
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_scopes = max_scopes
+        self._scopes: Dict[str, _ScopeEntries] = {}
+        self.hits = 0
+        self.misses = 0
+        
+        # Compile the matcher now rather than on the first lookup; construct
+        # the cache off the event loop, since this can take seconds
+        self._best_match = _load_best_match()
+        self._best_match(np.zeros((1, dimension), dtype=np.int8), np.zeros(1, dtype=np.float32),
+                         np.zeros(1, dtype=np.float64), np.zeros(dimension, dtype=np.int8), 1.0, 0.0)
+    
+    def _quantize(self, embedding: Sequence[float]) -> Optional[Tuple[np.ndarray, float]]:
+        """int8 form and scale of the unit-length embedding, or None for a failed (zero) embedding"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.shape != (self.dimension,):
+            return None
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return None
+        vector = vector / norm
+        scale = float(np.abs(vector).max()) / 127
+        return np.round(vector / scale).astype(np.int8), scale
+    
+    def lookup(self, scope: str, embedding: Sequence[float]) -> Optional[Any]:
+        """Return the value cached for the most similar live query in scope, if it clears the threshold"""
+        entries = self._scopes.get(scope)
+        quantized = self._quantize(embedding)
+        if entries is None or quantized is None or not entries.size:
+            self.misses += 1
+            return None
+        
+        query, query_scale = quantized
+        size = entries.size
+        best, score = self._best_match(entries.vectors[:size], entries.scales[:size], entries.expires[:size],
+                                  query, query_scale, time.monotonic())
+        if best < 0 or score < self.threshold:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return entries.values[best]
+    
+    def store(self, scope: str, embedding: Sequence[float], value: Any) -> None:
+        """Cache value under an embedding; the oldest entry in scope is replaced once it is full"""
+        quantized = self._quantize(embedding)
+        if quantized is None:
+            return
+        
+        entries = self._scopes.get(scope)
+        if entries is None:
+            if len(self._scopes) >= self.max_scopes:
+                # Drop the scope created first
+                del self._scopes[next(iter(self._scopes))]
+            entries = self._scopes[scope] = _ScopeEntries(self.dimension, min(self.INITIAL_CAPACITY, self.max_entries))
+        
+        capacity = len(entries.values)
+        if entries.size == capacity and capacity < self.max_entries:
+            self._grow(entries, min(capacity * 2, self.max_entries))
+            capacity = len(entries.values)
+        
+        if entries.size < capacity:
+            slot = entries.size
+            entries.size += 1
+        else:
+            slot = entries.next_slot
+            entries.next_slot = (slot + 1) % capacity
+        
+        entries.vectors[slot], entries.scales[slot] = quantized
+        entries.values[slot] = value
+        entries.expires[slot] = time.monotonic() + self.ttl
+    
+    def _grow(self, entries: _ScopeEntries, capacity: int) -> None:
+        """Resize a scope's buffers, keeping its current entries"""
+        vectors = np.zeros((capacity, self.dimension), dtype=np.int8)
+        vectors[:entries.size] = entries.vectors[:entries.size]
+        scales = np.zeros(capacity, dtype=np.float32)
+        scales[:entries.size] = entries.scales[:entries.size]
+        expires = np.zeros(capacity, dtype=np.float64)
+        expires[:entries.size] = entries.expires[:entries.size]
+        entries.vectors = vectors
+        entries.scales = scales
+        entries.expires = expires
+        entries.values.extend([None] * (capacity - len(entries.values)))
+    
+    def clear(self) -> None:
+        """Forget every cached entry"""
+        self._scopes.clear()
+    
+    def __len__(self) -> int:
+        return sum(entries.size for entries in self._scopes.values())
@@ -4,19 +4,43 @@ Coordinates content updates between scraping, change detection, and search index
 """
 
 import asyncio
+import hashlib
+import itertools
 import json
 import logging
-from typing import Dict, List, Optional, Tuple, Set
+import re
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Set
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from operator import itemgetter
 
-from exponenthr_scraper import ExponentHRScraper, ScrapingResult
+import aiohttp
+import msgspec
+from playwright.async_api import Page
+
+from exponenthr_scraper import (ExponentHRScraper, ScrapingResult, CONTENT_BLOB_SETTINGS,
+                                content_blob_name, encode_content_blob)
 from content_discovery import ContentDiscoveryService
 from change_detection import ChangeDetectionSystem, ChangeEvent, ContentFingerprint
 from azure_search_integration import AzureSearchIntegration, IndexingResult
-from azure.storage.blob import BlobServiceClient
-from azure.identity import DefaultAzureCredential
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob.aio import BlobServiceClient
+from azure.identity.aio import DefaultAzureCredential
+
+# Help-topic URLs on exponenthr.com, addressed by their #t= fragment
+VALID_URL_PATTERN = re.compile(r'https://[^/]*exponenthr\.com/.*#t=')
+
+# Fixed-name blob in the system-state container holding the latest sync state
+SYNC_STATE_BLOB = 'sync_state/current.msgpack'
+
+# Most recent error messages a sync operation keeps
+MAX_SYNC_ERRORS = 1000
+
+_get_full_url = itemgetter('full_url')
 
 
 @dataclass
@@ -48,6 +72,61 @@ class SyncResult:
     sync_statistics: Dict
 
 
+@dataclass
+class _SyncRun:
+    """Progress of a running sync operation, recorded as a SyncResult when it ends"""
+    operation: SyncOperation
+    total_processed: int = 0
+    newly_indexed: int = 0
+    updated_indexed: int = 0
+    removed_indexed: int = 0
+    urls_failed: int = 0
+    errors: List[str] = field(default_factory=list)
+    result: Optional[SyncResult] = None
+    
+    def add_batch(self, batch_result: Dict) -> None:
+        """Add a processed batch's counts and errors, keeping the last MAX_SYNC_ERRORS errors"""
+        self.total_processed += batch_result['processed']
+        self.newly_indexed += batch_result.get('newly_indexed', 0)
+        self.updated_indexed += batch_result['updated_indexed']
+        self.urls_failed += len(batch_result['errors'])
+        self.errors.extend(batch_result['errors'])
+        del self.errors[:-MAX_SYNC_ERRORS]
+        
+        self.operation.urls_processed = self.total_processed
+        self.operation.urls_updated = self.newly_indexed + self.updated_indexed
+        self.operation.urls_failed = self.urls_failed
+        self.operation.errors = self.errors
+
+
+class AdaptiveBatchSizer:
+    """
+    AIMD controller for the sync batch size: grows additively after a run of
+    unthrottled batches and halves whenever Azure Search throttles indexing.
+    """
+    
+    def __init__(self, initial_size: int, min_size: int = 1, max_size: int = 1000,
+                 increase_step: int = 5, success_threshold: int = 10):
+        self.size = max(min_size, min(initial_size, max_size))
+        self.min_size = min_size
+        self.max_size = max_size
+        self.increase_step = increase_step
+        self.success_threshold = success_threshold
+        self.consecutive_successes = 0
+    
+    def record_success(self) -> None:
+        """Grow the batch after enough consecutive unthrottled batches"""
+        self.consecutive_successes += 1
+        if self.consecutive_successes >= self.success_threshold:
+            self.size = min(self.size + self.increase_step, self.max_size)
+            self.consecutive_successes = 0
+    
+    def record_throttle(self) -> None:
+        """Halve the batch after a throttled batch"""
+        self.size = max(self.size // 2, self.min_size)
+        self.consecutive_successes = 0
+
+
 class SynchronizationService:
     """
     Service for synchronizing content between scraping, change detection, and search indexing.
@@ -70,12 +149,19 @@ class SynchronizationService:
         self.change_detector = ChangeDetectionSystem(config)
         self.search_integration = AzureSearchIntegration(config)
         
-        # Azure clients
+        # Azure clients (async, bound to the loop that runs initialize())
+        self.credential = None
         self.blob_client = None
+        self.content_container_client = None
+        self.state_container_client = None
+        self.upload_semaphore = asyncio.Semaphore(config.get('upload_concurrency', 16))
+        
+        # Shared session for plain-HTTP scraping and conditional checks of topic files
+        self.http_session: Optional[aiohttp.ClientSession] = None
         
         # Synchronization state
         self.active_operations: Dict[str, SyncOperation] = {}
-        self.sync_history: List[SyncResult] = []
+        self.sync_history: deque = deque(maxlen=config.get('sync_history_max', 200))
         self.last_full_sync: Optional[datetime] = None
         self.last_incremental_sync: Optional[datetime] = None
         
@@ -89,12 +175,22 @@ class SynchronizationService:
             'incremental_sync_interval_hours': config.get('incremental_sync_interval_hours', 6)
         }
         
+        # Bumped on every change to operations or history so status snapshots can be reused
+        self.status_version = 0
+        self._status_snapshot: Optional[Tuple[int, Dict]] = None
+        
+        # Batch size adapts to Azure Search backpressure, starting from the configured value
+        self.batch_sizer = AdaptiveBatchSizer(
+            self.sync_config['batch_size'],
+            max_size=config.get('sync_max_batch_size', 1000)
+        )
+        
         # Metrics and monitoring
         self.sync_metrics = {
             'total_syncs': 0,
             'successful_syncs': 0,
             'failed_syncs': 0,
-            'average_sync_time': 0.0,
+            'total_sync_time': 0.0,
             'last_error': None
         }
     
@@ -123,6 +219,11 @@ class SynchronizationService:
             
             # Initialize component services
             await self.scraper.initialize_browser()
+            if self.config.get('http_scraping_enabled', True):
+                self.http_session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=30),
+                    timeout=aiohttp.ClientTimeout(total=30)
+                )
             self.change_detector.initialize_azure_clients()
             self.search_integration.initialize_clients()
             
@@ -138,43 +239,76 @@ class SynchronizationService:
     async def _initialize_azure_clients(self) -> None:
         """Initialize Azure service clients"""
         try:
-            credential = DefaultAzureCredential()
+            self.credential = DefaultAzureCredential()
             
             # Initialize Blob Storage client
             storage_account_url = self.config.get('azure_storage_account_url')
             if storage_account_url:
                 self.blob_client = BlobServiceClient(
                     account_url=storage_account_url,
-                    credential=credential
+                    credential=self.credential
+                )
+                # Containers are fixed by config; reuse their clients for every upload
+                self.content_container_client = self.blob_client.get_container_client(
+                    self.config.get('content_container', 'scraped-content')
                 )
+                self.state_container_client = self.blob_client.get_container_client('system-state')
                 self.logger.info("Azure Blob Storage client initialized")
             
         except Exception as e:
             self.logger.error(f"Failed to initialize Azure clients: {str(e)}")
             raise
     
-    async def perform_full_synchronization(self, view_types: List[str] = None) -> SyncResult:
+    async def reserve_operation_id(self, operation_type: str) -> str:
         """
-        Perform a complete synchronization of all content.
+        Register a pending operation so it is visible before the sync starts.
+        
+        Run it on the background loop (the API uses run_on_background_loop):
+        active_operations and status_version belong to that loop's thread.
         
         Args:
-            view_types: List of view types to synchronize
+            operation_type: 'full_sync' or 'incremental_sync'
             
         Returns:
-            SyncResult with operation details
+            Operation ID to pass to the matching perform_* method
         """
-        operation_id = f"full_sync_{int(time.time())}"
-        start_time = time.time()
+        operation_id = self._new_operation_id(operation_type)
         
-        if view_types is None:
-            view_types = ['personal', 'management']
+        self.active_operations[operation_id] = SyncOperation(
+            operation_id=operation_id,
+            operation_type=operation_type,
+            status='pending',
+            started_at=None,
+            completed_at=None,
+            urls_processed=0,
+            urls_updated=0,
+            urls_failed=0,
+            errors=[],
+            metadata={}
+        )
+        self.status_version += 1
         
-        self.logger.info(f"Starting full synchronization for views: {view_types}")
+        return operation_id
+    
+    @staticmethod
+    def _new_operation_id(operation_type: str) -> str:
+        """Unique operation ID; the random suffix keeps same-millisecond requests apart"""
+        return f"{operation_type}_{int(time.time() * 1000)}_{uuid.uuid4().hex[:8]}"
+    
+    @asynccontextmanager
+    async def _sync_operation(self, operation_id: str, operation_type: str,
+                              metadata: Dict) -> AsyncIterator[_SyncRun]:
+        """
+        Track a sync operation for the duration of the block.
         
-        # Create sync operation
-        sync_operation = SyncOperation(
+        On exit the operation's metrics and SyncResult are recorded and it leaves
+        active_operations. An exception raised in the block fails the sync
+        instead of propagating; the result is left on the run's result attribute.
+        """
+        start_time = time.time()
+        run = _SyncRun(SyncOperation(
             operation_id=operation_id,
-            operation_type='full_sync',
+            operation_type=operation_type,
             status='running',
             started_at=datetime.now().isoformat(),
             completed_at=None,
@@ -182,75 +316,116 @@ class SynchronizationService:
             urls_updated=0,
             urls_failed=0,
             errors=[],
-            metadata={'view_types': view_types}
-        )
+            metadata=metadata
+        ))
         
-        self.active_operations[operation_id] = sync_operation
-        
-        total_processed = 0
-        newly_indexed = 0
-        updated_indexed = 0
-        removed_indexed = 0
-        errors = []
+        self.active_operations[operation_id] = run.operation
+        self.status_version += 1
         
+        success = False
         try:
-            # Step 1: Discover all URLs
+            yield run
+            success = not run.errors
+        except Exception as e:
+            error_msg = f"{operation_type.replace('_', ' ').capitalize()} failed: {str(e)}"
+            run.errors.append(error_msg)
+            self.logger.error(error_msg)
+        finally:
+            execution_time = time.time() - start_time
+            
+            # Update operation status
+            run.operation.status = 'completed' if success else 'failed'
+            run.operation.completed_at = datetime.now().isoformat()
+            run.operation.errors = run.errors
+            
+            # Update metrics
+            self._update_sync_metrics(success, execution_time)
+            
+            run.result = SyncResult(
+                operation_id=operation_id,
+                success=success,
+                total_processed=run.total_processed,
+                newly_indexed=run.newly_indexed,
+                updated_indexed=run.updated_indexed,
+                removed_indexed=run.removed_indexed,
+                errors=run.errors,
+                execution_time=execution_time,
+                sync_statistics=self.get_sync_statistics()
+            )
+            
+            self.sync_history.append(run.result)
+            
+            # Clean up operation
+            self.active_operations.pop(operation_id, None)
+            self.status_version += 1
+    
+    async def perform_full_synchronization(self, view_types: List[str] = None,
+                                           operation_id: Optional[str] = None) -> SyncResult:
+        """
+        Perform a complete synchronization of all content.
+        
+        Args:
+            view_types: List of view types to synchronize
+            operation_id: ID from reserve_operation_id, if already reserved
+            
+        Returns:
+            SyncResult with operation details
+        """
+        operation_id = operation_id or self._new_operation_id('full_sync')
+        
+        if view_types is None:
+            view_types = ['personal', 'management']
+        
+        self.logger.info(f"Starting full synchronization for views: {view_types}")
+        
+        async with self._sync_operation(operation_id, 'full_sync', {'view_types': view_types}) as run:
+            # Step 1: Discover all URLs, every view concurrently on its own page
             all_discovered_urls = set()
             
+            self.logger.info(f"Discovering URLs for views: {view_types}")
+            nav_structures = await self.discovery_service.discover_all(self.scraper.context, view_types)
+            
             for view_type in view_types:
                 try:
-                    self.logger.info(f"Discovering URLs for {view_type} view")
-                    
-                    # Discover navigation structure
-                    nav_structure = await self.discovery_service.discover_navigation_structure(
-                        self.scraper.page, view_type
-                    )
+                    nav_structure = nav_structures[view_type]
+                    if isinstance(nav_structure, Exception):
+                        raise nav_structure
                     
                     # Extract URLs
-                    urls = [link['full_url'] for link in nav_structure.get('all_links', [])]
-                    all_discovered_urls.update(urls)
+                    links = nav_structure.get('all_links', ())
+                    all_discovered_urls.update(map(_get_full_url, links))
                     
-                    self.logger.info(f"Discovered {len(urls)} URLs for {view_type} view")
+                    self.logger.info(f"Discovered {len(links)} URLs for {view_type} view")
                     
                 except Exception as e:
                     error_msg = f"Error discovering URLs for {view_type}: {str(e)}"
-                    errors.append(error_msg)
+                    run.errors.append(error_msg)
                     self.logger.error(error_msg)
             
             # Step 2: Validate discovered URLs
             self.logger.info(f"Validating {len(all_discovered_urls)} discovered URLs")
             
-            valid_urls = []
-            for url in all_discovered_urls:
-                try:
-                    # Quick validation - could be enhanced
-                    if self._is_valid_url_format(url):
-                        valid_urls.append(url)
-                except Exception as e:
-                    self.logger.warning(f"URL validation failed for {url}: {str(e)}")
+            valid_url_set = set(filter(VALID_URL_PATTERN.match, all_discovered_urls))
+            valid_urls = list(valid_url_set)
             
             self.logger.info(f"Validated {len(valid_urls)} URLs for processing")
             
             # Step 3: Process URLs in batches
-            batch_size = self.sync_config['batch_size']
+            position = 0
+            batch_number = 0
             
-            for i in range(0, len(valid_urls), batch_size):
-                batch_urls = valid_urls[i:i + batch_size]
+            while position < len(valid_urls):
+                batch_urls = valid_urls[position:position + self.batch_sizer.size]
+                position += len(batch_urls)
+                batch_number += 1
                 
-                self.logger.info(f"Processing batch {i//batch_size + 1}: {len(batch_urls)} URLs")
+                self.logger.info(f"Processing batch {batch_number}: {len(batch_urls)} URLs")
                 
                 batch_result = await self._process_url_batch(batch_urls, operation_id)
+                await self._adjust_batch_size(batch_result)
                 
-                total_processed += batch_result['processed']
-                newly_indexed += batch_result['newly_indexed']
-                updated_indexed += batch_result['updated_indexed']
-                errors.extend(batch_result['errors'])
-                
-                # Update operation status
-                sync_operation.urls_processed = total_processed
-                sync_operation.urls_updated = newly_indexed + updated_indexed
-                sync_operation.urls_failed = len(errors)
-                sync_operation.errors = errors
+                run.add_batch(batch_result)
+                self.status_version += 1
                 
                 # Add delay between batches
                 await asyncio.sleep(1)
@@ -259,121 +434,39 @@ class SynchronizationService:
             self.logger.info("Cleaning up obsolete documents from search index")
             
             try:
-                removed_count = await self._cleanup_obsolete_documents(valid_urls)
-                removed_indexed = removed_count
+                run.removed_indexed = await self._cleanup_obsolete_documents(valid_url_set)
                 
-                self.logger.info(f"Removed {removed_count} obsolete documents from index")
+                self.logger.info(f"Removed {run.removed_indexed} obsolete documents from index")
                 
             except Exception as e:
                 error_msg = f"Error cleaning up obsolete documents: {str(e)}"
-                errors.append(error_msg)
+                run.errors.append(error_msg)
                 self.logger.error(error_msg)
             
-            # Complete operation
-            execution_time = time.time() - start_time
-            success = len(errors) == 0
-            
-            sync_operation.status = 'completed' if success else 'failed'
-            sync_operation.completed_at = datetime.now().isoformat()
-            
-            # Update metrics
-            self._update_sync_metrics(success, execution_time)
-            
             # Record last full sync time
             self.last_full_sync = datetime.now()
             
-            # Create result
-            result = SyncResult(
-                operation_id=operation_id,
-                success=success,
-                total_processed=total_processed,
-                newly_indexed=newly_indexed,
-                updated_indexed=updated_indexed,
-                removed_indexed=removed_indexed,
-                errors=errors,
-                execution_time=execution_time,
-                sync_statistics=self._get_sync_statistics()
-            )
-            
-            self.sync_history.append(result)
-            
-            # Clean up operation
-            del self.active_operations[operation_id]
-            
-            self.logger.info(f"Full synchronization completed: {total_processed} processed, "
-                           f"{newly_indexed} new, {updated_indexed} updated, "
-                           f"{removed_indexed} removed, {len(errors)} errors")
-            
-            return result
-            
-        except Exception as e:
-            execution_time = time.time() - start_time
-            error_msg = f"Full synchronization failed: {str(e)}"
-            errors.append(error_msg)
-            self.logger.error(error_msg)
-            
-            # Update operation status
-            sync_operation.status = 'failed'
-            sync_operation.completed_at = datetime.now().isoformat()
-            sync_operation.errors = errors
-            
-            # Update metrics
-            self._update_sync_metrics(False, execution_time)
-            
-            result = SyncResult(
-                operation_id=operation_id,
-                success=False,
-                total_processed=total_processed,
-                newly_indexed=newly_indexed,
-                updated_indexed=updated_indexed,
-                removed_indexed=removed_indexed,
-                errors=errors,
-                execution_time=execution_time,
-                sync_statistics=self._get_sync_statistics()
-            )
-            
-            self.sync_history.append(result)
-            
-            # Clean up operation
-            del self.active_operations[operation_id]
-            
-            return result
+            self.logger.info(f"Full synchronization completed: {run.total_processed} processed, "
+                           f"{run.newly_indexed} new, {run.updated_indexed} updated, "
+                           f"{run.removed_indexed} removed, {len(run.errors)} errors")
+        
+        return run.result
     
-    async def perform_incremental_synchronization(self) -> SyncResult:
+    async def perform_incremental_synchronization(self, operation_id: Optional[str] = None) -> SyncResult:
         """
         Perform incremental synchronization based on change detection.
         
+        Args:
+            operation_id: ID from reserve_operation_id, if already reserved
+            
         Returns:
             SyncResult with operation details
         """
-        operation_id = f"incremental_sync_{int(time.time())}"
-        start_time = time.time()
+        operation_id = operation_id or self._new_operation_id('incremental_sync')
         
         self.logger.info("Starting incremental synchronization")
         
-        # Create sync operation
-        sync_operation = SyncOperation(
-            operation_id=operation_id,
-            operation_type='incremental_sync',
-            status='running',
-            started_at=datetime.now().isoformat(),
-            completed_at=None,
-            urls_processed=0,
-            urls_updated=0,
-            urls_failed=0,
-            errors=[],
-            metadata={}
-        )
-        
-        self.active_operations[operation_id] = sync_operation
-        
-        total_processed = 0
-        newly_indexed = 0
-        updated_indexed = 0
-        removed_indexed = 0
-        errors = []
-        
-        try:
+        async with self._sync_operation(operation_id, 'incremental_sync', {}) as run:
             # Get URLs due for checking
             urls_to_check = self.change_detector.get_urls_due_for_check()
             
@@ -381,249 +474,254 @@ class SynchronizationService:
             
             if not urls_to_check:
                 self.logger.info("No URLs due for checking")
-                execution_time = time.time() - start_time
-                
-                result = SyncResult(
-                    operation_id=operation_id,
-                    success=True,
-                    total_processed=0,
-                    newly_indexed=0,
-                    updated_indexed=0,
-                    removed_indexed=0,
-                    errors=[],
-                    execution_time=execution_time,
-                    sync_statistics=self._get_sync_statistics()
-                )
-                
-                self.sync_history.append(result)
-                del self.active_operations[operation_id]
-                
-                return result
-            
-            # Process URLs in batches
-            batch_size = self.sync_config['batch_size']
-            
-            for i in range(0, len(urls_to_check), batch_size):
-                batch_urls = urls_to_check[i:i + batch_size]
-                
-                self.logger.info(f"Processing incremental batch {i//batch_size + 1}: {len(batch_urls)} URLs")
-                
-                batch_result = await self._process_incremental_batch(batch_urls, operation_id)
+            else:
+                # Process URLs in batches
+                position = 0
+                batch_number = 0
                 
-                total_processed += batch_result['processed']
-                updated_indexed += batch_result['updated_indexed']
-                errors.extend(batch_result['errors'])
+                while position < len(urls_to_check):
+                    batch_urls = urls_to_check[position:position + self.batch_sizer.size]
+                    position += len(batch_urls)
+                    batch_number += 1
+                    
+                    self.logger.info(f"Processing incremental batch {batch_number}: {len(batch_urls)} URLs")
+                    
+                    batch_result = await self._process_incremental_batch(batch_urls, operation_id)
+                    await self._adjust_batch_size(batch_result)
+                    
+                    run.add_batch(batch_result)
+                    self.status_version += 1
+                    
+                    # Add delay between batches
+                    await asyncio.sleep(0.5)
                 
-                # Update operation status
-                sync_operation.urls_processed = total_processed
-                sync_operation.urls_updated = updated_indexed
-                sync_operation.urls_failed = len(errors)
-                sync_operation.errors = errors
+                # Record last incremental sync time
+                self.last_incremental_sync = datetime.now()
                 
-                # Add delay between batches
-                await asyncio.sleep(0.5)
-            
-            # Complete operation
-            execution_time = time.time() - start_time
-            success = len(errors) == 0
-            
-            sync_operation.status = 'completed' if success else 'failed'
-            sync_operation.completed_at = datetime.now().isoformat()
-            
-            # Update metrics
-            self._update_sync_metrics(success, execution_time)
-            
-            # Record last incremental sync time
-            self.last_incremental_sync = datetime.now()
-            
-            # Create result
-            result = SyncResult(
-                operation_id=operation_id,
-                success=success,
-                total_processed=total_processed,
-                newly_indexed=newly_indexed,
-                updated_indexed=updated_indexed,
-                removed_indexed=removed_indexed,
-                errors=errors,
-                execution_time=execution_time,
-                sync_statistics=self._get_sync_statistics()
-            )
-            
-            self.sync_history.append(result)
-            
-            # Clean up operation
-            del self.active_operations[operation_id]
-            
-            self.logger.info(f"Incremental synchronization completed: {total_processed} processed, "
-                           f"{updated_indexed} updated, {len(errors)} errors")
-            
-            return result
-            
-        except Exception as e:
-            execution_time = time.time() - start_time
-            error_msg = f"Incremental synchronization failed: {str(e)}"
-            errors.append(error_msg)
-            self.logger.error(error_msg)
-            
-            # Update operation status
-            sync_operation.status = 'failed'
-            sync_operation.completed_at = datetime.now().isoformat()
-            sync_operation.errors = errors
-            
-            # Update metrics
-            self._update_sync_metrics(False, execution_time)
-            
-            result = SyncResult(
-                operation_id=operation_id,
-                success=False,
-                total_processed=total_processed,
-                newly_indexed=newly_indexed,
-                updated_indexed=updated_indexed,
-                removed_indexed=removed_indexed,
-                errors=errors,
-                execution_time=execution_time,
-                sync_statistics=self._get_sync_statistics()
-            )
-            
-            self.sync_history.append(result)
-            
-            # Clean up operation
-            del self.active_operations[operation_id]
-            
-            return result
+                self.logger.info(f"Incremental synchronization completed: {run.total_processed} processed, "
+                               f"{run.updated_indexed} updated, {len(run.errors)} errors")
+        
+        return run.result
+    
+    async def _adjust_batch_size(self, batch_result: Dict) -> None:
+        """Feed a batch outcome to the batch sizer, backing off when throttled"""
+        if batch_result['throttled']:
+            self.batch_sizer.record_throttle()
+            retry_after = self.search_integration.last_retry_after or self.sync_config['retry_delay']
+            self.logger.warning(f"Azure Search throttled {batch_result['throttled']} requests; "
+                                f"batch size now {self.batch_sizer.size}, backing off {retry_after}s")
+            await asyncio.sleep(retry_after)
+        else:
+            self.batch_sizer.record_success()
+    
+    async def _process_urls_concurrently(self, urls: List[str],
+                                         process_url: Callable[[str, Page], Awaitable]) -> List:
+        """
+        Run process_url(url, page) for every URL on the scraper's shared page
+        pool, sized by 'scrape_concurrency' and pausing 'request_delay' seconds
+        between each page's requests, as the orchestrator does.
+        
+        Returns:
+            The result or raised exception of each call, in URL order
+        """
+        results = await self.scraper.process_urls_concurrently(
+            urls, process_url, self.config.get('scrape_concurrency', 5), self.config.get('request_delay', 1.0)
+        )
+        return [result for _, result in results]
     
     async def _process_url_batch(self, urls: List[str], operation_id: str) -> Dict:
         """Process a batch of URLs for full synchronization"""
+        throttled_before = self.search_integration.throttled_requests
         processed = 0
         newly_indexed = 0
         updated_indexed = 0
         errors = []
+        scraped = []
         
-        for url in urls:
-            try:
-                # Scrape the document
-                scraping_result = await self.scraper.scrape_document(url)
-                processed += 1
-                
-                if scraping_result.success:
-                    # Create content fingerprint
-                    fingerprint = self.change_detector.create_content_fingerprint(
-                        url,
-                        scraping_result.content,
-                        asdict(scraping_result.metadata)
-                    )
-                    
-                    # Check for changes
-                    change_event = self.change_detector.detect_changes(url, fingerprint)
-                    
-                    # Prepare document for indexing
-                    document_data = {
-                        'url': url,
-                        'title': scraping_result.metadata.title,
-                        'content': scraping_result.content,
-                        'metadata': asdict(scraping_result.metadata)
-                    }
-                    
-                    # Index the document
-                    index_success = await self.search_integration.index_document(document_data)
-                    
-                    if index_success:
-                        if change_event and change_event.change_type == 'new':
-                            newly_indexed += 1
-                        else:
-                            updated_indexed += 1
-                        
-                        # Setup monitoring schedule
-                        content_type = scraping_result.metadata.content_type
-                        self.change_detector.setup_monitoring_schedule(
-                            url, content_type, 'medium'
-                        )
-                        
-                        # Store content in blob storage
-                        await self._store_content_in_blob(scraping_result)
-                    else:
-                        errors.append(f"Failed to index document: {url}")
-                else:
-                    errors.append(f"Failed to scrape document: {url} - {scraping_result.error_message}")
-                
-                # Add delay between requests
-                await asyncio.sleep(self.config.get('request_delay', 1.0))
-                
-            except Exception as e:
-                error_msg = f"Error processing {url}: {str(e)}"
+        # Only scrape URLs that may have changed since their last fingerprint
+        needs_rescrape = await asyncio.gather(*(self._needs_rescrape(url) for url in urls))
+        processed += len(urls) - sum(needs_rescrape)
+        urls = [url for url, rescrape in zip(urls, needs_rescrape) if rescrape]
+        
+        results = await self._process_urls_concurrently(urls, self._sync_url)
+        
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                error_msg = f"Error processing {url}: {str(result)}"
                 errors.append(error_msg)
                 self.logger.error(error_msg)
+                continue
+            
+            processed += 1
+            scraping_result, document_data, change_event = result
+            if not scraping_result.success:
+                errors.append(f"Failed to scrape document: {url} - {scraping_result.error_message}")
+            else:
+                scraped.append((url, scraping_result, document_data, change_event))
+        
+        # Index every scraped document in one batched request
+        indexed = await self.search_integration.index_documents_batch(
+            [document_data for _, _, document_data, _ in scraped]
+        )
+        stored_at = datetime.now().isoformat()
+        uploads = []
+        
+        for (url, scraping_result, document_data, change_event), success in zip(scraped, indexed):
+            if not success:
+                # Without this the next sync's HEAD check would skip the page for good
+                self.change_detector.forget_content_state(url)
+                errors.append(f"Failed to index document: {url}")
+                continue
+            
+            if change_event and change_event.change_type == 'new':
+                newly_indexed += 1
+            else:
+                updated_indexed += 1
+            
+            # Setup monitoring schedule
+            content_type = scraping_result.metadata.content_type
+            self.change_detector.setup_monitoring_schedule(
+                url, content_type, 'medium'
+            )
+            
+            # Store content in blob storage
+            uploads.append(self._store_content_in_blob(scraping_result, document_data['metadata'], stored_at))
+        
+        await asyncio.gather(*uploads)
         
         return {
             'processed': processed,
             'newly_indexed': newly_indexed,
             'updated_indexed': updated_indexed,
-            'errors': errors
+            'errors': errors,
+            'throttled': self.search_integration.throttled_requests - throttled_before
+        }
+    
+    async def _sync_url(self, url: str, page: Page) -> Tuple[ScrapingResult, Optional[Dict], Optional[ChangeEvent]]:
+        """
+        Scrape and fingerprint one URL for full synchronization.
+        
+        Returns:
+            The scraping result, the document prepared for indexing (None if the
+            scrape failed) and the detected change, if any
+        """
+        # Scrape the document
+        scraping_result = await self._scrape(url, page)
+        
+        if not scraping_result.success:
+            return scraping_result, None, None
+        
+        self.change_detector.record_http_validators(url, scraping_result.http_validators)
+        
+        # Metadata dict shared by the fingerprint, the index document and the stored blob
+        metadata = scraping_result.metadata.as_dict()
+        
+        # Create content fingerprint
+        fingerprint = self.change_detector.create_content_fingerprint(
+            url,
+            scraping_result.content,
+            metadata
+        )
+        
+        # Prepare document for indexing
+        document_data = {
+            'url': url,
+            'title': scraping_result.metadata.title,
+            'content': scraping_result.content,
+            'metadata': metadata
         }
+        
+        # Check for changes
+        return scraping_result, document_data, self.change_detector.detect_changes(url, fingerprint)
+    
+    async def _needs_rescrape(self, url: str) -> bool:
+        """
+        Whether a URL must be scraped again: False only when it is fingerprinted
+        and a conditional HEAD shows its topic file unchanged since then
+        """
+        if self.http_session is None:
+            return True
+        
+        validators = self.change_detector.http_validators.get(url)
+        return (validators is None
+                or url not in self.change_detector.content_fingerprints
+                or not await self.scraper.is_unchanged_http(url, self.http_session, validators))
+    
+    async def _scrape(self, url: str, page: Page) -> ScrapingResult:
+        """Scrape a URL over plain HTTP when possible, rendering it in the browser otherwise"""
+        if self.http_session is not None:
+            scraping_result = await self.scraper.scrape_document_http(url, self.http_session)
+            if scraping_result is not None:
+                return scraping_result
+        
+        return await self.scraper.scrape_document(url, page)
     
     async def _process_incremental_batch(self, urls: List[str], operation_id: str) -> Dict:
         """Process a batch of URLs for incremental synchronization"""
+        throttled_before = self.search_integration.throttled_requests
         processed = 0
         updated_indexed = 0
         errors = []
+        changed = []
         
-        for url in urls:
-            try:
-                # Scrape the document
-                scraping_result = await self.scraper.scrape_document(url)
-                processed += 1
-                
-                if scraping_result.success:
-                    # Create content fingerprint
-                    fingerprint = self.change_detector.create_content_fingerprint(
-                        url,
-                        scraping_result.content,
-                        asdict(scraping_result.metadata)
-                    )
-                    
-                    # Check for changes
-                    change_event = self.change_detector.detect_changes(url, fingerprint)
-                    
-                    if change_event:
-                        self.logger.info(f"Change detected in {url}: {change_event.change_type}")
-                        
-                        # Prepare document for indexing
-                        document_data = {
-                            'url': url,
-                            'title': scraping_result.metadata.title,
-                            'content': scraping_result.content,
-                            'metadata': asdict(scraping_result.metadata)
-                        }
-                        
-                        # Update the document in search index
-                        index_success = await self.search_integration.index_document(document_data)
-                        
-                        if index_success:
-                            updated_indexed += 1
-                            
-                            # Store updated content in blob storage
-                            await self._store_content_in_blob(scraping_result)
-                        else:
-                            errors.append(f"Failed to update index for: {url}")
-                
-                # Update monitoring schedule
-                self.change_detector.update_monitoring_schedule(url)
-                
-                # Add delay between requests
-                await asyncio.sleep(self.config.get('request_delay', 1.0))
-                
-            except Exception as e:
-                error_msg = f"Error processing {url}: {str(e)}"
+        results = await self._process_urls_concurrently(urls, self._sync_changed_url)
+        
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                error_msg = f"Error processing {url}: {str(result)}"
                 errors.append(error_msg)
                 self.logger.error(error_msg)
+                continue
+            
+            processed += 1
+            scraping_result, document_data, change_event = result
+            if change_event:
+                self.logger.info(f"Change detected in {url}: {change_event.change_type}")
+                changed.append((url, scraping_result, document_data))
+        
+        # Update every changed document in the search index in one batched request
+        indexed = await self.search_integration.index_documents_batch(
+            [document_data for _, _, document_data in changed]
+        )
+        stored_at = datetime.now().isoformat()
+        uploads = []
+        
+        for (url, scraping_result, document_data), success in zip(changed, indexed):
+            if not success:
+                # The new fingerprint would otherwise hide the change from the next check
+                self.change_detector.forget_content_state(url)
+                errors.append(f"Failed to update index for: {url}")
+                continue
+            
+            updated_indexed += 1
+            
+            # Store updated content in blob storage
+            uploads.append(self._store_content_in_blob(scraping_result, document_data['metadata'], stored_at))
+        
+        await asyncio.gather(*uploads)
         
         return {
             'processed': processed,
             'updated_indexed': updated_indexed,
-            'errors': errors
+            'errors': errors,
+            'throttled': self.search_integration.throttled_requests - throttled_before
         }
     
-    async def _cleanup_obsolete_documents(self, current_urls: List[str]) -> int:
+    async def _sync_changed_url(self, url: str, page: Page) -> Tuple[ScrapingResult, Optional[Dict], Optional[ChangeEvent]]:
+        """
+        Re-scrape a URL due for checking and detect whether it changed.
+        
+        Returns:
+            The same (scraping result, document, change) triple as _sync_url
+        """
+        result = await self._sync_url(url, page)
+        
+        # Update monitoring schedule
+        self.change_detector.update_monitoring_schedule(url)
+        
+        return result
+    
+    async def _cleanup_obsolete_documents(self, current_urls: Set[str]) -> int:
         """Remove obsolete documents from the search index"""
         try:
             # Get all document IDs currently in the index
@@ -631,35 +729,32 @@ class SynchronizationService:
             # query the search index to get all document IDs
             
             # For now, we'll use the fingerprints as a proxy
-            stored_urls = set(self.change_detector.content_fingerprints.keys())
-            current_url_set = set(current_urls)
-            
             # Find URLs that are no longer valid
-            obsolete_urls = stored_urls - current_url_set
+            obsolete_urls = list(self.change_detector.content_fingerprints.keys() - current_urls)
+            if not obsolete_urls:
+                return 0
+            
+            # Document IDs recorded at fingerprint time (or generated the same way as in
+            # indexing for fingerprints saved without one), deleted in one batch
+            fingerprints = self.change_detector.content_fingerprints
+            doc_ids = [
+                fingerprints[url].doc_id or hashlib.sha256(url.encode('utf-8')).hexdigest()
+                for url in obsolete_urls
+            ]
+            deleted = await self.search_integration.delete_documents_batch(doc_ids)
             
             removed_count = 0
             
-            for url in obsolete_urls:
-                try:
-                    # Generate document ID (same method as used in indexing)
-                    import hashlib
-                    doc_id = hashlib.sha256(url.encode('utf-8')).hexdigest()
-                    
-                    # Delete from search index
-                    delete_success = await self.search_integration.delete_document(doc_id)
-                    
-                    if delete_success:
-                        removed_count += 1
-                        
-                        # Remove from change detector
-                        if url in self.change_detector.content_fingerprints:
-                            del self.change_detector.content_fingerprints[url]
-                        
-                        if url in self.change_detector.monitoring_schedules:
-                            del self.change_detector.monitoring_schedules[url]
-                    
-                except Exception as e:
-                    self.logger.warning(f"Failed to remove obsolete document {url}: {str(e)}")
+            for url, delete_success in zip(obsolete_urls, deleted):
+                if not delete_success:
+                    self.logger.warning(f"Failed to remove obsolete document {url}")
+                    continue
+                
+                removed_count += 1
+                
+                # Remove from change detector
+                self.change_detector.content_fingerprints.pop(url, None)
+                self.change_detector.monitoring_schedules.pop(url, None)
             
             return removed_count
             
@@ -667,36 +762,43 @@ class SynchronizationService:
             self.logger.error(f"Error cleaning up obsolete documents: {str(e)}")
             return 0
     
-    async def _store_content_in_blob(self, scraping_result: ScrapingResult) -> None:
-        """Store scraped content in Azure Blob Storage"""
+    async def _store_content_in_blob(self, scraping_result: ScrapingResult, metadata: Dict,
+                                     stored_at: str) -> None:
+        """
+        Store scraped content in Azure Blob Storage.
+        
+        Args:
+            scraping_result: Successful scraping result
+            metadata: The result's metadata as a dict, already built for indexing
+            stored_at: ISO timestamp of the batch the content was stored in
+        """
         try:
             if not self.blob_client or not scraping_result.success:
                 return
             
             # Prepare content data
             content_data = {
-                'metadata': asdict(scraping_result.metadata),
+                'metadata': metadata,
                 'content': scraping_result.content,
                 'scraping_result': {
                     'success': scraping_result.success,
                     'processing_time': scraping_result.processing_time,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': stored_at
                 }
             }
             
-            # Create blob name based on URL hash
-            url_hash = scraping_result.metadata.content_hash[:16]
-            blob_name = f"content/{scraping_result.metadata.source_view}/{url_hash}.json"
-            
-            # Upload to blob storage
-            container_name = self.config.get('content_container', 'scraped-content')
-            blob_client = self.blob_client.get_blob_client(
-                container=container_name,
-                blob=blob_name
-            )
-            
-            content_json = json.dumps(content_data, indent=2)
-            blob_client.upload_blob(content_json, overwrite=True)
+            blob_name = content_blob_name(scraping_result.metadata)
+            
+            # Upload to blob storage in the shared gzip-encoded JSON form
+            payload = encode_content_blob(content_data)
+            async with self.upload_semaphore:
+                await self.content_container_client.upload_blob(
+                    blob_name,
+                    payload,
+                    overwrite=True,
+                    content_settings=CONTENT_BLOB_SETTINGS,
+                    max_concurrency=self.config.get('blob_upload_concurrency', 4)
+                )
             
             self.logger.debug(f"Stored content for {scraping_result.metadata.url} in {blob_name}")
             
@@ -705,50 +807,35 @@ class SynchronizationService:
     
     def _is_valid_url_format(self, url: str) -> bool:
         """Validate URL format"""
-        try:
-            return (
-                url.startswith('https://') and
-                'exponenthr.com' in url and
-                '#t=' in url
-            )
-        except:
-            return False
+        return isinstance(url, str) and VALID_URL_PATTERN.match(url) is not None
     
     def _update_sync_metrics(self, success: bool, execution_time: float) -> None:
         """Update synchronization metrics"""
-        try:
-            self.sync_metrics['total_syncs'] += 1
-            
-            if success:
-                self.sync_metrics['successful_syncs'] += 1
-            else:
-                self.sync_metrics['failed_syncs'] += 1
-            
-            # Update average execution time
-            total_time = self.sync_metrics['average_sync_time'] * (self.sync_metrics['total_syncs'] - 1)
-            self.sync_metrics['average_sync_time'] = (total_time + execution_time) / self.sync_metrics['total_syncs']
-            
-        except Exception as e:
-            self.logger.error(f"Error updating sync metrics: {str(e)}")
+        self.sync_metrics['total_syncs'] += 1
+        
+        if success:
+            self.sync_metrics['successful_syncs'] += 1
+        else:
+            self.sync_metrics['failed_syncs'] += 1
+        
+        # Averaged on read, from the running total
+        self.sync_metrics['total_sync_time'] += execution_time
     
-    def _get_sync_statistics(self) -> Dict:
+    def get_sync_statistics(self) -> Dict:
         """Get synchronization statistics"""
-        try:
-            return {
-                'total_syncs': self.sync_metrics['total_syncs'],
-                'successful_syncs': self.sync_metrics['successful_syncs'],
-                'failed_syncs': self.sync_metrics['failed_syncs'],
-                'success_rate': (self.sync_metrics['successful_syncs'] / max(self.sync_metrics['total_syncs'], 1)) * 100,
-                'average_sync_time': self.sync_metrics['average_sync_time'],
-                'last_full_sync': self.last_full_sync.isoformat() if self.last_full_sync else None,
-                'last_incremental_sync': self.last_incremental_sync.isoformat() if self.last_incremental_sync else None,
-                'active_operations': len(self.active_operations),
-                'total_documents': len(self.change_detector.content_fingerprints),
-                'monitored_urls': len(self.change_detector.monitoring_schedules)
-            }
-        except Exception as e:
-            self.logger.error(f"Error getting sync statistics: {str(e)}")
-            return {}
+        return {
+            'total_syncs': self.sync_metrics['total_syncs'],
+            'successful_syncs': self.sync_metrics['successful_syncs'],
+            'failed_syncs': self.sync_metrics['failed_syncs'],
+            'success_rate': (self.sync_metrics['successful_syncs'] / max(self.sync_metrics['total_syncs'], 1)) * 100,
+            'average_sync_time': self.sync_metrics['total_sync_time'] / max(self.sync_metrics['total_syncs'], 1),
+            'last_full_sync': self.last_full_sync.isoformat() if self.last_full_sync else None,
+            'last_incremental_sync': self.last_incremental_sync.isoformat() if self.last_incremental_sync else None,
+            'active_operations': len(self.active_operations),
+            'total_documents': len(self.change_detector.content_fingerprints),
+            'monitored_urls': len(self.change_detector.monitoring_schedules),
+            'current_batch_size': self.batch_sizer.size
+        }
     
     async def _save_sync_state(self) -> None:
         """Save synchronization state to Azure"""
@@ -761,21 +848,15 @@ class SynchronizationService:
                 'sync_metrics': self.sync_metrics,
                 'last_full_sync': self.last_full_sync.isoformat() if self.last_full_sync else None,
                 'last_incremental_sync': self.last_incremental_sync.isoformat() if self.last_incremental_sync else None,
-                'sync_history': [asdict(result) for result in self.sync_history[-50:]],  # Keep last 50
-                'active_operations': {op_id: asdict(op) for op_id, op in self.active_operations.items()},
+                'sync_history': self.get_sync_history(50),  # Keep last 50
+                'active_operations': dict(self.active_operations),
                 'saved_at': datetime.now().isoformat()
             }
             
-            # Upload to blob storage
-            state_json = json.dumps(state_data, indent=2)
-            blob_name = f"sync_state_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            
-            blob_client = self.blob_client.get_blob_client(
-                container='system-state',
-                blob=blob_name
-            )
+            # Overwrite the state blob as MessagePack (dataclasses encode natively)
+            payload = msgspec.msgpack.encode(state_data)
             
-            blob_client.upload_blob(state_json, overwrite=True)
+            await self.state_container_client.upload_blob(SYNC_STATE_BLOB, payload, overwrite=True)
             self.logger.info("Synchronization state saved to Azure")
             
         except Exception as e:
@@ -787,28 +868,37 @@ class SynchronizationService:
             if not self.blob_client:
                 return
             
-            # Get the latest state file
-            container_client = self.blob_client.get_container_client('system-state')
-            blobs = list(container_client.list_blobs(name_starts_with='sync_state_'))
-            
-            if not blobs:
-                self.logger.info("No previous sync state found")
-                return
-            
-            # Get the most recent blob
-            latest_blob = max(blobs, key=lambda b: b.last_modified)
-            
-            # Download and parse state data
-            blob_client = self.blob_client.get_blob_client(
-                container='system-state',
-                blob=latest_blob.name
-            )
-            
-            state_json = blob_client.download_blob().readall().decode('utf-8')
-            state_data = json.loads(state_json)
+            try:
+                downloader = await self.state_container_client.download_blob(SYNC_STATE_BLOB)
+                state_data = msgspec.msgpack.decode(await downloader.readall())
+                blob_name = SYNC_STATE_BLOB
+            except ResourceNotFoundError:
+                # Fall back to the newest timestamped snapshot written before
+                # state moved to a fixed-name blob. Names embed the timestamp
+                # and are listed in lexicographic order, so the last is newest.
+                blob_name = None
+                async for name in self.state_container_client.list_blob_names(name_starts_with='sync_state_'):
+                    blob_name = name
+                
+                if blob_name is None:
+                    self.logger.info("No previous sync state found")
+                    return
+                
+                downloader = await self.state_container_client.download_blob(blob_name)
+                state_bytes = await downloader.readall()
+                if blob_name.endswith('.msgpack'):
+                    state_data = msgspec.msgpack.decode(state_bytes)
+                else:
+                    state_data = json.loads(state_bytes)
             
             # Restore state
-            self.sync_metrics = state_data.get('sync_metrics', self.sync_metrics)
+            sync_metrics = state_data.get('sync_metrics', {})
+            # State saved before the running total was kept only has the average
+            sync_metrics.setdefault(
+                'total_sync_time',
+                sync_metrics.pop('average_sync_time', 0.0) * sync_metrics.get('total_syncs', 0)
+            )
+            self.sync_metrics.update(sync_metrics)
             
             if state_data.get('last_full_sync'):
                 self.last_full_sync = datetime.fromisoformat(state_data['last_full_sync'])
@@ -817,16 +907,55 @@ class SynchronizationService:
                 self.last_incremental_sync = datetime.fromisoformat(state_data['last_incremental_sync'])
             
             # Restore sync history
-            self.sync_history = [
-                SyncResult(**result_data)
-                for result_data in state_data.get('sync_history', [])
-            ]
+            self.sync_history = deque(
+                (SyncResult(**result_data) for result_data in state_data.get('sync_history', [])),
+                maxlen=self.sync_history.maxlen
+            )
             
-            self.logger.info(f"Loaded sync state from {latest_blob.name}")
+            self.logger.info(f"Loaded sync state from {blob_name}")
             
         except Exception as e:
             self.logger.warning(f"Could not load sync state: {str(e)}")
     
+    def get_status_snapshot(self) -> Dict:
+        """
+        Get the projected sync status served by the API.
+        
+        Returns:
+            Dict with active operations and the 10 most recent syncs, rebuilt
+            only when status_version has changed since the last call. Statistics
+            also change between version bumps (fingerprints, batch size), so
+            they are not part of it; read them with get_sync_statistics.
+        """
+        version = self.status_version
+        if self._status_snapshot is None or self._status_snapshot[0] != version:
+            snapshot = {
+                'active_operations': [
+                    {
+                        'operation_id': op.operation_id,
+                        'operation_type': op.operation_type,
+                        'status': op.status,
+                        'started_at': op.started_at,
+                        'urls_processed': op.urls_processed,
+                        'urls_updated': op.urls_updated,
+                        'urls_failed': op.urls_failed
+                    }
+                    for op in self.get_all_active_operations()
+                ],
+                'recent_syncs': [
+                    {
+                        'operation_id': sync.operation_id,
+                        'success': sync.success,
+                        'total_processed': sync.total_processed,
+                        'execution_time': sync.execution_time
+                    }
+                    for sync in self.get_sync_history(10)
+                ]
+            }
+            self._status_snapshot = (version, snapshot)
+        
+        return self._status_snapshot[1]
+    
     def get_operation_status(self, operation_id: str) -> Optional[SyncOperation]:
         """Get status of a specific operation"""
         return self.active_operations.get(operation_id)
@@ -836,8 +965,9 @@ class SynchronizationService:
         return list(self.active_operations.values())
     
     def get_sync_history(self, limit: int = 10) -> List[SyncResult]:
-        """Get recent synchronization history"""
-        return self.sync_history[-limit:]
+        """Get recent synchronization history, oldest first"""
+        return list(itertools.islice(self.sync_history,
+                                     max(0, len(self.sync_history) - limit), None))
     
     async def shutdown(self) -> None:
         """Shutdown the synchronization service"""
@@ -850,6 +980,15 @@ class SynchronizationService:
             # Close browser
             await self.scraper.close_browser()
             
+            if self.http_session:
+                await self.http_session.close()
+            
+            # Close Azure clients
+            if self.blob_client:
+                await self.blob_client.close()
+            if self.credential:
+                await self.credential.close()
+            
             self.logger.info("Synchronization Service shutdown completed")
             
         except Exception as e:
@@ -887,7 +1026,7 @@ async def main():
         print(f"  Execution time: {result.execution_time:.2f} seconds")
         
         # Get statistics
-        stats = sync_service._get_sync_statistics()
+        stats = sync_service.get_sync_statistics()
         print(f"\nSync Statistics:")
         for key, value in stats.items():
             print(f"  {key}: {value}")